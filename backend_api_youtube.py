@@ -3,44 +3,242 @@ Enhanced Backend API with YouTube Video Integration
 """
 
 import os
+import re
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
 os.environ['TRANSFORMERS_NO_TF'] = '1'
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+import asyncio
+import multiprocessing
+import secrets
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, HttpUrl
-from typing import Optional, List, Dict, Any
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl, StringConstraints, field_validator
+from typing import Annotated, Optional, List, Dict, Any, Tuple
 import uvicorn
-from datetime import datetime
+import time
+import orjson
+from functools import lru_cache
+from datetime import datetime, timezone
+from uuid import uuid4
+from cachetools import TTLCache
 
-from rag_system import RAGSystem
-from langgraph_orchestrator import LangGraphOrchestrator
-from youtube_processor import YouTubeVideoProcessor
+from semantic_cache import SemanticCache
+from batcher import DynamicBatcher
+from job_store import JobStore
+from text_utils import clean_text as _clean
+
+# rag_system / langgraph_orchestrator / youtube_processor pull in torch,
+# transformers and langchain - they are imported in the startup thread so each
+# worker starts serving /health and /ready immediately
 
 # Initialize FastAPI app
 app = FastAPI(
     title="CDKG RAG Chatbot API with YouTube Integration",
     description="Hybrid RAG system with YouTube video ingestion",
-    version="2.0.0"
+    version="2.0.0",
+    # orjson serializes responses in C - noticeably cheaper for large answers/graphs
+    default_response_class=ORJSONResponse
 )
 
-# CORS middleware - Allow frontend from any origin (for demo purposes)
-# In production, restrict to specific domains
+
+class ORJSONRequest(Request):
+    """Request whose JSON body is decoded with orjson instead of the stdlib parser"""
+    
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    """Route that hands FastAPI an ORJSONRequest, so body parsing runs in C
+    before the (still applied) Pydantic validation"""
+    
+    def get_route_handler(self):
+        original_route_handler = super().get_route_handler()
+        
+        async def route_handler(request: Request) -> Response:
+            return await original_route_handler(ORJSONRequest(request.scope, request.receive))
+        
+        return route_handler
+
+
+# Must be set before any routes are registered
+app.router.route_class = ORJSONRoute
+
+
+def _dumps_graph(content: Any) -> bytes:
+    """orjson-encode graph payloads; Neo4j temporal/spatial property values
+    (and anything else orjson doesn't know) are rendered with str()"""
+    return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+# CORS middleware - Allow frontend from any origin by default (for demo purposes)
+# In production, restrict with CORS_ORIGINS (comma-separated) or CORS_ORIGIN_REGEX
+# Explicit method/header lists skip wildcard expansion, and max_age lets browsers
+# cache preflight responses for a day
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Allow all origins for demo - restrict in production
+    allow_origins=[o.strip() for o in os.getenv("CORS_ORIGINS", "*").split(",") if o.strip()],
+    allow_origin_regex=os.getenv("CORS_ORIGIN_REGEX") or None,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "OPTIONS"],
+    # ngrok-skip-browser-warning is sent by the frontend's axios client
+    allow_headers=["content-type", "authorization", "ngrok-skip-browser-warning"],
+    max_age=86400,
 )
 
-# Global instances
-rag_system = None
-orchestrator = None
-youtube_processor = None
+class BodySizeLimitMiddleware:
+    """
+    Reject POST bodies larger than max_bytes with 413
+    
+    Content-Length is checked up front; bodies without it (chunked transfer
+    encoding) are counted as they are received.
+    """
+    
+    def __init__(self, app, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+    
+    async def _reject(self, scope, receive, send):
+        response = ORJSONResponse(status_code=413, content={"detail": "Request body too large"})
+        await response(scope, receive, send)
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+        
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                if int(value) > self.max_bytes:
+                    await self._reject(scope, receive, send)
+                    return
+                break
+        
+        received = 0
+        response_started = False
+        
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # FastAPI re-raises HTTPExceptions from body parsing as-is
+                    raise HTTPException(status_code=413, detail="Request body too large")
+            return message
+        
+        async def tracked_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+        
+        try:
+            await self.app(scope, limited_receive, tracked_send)
+        except HTTPException as e:
+            if e.status_code != 413 or response_started:
+                raise
+            await self._reject(scope, receive, send)
+
+
+# Chat requests carry the conversation history, so allow well above a single query
+app.add_middleware(BodySizeLimitMiddleware, max_bytes=int(os.getenv("MAX_REQUEST_BYTES", str(128 * 1024))))
+
+# Per-worker system instances, populated by the startup thread
+app.state.rag_system = None
+app.state.orchestrator = None
+app.state.youtube_processor = None
+app.state.monitor_task = None
+
+# Startup phase reported by /ready: 'warming', 'ready' or 'failed'
+app.state.startup_phase = 'warming'
+
+@lru_cache(maxsize=1)
+def _iso(second: int) -> str:
+    """ISO-8601 UTC timestamp for a whole epoch second (formatted once per second)"""
+    return datetime.fromtimestamp(second, tz=timezone.utc).isoformat()
+
+
+def _now_iso() -> str:
+    """Current time as an ISO-8601 UTC timestamp, second resolution"""
+    return _iso(int(time.time()))
+
+
+# Track processing jobs (written from ingest threads, bounded)
+processing_jobs = JobStore(max_jobs=int(os.getenv("MAX_TRACKED_JOBS", "1000")))
+detection_jobs = JobStore(max_jobs=100)
+
+# Answer cache for repeated / near-identical standalone queries
+answer_cache = SemanticCache(
+    threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.97")),
+    max_entries=int(os.getenv("SEMANTIC_CACHE_SIZE", "512"))
+)
+
+# Encoded graph visualization payloads, keyed by endpoint and parameters.
+# Identical across users, so short-lived caching absorbs repeated "show graph"
+# loads; cleared whenever ingestion changes the graph
+graph_cache = TTLCache(
+    maxsize=int(os.getenv("GRAPH_CACHE_SIZE", "128")),
+    ttl=float(os.getenv("GRAPH_CACHE_TTL", "60"))
+)
+graph_cache_lock = threading.Lock()  # cleared from background-task threads
+graph_cache_stats = {'hits': 0, 'misses': 0}
+
+
+def _graph_cache_get(key):
+    with graph_cache_lock:
+        value = graph_cache.get(key)
+        graph_cache_stats['hits' if value is not None else 'misses'] += 1
+        return value
+
+
+def _graph_cache_put(key, value):
+    with graph_cache_lock:
+        graph_cache[key] = value
+
+
+def clear_graph_cache():
+    """Drop cached graph payloads (call after the knowledge graph changes)"""
+    with graph_cache_lock:
+        graph_cache.clear()
+
+
+# Optional per-request profiling (pip install pyinstrument): queries slower than
+# RAG_PROFILE_MIN_MS are written as speedscope JSON to RAG_PROFILE_DIR
+PROFILE_ENABLED = bool(os.getenv("RAG_PROFILE"))
+PROFILE_MIN_MS = float(os.getenv("RAG_PROFILE_MIN_MS", "0"))
+PROFILE_DIR = os.getenv("RAG_PROFILE_DIR", "/tmp")
+
+
+def _run_profiled(fn, **kwargs):
+    """
+    Run fn under pyinstrument and dump a speedscope profile if it was slow
+    
+    Called inside the worker thread, so the profile covers the blocking
+    pipeline itself rather than the event loop waiting on it.
+    """
+    from pyinstrument import Profiler
+    from pyinstrument.renderers import SpeedscopeRenderer
+    
+    profiler = Profiler()
+    profiler.start()
+    started = time.perf_counter()
+    try:
+        return fn(**kwargs)
+    finally:
+        profiler.stop()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms >= PROFILE_MIN_MS:
+            path = os.path.join(PROFILE_DIR, f"req-{uuid4().hex}.speedscope.json")
+            with open(path, 'w') as f:
+                f.write(profiler.output(renderer=SpeedscopeRenderer()))
+            print(f"🔬 Profiled query ({elapsed_ms:.0f} ms): {path}")
 
-# Track processing jobs
-processing_jobs = {}
 
 # Track monitoring status
 monitoring_status = {
@@ -53,28 +251,161 @@ monitoring_status = {
     'failed_count': 0
 }
 
+_NAME_KEYS = ('name', 'title', 'keyword')
+SNIPPET_CHARS = 150  # Transcript snippet length in response sources
+_TITLE_KEYS = ('title', 'name', 'keyword')
+
+
+def _first(data: Dict, keys, default: str = 'Unknown'):
+    """Return the first truthy value of data[key] for key in keys"""
+    return next((data[k] for k in keys if data.get(k)), default)
+
+
+def _format_timestamp(seconds: float) -> str:
+    """Format seconds as M:SS or H:MM:SS"""
+    minutes = int(seconds // 60)
+    secs = int(seconds % 60)
+    if minutes >= 60:
+        return f"{minutes // 60}:{minutes % 60:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
+
+
+def _semantic_source(r: Dict) -> Dict[str, Any]:
+    """Build a source entry for a semantic search hit"""
+    return {
+        'type': 'semantic',
+        'node_type': r.get('node_type'),
+        'title': _clean(_first(r.get('metadata') or {}, _TITLE_KEYS)),
+        'score': r.get('similarity_score', 0)
+    }
+
+
+def _transcript_source(r: Dict) -> Dict[str, Any]:
+    """Build a source entry for a transcript hit, with display timestamp"""
+    get = r.get
+    timestamp = get('timestamp')
+    timestamp_seconds = get('timestamp_seconds')
+    
+    timestamp_display = None
+    if timestamp:
+        timestamp_display = _format_timestamp(timestamp_seconds) if timestamp_seconds else timestamp
+    
+    speakers = get('speakers')
+    snippet = get('transcript_snippet') or ''
+    if len(snippet) > SNIPPET_CHARS:
+        snippet = snippet[:SNIPPET_CHARS]
+    return {
+        'type': 'transcript',
+        'title': _clean(get('title', 'Unknown')),
+        'speaker': speakers[0] if speakers else None,
+        'timestamp': timestamp,
+        'timestamp_seconds': timestamp_seconds,
+        'timestamp_display': timestamp_display,
+        'snippet': snippet,
+        'video_url': get('video_url'),
+        'video_link': get('video_link'),
+        'youtube_id': get('youtube_id')
+    }
+
+
+def _graph_source(r: Dict) -> Dict[str, Any]:
+    """Build a source entry for a graph connection"""
+    return {
+        'type': 'graph',
+        'relationship': r.get('relationship', 'RELATED_TO'),
+        'source': _first(r.get('source') or {}, _NAME_KEYS),
+        'target': _first(r.get('neighbor') or {}, _NAME_KEYS)
+    }
+
+
+def _result_fields(result: Dict):
+    """Bind the retrieval result lists of an orchestrator result once"""
+    return (
+        result.get('semantic_results') or [],
+        result.get('graph_results') or [],
+        result.get('transcript_results') or [],
+        result.get('multi_hop_paths') or []
+    )
+
+
+def _retrieval_stats(sem: List, gr: List, tr: List, mh: List) -> Dict[str, int]:
+    """Count retrieved items per retrieval strategy"""
+    return {
+        'semantic': len(sem),
+        'graph': len(gr),
+        'transcript': len(tr),
+        'multi_hop_paths': len(mh)
+    }
+
+
+def _build_sources(sem: List, gr: List, tr: List) -> List[Dict[str, Any]]:
+    """
+    Build the top-3 semantic, transcript and graph sources for a response
+    
+    Args:
+        sem: Semantic search results
+        gr: Graph traversal results
+        tr: Transcript search results
+        
+    Returns:
+        List of source dictionaries
+    """
+    return [
+        *map(_semantic_source, sem[:3]),
+        *map(_transcript_source, tr[:3]),
+        *map(_graph_source, gr[:3])
+    ]
+
+
+HISTORY_MESSAGES = 6  # Conversation messages passed to the pipeline
+
 
 class Message(BaseModel):
     """Single message in conversation history"""
+    model_config = ConfigDict(extra='ignore', frozen=True)
+    
     role: str  # 'user' or 'assistant'
     content: str
 
 class QueryRequest(BaseModel):
     """Request model for chat queries"""
-    query: str
-    max_hops: Optional[int] = 2
+    model_config = ConfigDict(extra='ignore', frozen=True)
+    
+    # Rejected (422) before the handler runs - no pipeline work for empty or oversized queries
+    query: Annotated[str, StringConstraints(min_length=1, max_length=4096, strip_whitespace=True)]
+    max_hops: Annotated[int, Field(ge=1, le=4)] = 2
     use_tools: Optional[bool] = False
-    conversation_history: Optional[List[Message]] = []  # Previous messages for context
+    conversation_history: Optional[List[Message]] = Field(default_factory=list)  # Previous messages for context
+    
+    @field_validator('conversation_history', mode='before')
+    @classmethod
+    def _keep_recent_history(cls, value):
+        """Only the last 6 messages (3 exchanges) are used - drop the rest
+        before Pydantic validates each message"""
+        if isinstance(value, list) and len(value) > HISTORY_MESSAGES:
+            return value[-HISTORY_MESSAGES:]
+        return value
+
+
+def _history_dicts(request: QueryRequest) -> List[Dict[str, str]]:
+    """Convert conversation history (already truncated on validation) to dicts"""
+    return [
+        {'role': msg.role, 'content': msg.content}
+        for msg in request.conversation_history or []
+    ]
 
 
 class QueryResponse(BaseModel):
     """Response model for chat queries"""
+    model_config = ConfigDict(frozen=True)
+    
     query: str
     answer: str
     query_type: Optional[str] = None
     retrieval_stats: Dict[str, int]
     sources: Optional[List[Dict[str, Any]]] = None
     confidence: Optional[float] = None  # Confidence score 0.0-1.0
+    cache: Optional[str] = None  # 'answer' or 'retrieval' when served (partly) from cache
     error: Optional[str] = None
 
 
@@ -101,34 +432,135 @@ class JobStatusResponse(BaseModel):
     error: Optional[str] = None
 
 
+async def get_rag_system(request: Request):
+    """Dependency: the initialized RAG system (503 while loading)"""
+    rag_system = request.app.state.rag_system
+    if rag_system is None:
+        raise HTTPException(status_code=503, detail="RAG system not initialized")
+    return rag_system
+
+
+async def get_orchestrator(request: Request):
+    """Dependency: the initialized orchestrator (503 while loading)"""
+    orchestrator = request.app.state.orchestrator
+    if orchestrator is None:
+        raise HTTPException(status_code=503, detail="RAG system not initialized")
+    return orchestrator
+
+
+async def get_youtube_processor(request: Request):
+    """Dependency: the initialized YouTube processor (503 while loading)"""
+    youtube_processor = request.app.state.youtube_processor
+    if youtube_processor is None:
+        raise HTTPException(status_code=503, detail="YouTube processor not initialized")
+    return youtube_processor
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize systems on startup"""
-    global rag_system, orchestrator, youtube_processor
     import threading
     
+    # Blocking RAG queries are offloaded with asyncio.to_thread, which runs on
+    # the loop's default executor - size it for concurrent chat requests
+    query_threads = int(os.getenv("QUERY_THREADS", "8"))
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=query_threads, thread_name_prefix="rag-query")
+    )
+    
+    # One pooled Neo4j driver per worker, shared by the RAG system and endpoints
+    from neo4j import GraphDatabase, AsyncGraphDatabase
+    from config import config
+    app.state.neo4j_driver = GraphDatabase.driver(
+        config.neo4j.uri,
+        auth=(config.neo4j.user, config.neo4j.password),
+        max_connection_pool_size=config.neo4j.max_connection_pool_size,
+        connection_acquisition_timeout=config.neo4j.connection_acquisition_timeout
+    )
+    # Async driver for endpoints that query Neo4j directly on the event loop
+    app.state.neo4j_async_driver = AsyncGraphDatabase.driver(
+        config.neo4j.uri,
+        auth=(config.neo4j.user, config.neo4j.password),
+        max_connection_pool_size=config.neo4j.max_connection_pool_size,
+        connection_acquisition_timeout=config.neo4j.connection_acquisition_timeout
+    )
+    app.state.llm_client = None
+    
+    # Concurrent /api/query calls batch their cache-lookup embeddings into one
+    # encode() call; the pipelines themselves run independently, so no query
+    # waits for a slower one
+    batch_size = int(os.getenv("QUERY_BATCH_SIZE", "8"))
+    batch_delay = float(os.getenv("QUERY_BATCH_DELAY_MS", "50")) / 1000
+    app.state.embed_batcher = DynamicBatcher(
+        lambda: app.state.rag_system.embed_queries, max_batch_size=batch_size, max_delay=batch_delay
+    )
+    app.state.embed_batcher.start()
+    
+    # Video ingestion (download, transcription, embeddings) is heavy - run a
+    # fixed number at a time and queue the rest
+    app.state.ingest_executor = ThreadPoolExecutor(
+        max_workers=int(os.getenv("INGEST_WORKERS", "3")),
+        thread_name_prefix="ingest"
+    )
+    
+    # Leiden runs are CPU-bound Python/C work - run them in a separate process
+    # (spawned, since the worker holds non-fork-safe torch and driver state),
+    # one at a time since each run rewrites all community assignments
+    # Workers report when a job actually starts on a status queue
+    from community_detection import init_detection_worker
+    spawn = multiprocessing.get_context("spawn")
+    app.state.detection_status_queue = spawn.Queue()
+    app.state.community_executor = ProcessPoolExecutor(
+        max_workers=1,
+        mp_context=spawn,
+        initializer=init_detection_worker,
+        initargs=(app.state.detection_status_queue,)
+    )
+    threading.Thread(
+        target=_watch_detection_status,
+        args=(app.state.detection_status_queue,),
+        name="detection-status",
+        daemon=True
+    ).start()
+    
     def initialize_systems():
         try:
             print("🚀 Initializing systems...")
             print("   This may take a minute (loading ML models)...")
+            import httpx
+            from anthropic import Anthropic
+            from rag_system import RAGSystem
+            from langgraph_orchestrator import LangGraphOrchestrator
+            from youtube_processor import YouTubeVideoProcessor
+            
+            # Keep-alive HTTP pool for Claude calls from concurrent query threads
+            app.state.llm_client = Anthropic(
+                api_key=config.llm.api_key,
+                http_client=httpx.Client(
+                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+                )
+            )
             
             # Initialize RAG system (loads embedding model - can take 30-60 seconds)
             print("   Loading RAG system...")
-            global rag_system
-            rag_system = RAGSystem()
+            rag_system = RAGSystem(neo4j_driver=app.state.neo4j_driver, llm_client=app.state.llm_client)
+            
+            # Warm up the embedding model so the first user query doesn't pay for it
+            rag_system.embed_query("warmup")
+            app.state.rag_system = rag_system
             
             # Initialize orchestrator
             print("   Initializing orchestrator...")
-            global orchestrator
-            orchestrator = LangGraphOrchestrator(rag_system)
+            app.state.orchestrator = LangGraphOrchestrator(rag_system)
             
             # Initialize YouTube processor (lightweight, no heavy loading)
             print("   Initializing YouTube processor...")
-            global youtube_processor
-            youtube_processor = YouTubeVideoProcessor()
+            app.state.youtube_processor = YouTubeVideoProcessor()
             
+            app.state.startup_phase = 'ready'
             print("✅ All systems ready!")
         except Exception as e:
+            app.state.startup_phase = 'failed'
             print(f"❌ Error initializing systems: {e}")
             import traceback
             traceback.print_exc()
@@ -143,190 +575,181 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
-    global orchestrator
-    if orchestrator:
-        orchestrator.close()
+    if app.state.monitor_task is not None:
+        app.state.monitor_task.cancel()
+    await app.state.embed_batcher.stop()
+    app.state.ingest_executor.shutdown(wait=False, cancel_futures=True)
+    app.state.community_executor.shutdown(wait=False, cancel_futures=True)
+    app.state.detection_status_queue.put(None)
+    if app.state.orchestrator:
+        app.state.orchestrator.close()
+    if app.state.llm_client is not None:
+        app.state.llm_client.close()
+    app.state.neo4j_driver.close()
+    await app.state.neo4j_async_driver.close()
+
+
+# Static body for "/" - encoded once, served without per-request JSON work
+_ROOT_BODY = orjson.dumps({
+    "status": "ok",
+    "service": "CDKG RAG Chatbot API with YouTube",
+    "version": "2.0.0",
+    "features": [
+        "Hybrid RAG (Semantic + Graph + Keyword)",
+        "Transcript search",
+        "YouTube video ingestion",
+        "LangGraph orchestration"
+    ]
+})
+
+# Neo4j connectivity is re-verified at most every HEALTH_NEO4J_TTL seconds so
+# frequent load-balancer probes don't each cost a database round trip
+_NEO4J_CHECK_INTERVAL = float(os.getenv("HEALTH_NEO4J_TTL", "30"))
+_neo4j_health = {'connected': False, 'checked_at': float('-inf')}
+
+
+@lru_cache(maxsize=16)
+def _health_body(rag_ready: bool, orchestrator_ready: bool, youtube_ready: bool, neo4j_connected: bool) -> bytes:
+    """Encoded /health body, rebuilt only when the system state changes"""
+    return orjson.dumps({
+        "status": "healthy" if (rag_ready and orchestrator_ready) else "initializing",
+        "rag_system": rag_ready,
+        "orchestrator": orchestrator_ready,
+        "youtube_processor": youtube_ready,
+        "neo4j_connected": neo4j_connected
+    })
+
+
+def _check_neo4j(driver) -> bool:
+    """Verify Neo4j connectivity"""
+    try:
+        driver.verify_connectivity()
+        return True
+    except Exception:
+        return False
 
 
 @app.get("/")
 async def root():
     """Health check endpoint"""
-    return {
-        "status": "ok",
-        "service": "CDKG RAG Chatbot API with YouTube",
-        "version": "2.0.0",
-        "features": [
-            "Hybrid RAG (Semantic + Graph + Keyword)",
-            "Transcript search",
-            "YouTube video ingestion",
-            "LangGraph orchestration"
-        ]
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
 @app.get("/health")
 async def health():
     """Health check with system status"""
-    global rag_system, orchestrator, youtube_processor
+    rag_system = app.state.rag_system
     try:
         # Quick check if systems are ready
         rag_ready = rag_system is not None
-        orchestrator_ready = orchestrator is not None
-        youtube_ready = youtube_processor is not None
+        orchestrator_ready = app.state.orchestrator is not None
+        youtube_ready = app.state.youtube_processor is not None
         
-        # If RAG system exists, test Neo4j connection
-        neo4j_connected = False
+        # If RAG system exists, test Neo4j connection (throttled)
         if rag_system and rag_system.neo4j_driver:
-            try:
-                rag_system.neo4j_driver.verify_connectivity()
-                neo4j_connected = True
-            except:
-                pass
+            now = time.monotonic()
+            if now - _neo4j_health['checked_at'] >= _NEO4J_CHECK_INTERVAL:
+                _neo4j_health['connected'] = await asyncio.to_thread(_check_neo4j, rag_system.neo4j_driver)
+                _neo4j_health['checked_at'] = now
+            neo4j_connected = _neo4j_health['connected']
+        else:
+            neo4j_connected = False
         
-        return {
-            "status": "healthy" if (rag_ready and orchestrator_ready) else "initializing",
-            "rag_system": rag_ready,
-            "orchestrator": orchestrator_ready,
-            "youtube_processor": youtube_ready,
-            "neo4j_connected": neo4j_connected,
-            "timestamp": datetime.now().isoformat()
-        }
+        return Response(
+            content=_health_body(rag_ready, orchestrator_ready, youtube_ready, neo4j_connected),
+            media_type="application/json"
+        )
     except Exception as e:
         return {
             "status": "error",
-            "error": str(e),
-            "timestamp": datetime.now().isoformat()
+            "error": str(e)
         }
 
 
-@app.post("/api/query", response_model=QueryResponse)
-async def query(request: QueryRequest):
+@app.get("/ready")
+async def ready():
+    """
+    Readiness probe - 200 once the RAG pipeline can serve queries, 503 while
+    models are still loading (or if initialization failed)
+    """
+    if app.state.startup_phase == 'ready' and app.state.orchestrator is not None:
+        return {"status": "ready"}
+    return ORJSONResponse(status_code=503, content={"status": app.state.startup_phase})
+
+
+@app.post("/api/query", response_model=QueryResponse, response_class=ORJSONResponse)
+async def query(request: QueryRequest, orchestrator=Depends(get_orchestrator)):
     """
     Process a chat query using LangGraph orchestrator
     
     Args:
         request: Query request with query text and options
+        orchestrator: Injected LangGraph orchestrator
         
     Returns:
         Query response with answer and metadata
     """
-    global orchestrator
-    
-    if not orchestrator:
-        raise HTTPException(status_code=503, detail="RAG system not initialized")
-    
     try:
-        # Convert conversation history to list of dicts
-        history = []
-        if request.conversation_history:
-            for msg in request.conversation_history[-6:]:  # Keep last 6 messages (3 exchanges)
-                history.append({
-                    'role': msg.role,
-                    'content': msg.content
-                })
-        
-        # Process query with conversation history
-        result = orchestrator.query(
+        history = _history_dicts(request)
+        
+        # Standalone queries can be answered from the semantic cache; follow-ups
+        # depend on the conversation, so they always run the full pipeline
+        cache_namespace = (request.max_hops, request.use_tools)
+        query_embedding = None
+        if not history:
+            cached = answer_cache.get_exact(request.query, cache_namespace)
+            if cached is None:
+                query_embedding = await app.state.embed_batcher.submit(request.query)
+                cached = answer_cache.get_similar(query_embedding, cache_namespace)
+            if cached is not None:
+                return cached.model_copy(update={'query': request.query, 'cache': 'answer'})
+        
+        # Process query with conversation history (off the event loop - the
+        # pipeline blocks on embeddings, Neo4j and the LLM)
+        query_kwargs = dict(
             query=request.query,
             max_hops=request.max_hops,
             use_tools=request.use_tools,
             conversation_history=history
         )
+        started = time.perf_counter()
+        if PROFILE_ENABLED:
+            result = await asyncio.to_thread(_run_profiled, orchestrator.query, **query_kwargs)
+        else:
+            result = await asyncio.to_thread(orchestrator.query, **query_kwargs)
         
-        # Extract sources
-        sources = []
-        
-        # Add semantic results
-        for r in result.get('semantic_results', [])[:3]:
-            meta = r.get('metadata', {})
-            title = meta.get('title') or meta.get('name') or meta.get('keyword', 'Unknown')
-            # Clean up title
-            title = title.replace('(DataCatalog)_-[poweredBy]-_(KnowledgeGraph)', 'DataCatalog powered by Knowledge Graph')
-            title = title.replace('_-[', ' ')
-            title = title.replace(']-_', ' ')
-            sources.append({
-                'type': 'semantic',
-                'node_type': r.get('node_type'),
-                'title': title,
-                'score': r.get('similarity_score', 0)
-            })
-        
-        # Add transcript results with full timestamp info
-        for r in result.get('transcript_results', [])[:3]:
-            title = r.get('title', 'Unknown')
-            title = title.replace('(DataCatalog)_-[poweredBy]-_(KnowledgeGraph)', 'DataCatalog powered by Knowledge Graph')
-            title = title.replace('_-[', ' ')
-            title = title.replace(']-_', ' ')
-            
-            # Format timestamp for display
-            timestamp_display = None
-            if r.get('timestamp'):
-                timestamp_seconds = r.get('timestamp_seconds', 0)
-                if timestamp_seconds:
-                    minutes = int(timestamp_seconds // 60)
-                    seconds = int(timestamp_seconds % 60)
-                    timestamp_display = f"{minutes}:{seconds:02d}"
-                    if minutes >= 60:
-                        hours = minutes // 60
-                        mins = minutes % 60
-                        timestamp_display = f"{hours}:{mins:02d}:{seconds:02d}"
-                else:
-                    timestamp_display = r.get('timestamp')
-            
-            # Get speaker names from transcript result
-            speakers = r.get('speakers', [])
-            speaker_name = speakers[0] if speakers else None
-            
-            source_entry = {
-                'type': 'transcript',
-                'title': title,
-                'speaker': speaker_name,
-                'timestamp': r.get('timestamp'),
-                'timestamp_seconds': r.get('timestamp_seconds'),
-                'timestamp_display': timestamp_display,
-                'snippet': r.get('transcript_snippet', '')[:150],
-                'video_url': r.get('video_url'),
-                'video_link': r.get('video_link'),
-                'youtube_id': r.get('youtube_id')
-            }
-            sources.append(source_entry)
-        
-        # Add graph connections
-        for r in result.get('graph_results', [])[:3]:
-            source = r.get('source', {})
-            neighbor = r.get('neighbor', {})
-            source_name = source.get('name') or source.get('title') or source.get('keyword', 'Unknown')
-            neighbor_name = neighbor.get('name') or neighbor.get('title') or neighbor.get('keyword', 'Unknown')
-            sources.append({
-                'type': 'graph',
-                'relationship': r.get('relationship', 'RELATED_TO'),
-                'source': source_name,
-                'target': neighbor_name
-            })
+        sem, gr, tr, mh = _result_fields(result)
+        sources = _build_sources(sem, gr, tr)
         
         # Clean up answer
-        answer = result.get('answer', 'No answer generated')
-        answer = answer.replace('(DataCatalog)_-[poweredBy]-_(KnowledgeGraph)', 'DataCatalog powered by Knowledge Graph')
-        answer = answer.replace('_-[', ' ')
-        answer = answer.replace(']-_', ' ')
-        answer = ' '.join(answer.split())
+        answer = ' '.join(_clean(result.get('answer', 'No answer generated')).split())
         
         # Get confidence score if available
         confidence = result.get('confidence', None)
         
-        return QueryResponse(
+        # All fields are built locally from the orchestrator result, so skip
+        # re-validation (FastAPI still serializes against response_model)
+        response = QueryResponse.model_construct(
             query=result.get('query', request.query),
             answer=answer,
             query_type=result.get('query_type'),
-            retrieval_stats={
-                'semantic': len(result.get('semantic_results', [])),
-                'graph': len(result.get('graph_results', [])),
-                'transcript': len(result.get('transcript_results', [])),
-                'multi_hop_paths': len(result.get('multi_hop_paths', []))
-            },
+            retrieval_stats=_retrieval_stats(sem, gr, tr, mh),
             sources=sources,
-            confidence=confidence
+            confidence=confidence,
+            cache='retrieval' if result.get('retrieval_cache_hit') else None
         )
+        
+        if query_embedding is not None and answer:
+            answer_cache.put(
+                request.query,
+                query_embedding,
+                response,
+                namespace=cache_namespace,
+                cost=time.perf_counter() - started,
+                size=len(answer)
+            )
+        
+        return response
     
     except Exception as e:
         return QueryResponse(
@@ -337,49 +760,107 @@ async def query(request: QueryRequest):
         )
 
 
-def process_youtube_video_background(job_id: str, url: str):
-    """Background task to process YouTube video"""
-    global youtube_processor, processing_jobs
+@app.post("/api/query/stream")
+async def query_stream(request: QueryRequest, orchestrator=Depends(get_orchestrator)):
+    """
+    Process a chat query and stream the response as Server-Sent Events
+    
+    Events (JSON in each `data:` line):
+    - {"type": "sources", "query_type", "confidence", "retrieval_stats", "sources"}
+    - {"type": "token", "text"} for each answer chunk as Claude generates it
+    - {"type": "done", "answer"} with the full, cleaned answer
+    - {"type": "error", "error"} if the pipeline fails
+    
+    Args:
+        request: Query request with query text and options
+        orchestrator: Injected LangGraph orchestrator
+        
+    Returns:
+        text/event-stream response
+    """
+    history = _history_dicts(request)
+    
+    def event_stream():
+        # Sync generator: Starlette iterates it in a worker thread
+        try:
+            for event in orchestrator.stream(
+                query=request.query,
+                max_hops=request.max_hops,
+                conversation_history=history
+            ):
+                if event['type'] == 'sources':
+                    sem, gr, tr, mh = _result_fields(event)
+                    payload = {
+                        'type': 'sources',
+                        'query_type': event.get('query_type'),
+                        'confidence': event.get('confidence'),
+                        'retrieval_stats': _retrieval_stats(sem, gr, tr, mh),
+                        'sources': _build_sources(sem, gr, tr)
+                    }
+                elif event['type'] == 'done':
+                    payload = {'type': 'done', 'answer': ' '.join(_clean(event['answer']).split())}
+                else:
+                    payload = event
+                yield b"data: " + orjson.dumps(payload, default=str) + b"\n\n"
+        except Exception as e:
+            yield b"data: " + orjson.dumps({'type': 'error', 'error': str(e)}) + b"\n\n"
     
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+def process_youtube_video_background(job_id: str, url: str):
+    """Process a YouTube video on the ingest pool"""
     try:
-        processing_jobs[job_id] = {
+        processing_jobs.set(job_id, {
             'status': 'processing',
             'progress': 'Downloading video info...',
-            'started_at': datetime.now().isoformat()
-        }
+            'started_at': _now_iso()
+        })
         
         # Process video
-        success = youtube_processor.process_youtube_url(url)
+        success = app.state.youtube_processor.process_youtube_url(url)
         
         if success:
-            processing_jobs[job_id] = {
+            # New content invalidates cached answers and retrieval results
+            answer_cache.clear()
+            if app.state.orchestrator:
+                app.state.orchestrator.retrieval_cache.clear()
+            clear_graph_cache()
+            processing_jobs.set(job_id, {
                 'status': 'completed',
                 'progress': 'Video successfully added to knowledge graph',
-                'completed_at': datetime.now().isoformat(),
+                'completed_at': _now_iso(),
                 'result': {
                     'success': True,
                     'url': url
                 }
-            }
+            })
         else:
-            processing_jobs[job_id] = {
+            processing_jobs.set(job_id, {
                 'status': 'failed',
                 'progress': 'Failed to process video',
                 'error': 'Processing failed - see logs for details',
-                'completed_at': datetime.now().isoformat()
-            }
+                'completed_at': _now_iso()
+            })
     
     except Exception as e:
-        processing_jobs[job_id] = {
+        processing_jobs.set(job_id, {
             'status': 'failed',
             'progress': 'Error processing video',
             'error': str(e),
-            'completed_at': datetime.now().isoformat()
-        }
+            'completed_at': _now_iso()
+        })
 
 
 @app.post("/api/youtube/add", response_model=YouTubeResponse)
-async def add_youtube_video(request: YouTubeRequest, background_tasks: BackgroundTasks):
+async def add_youtube_video(
+    request: YouTubeRequest,
+    youtube_processor=Depends(get_youtube_processor)
+):
     """
     Add a YouTube video to the knowledge graph
     
@@ -391,29 +872,29 @@ async def add_youtube_video(request: YouTubeRequest, background_tasks: Backgroun
     
     Args:
         request: YouTube video URL
-        background_tasks: FastAPI background tasks
+        youtube_processor: Injected YouTube processor (ensures it is ready)
         
     Returns:
         Response with job_id to track processing
     """
-    global youtube_processor
-    
-    if not youtube_processor:
-        raise HTTPException(status_code=503, detail="YouTube processor not initialized")
-    
     try:
         url = str(request.url)
         
-        # Generate job ID
-        import hashlib
-        job_id = hashlib.md5(f"{url}{datetime.now().isoformat()}".encode()).hexdigest()[:12]
+        # Generate job ID (12 random hex chars, no hashing needed)
+        job_id = secrets.token_hex(6)
         
-        # Add to background tasks
-        background_tasks.add_task(process_youtube_video_background, job_id, url)
+        # Queue on the bounded ingest pool; the job reports 'queued' until a
+        # worker picks it up and switches it to 'processing'
+        processing_jobs.set(job_id, {
+            'status': 'queued',
+            'progress': 'Waiting for an ingest worker...',
+            'queued_at': _now_iso()
+        })
+        app.state.ingest_executor.submit(process_youtube_video_background, job_id, url)
         
         return YouTubeResponse(
-            status="processing",
-            message="Video processing started in background",
+            status="queued",
+            message="Video queued for processing in background",
             job_id=job_id
         )
     
@@ -436,13 +917,10 @@ async def get_job_status(job_id: str):
     Returns:
         Job status and progress
     """
-    global processing_jobs
-    
-    if job_id not in processing_jobs:
+    job = processing_jobs.get(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job = processing_jobs[job_id]
-    
     return JobStatusResponse(
         job_id=job_id,
         status=job['status'],
@@ -454,19 +932,407 @@ async def get_job_status(job_id: str):
 
 @app.get("/api/youtube/jobs")
 async def list_jobs():
-    """List all processing jobs"""
-    global processing_jobs
+    """List processing jobs (the 100 most recent)"""
     return {
         "total_jobs": len(processing_jobs),
-        "jobs": processing_jobs
+        "jobs": dict(processing_jobs.items(limit=100))
     }
 
 
+# Node group (frontend color) per Neo4j label; anything else is group 1
+TYPE_GROUP = {
+    'Speaker': 2,
+    'Talk': 3,
+    'Event': 4,
+    'Category': 5,
+    'Organization': 6,
+    'Product': 7,
+    'Concept': 8,
+    'Community': 9
+}
+
+
+def _build_node(node_id: str, name: str, n_type: str, value: int = 1,
+                props: Optional[Dict] = None, labels: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Build a graph visualization node
+    
+    Args:
+        node_id: Node identifier
+        name: Display name
+        n_type: Primary Neo4j label
+        value: Relative node size
+        props: Neo4j properties to include (omitted when None). Neo4j never
+            stores null-valued properties, so these are used as-is
+        labels: All Neo4j labels (defaults to [n_type] when props are included)
+        
+    Returns:
+        Node dictionary
+    """
+    node = {
+        'id': node_id,
+        'name': name,
+        'type': n_type,
+        'group': TYPE_GROUP.get(n_type, 1),
+        'value': value
+    }
+    if props is not None:
+        node['properties'] = props
+        node['labels'] = labels or [n_type]
+    return node
+
+
+# Variable-length bounds can't be Cypher parameters, so each supported depth
+# gets its own fixed query text (one cached plan per depth, not per request)
+MAX_GRAPH_DEPTH = 3
+
+# Search nodes through the entity_search full-text index (created by
+# DataLoader.create_constraints); the scan variant is the fallback for
+# databases without the index
+_SEARCH_FULLTEXT_MATCH = """
+CALL db.index.fulltext.queryNodes('entity_search', $search) YIELD node AS n
+"""
+_SEARCH_SCAN_MATCH = """
+MATCH (n)
+WHERE toLower(COALESCE(n.name, '')) CONTAINS toLower($query)
+   OR toLower(COALESCE(n.title, '')) CONTAINS toLower($query)
+   OR toLower(COALESCE(n.keyword, '')) CONTAINS toLower($query)
+"""
+
+_GRAPH_SEARCH_CYPHER = """{match}
+WITH n
+MATCH path = (n)-[*1..{depth}]-(m)
+WITH DISTINCT n, m, relationships(path)[0] as r
+RETURN
+    id(n) as n_eid,
+    labels(n) as n_labels,
+    head(labels(n)) as n_type,
+    properties(n) as n_props,
+    type(r) as rel_type,
+    properties(r) as rel_props,
+    id(m) as m_eid,
+    labels(m) as m_labels,
+    head(labels(m)) as m_type,
+    properties(m) as m_props
+LIMIT $limit
+"""
+
+# Find the center node and its neighbors (excluding Tag nodes)
+_GRAPH_AROUND_CYPHER = """
+MATCH (center)
+WHERE (toLower(COALESCE(center.name, '')) = toLower($node_id)
+   OR toLower(COALESCE(center.title, '')) = toLower($node_id)
+   OR toLower(COALESCE(center.keyword, '')) = toLower($node_id))
+   AND NOT 'Tag' IN labels(center)
+WITH center
+MATCH path = (center)-[*1..{depth}]-(neighbor)
+WHERE NOT 'Tag' IN labels(neighbor)
+RETURN DISTINCT
+    center,
+    labels(center)[0] as center_type,
+    neighbor,
+    labels(neighbor)[0] as neighbor_type,
+    relationships(path)[0] as rel
+LIMIT $limit
+"""
+
+_GRAPH_SEARCH_BY_DEPTH = {
+    d: _GRAPH_SEARCH_CYPHER.format(match=_SEARCH_FULLTEXT_MATCH, depth=d) for d in range(1, MAX_GRAPH_DEPTH + 1)
+}
+_GRAPH_SEARCH_SCAN_BY_DEPTH = {
+    d: _GRAPH_SEARCH_CYPHER.format(match=_SEARCH_SCAN_MATCH, depth=d) for d in range(1, MAX_GRAPH_DEPTH + 1)
+}
+_GRAPH_AROUND_BY_DEPTH = {d: _GRAPH_AROUND_CYPHER.format(depth=d) for d in range(1, MAX_GRAPH_DEPTH + 1)}
+
+
+# Flipped off on the first failed full-text query (index missing)
+_fulltext_search = {'available': True}
+
+
+def _fulltext_query(text: str) -> Optional[str]:
+    """
+    Build a Lucene query approximating a case-insensitive substring search
+    
+    Every word must match the start of an indexed token (the index analyzer
+    lowercases), e.g. "data cat" -> "data* AND cat*"
+    """
+    terms = re.findall(r"\w+", text.lower())
+    return " AND ".join(f"{t}*" for t in terms) if terms else None
+
+
+def _clamp_depth(depth: int) -> int:
+    """Clamp a requested traversal depth to the supported 1..MAX_GRAPH_DEPTH"""
+    return max(1, min(MAX_GRAPH_DEPTH, depth))
+
+
+async def _graph_records(session, query: Optional[str], limit: int, depth: int):
+    """
+    Yield the Neo4j records behind /api/graph as they arrive
+    
+    Args:
+        session: Async Neo4j session
+        query: Optional search term to filter nodes
+        limit: Maximum number of records
+        depth: Maximum relationship depth to traverse (already clamped)
+    """
+    if query:
+        # Search-based subgraph: find nodes matching query and their neighbors
+        search = _fulltext_query(query)
+        if search and _fulltext_search['available']:
+            from neo4j.exceptions import ClientError
+            try:
+                result = await session.run(_GRAPH_SEARCH_BY_DEPTH[depth], search=search, limit=limit)
+                await result.peek()  # surfaces a missing index before anything is yielded
+            except ClientError as e:
+                print(f"⚠️  Full-text search unavailable, falling back to scan: {e}")
+                _fulltext_search['available'] = False
+            else:
+                async for record in result:
+                    yield record
+                return
+        
+        result = await session.run(_GRAPH_SEARCH_SCAN_BY_DEPTH[depth], query=query, limit=limit)
+        async for record in result:
+            yield record
+        return
+    
+    # General graph: get ALL relationships and nodes from Neo4j in one round
+    # trip - relationships first, then nodes without any (m/r columns null)
+    # Exclude Tag nodes (tags are now properties on Talk nodes, not separate nodes)
+    # Extract complete graph structure with all properties - projected to ids,
+    # labels and property maps so full node/relationship objects aren't shipped twice
+    cypher_query = """
+    MATCH (n)
+    WHERE NOT 'Tag' IN labels(n)
+    OPTIONAL MATCH (n)-[r]->(m)
+    WHERE NOT 'Tag' IN labels(m)
+    RETURN 
+        id(n) as n_eid,
+        labels(n) as n_labels,
+        head(labels(n)) as n_type,
+        properties(n) as n_props,
+        type(r) as rel_type,
+        properties(r) as rel_props,
+        id(m) as m_eid,
+        labels(m) as m_labels,
+        head(labels(m)) as m_type,
+        properties(m) as m_props
+    ORDER BY m_eid IS NULL, n_type, m_type
+    LIMIT $limit
+    """
+    result = await session.run(cypher_query, limit=limit)
+    async for record in result:
+        yield record
+
+
+def _identify(props, eid: int, n_type: str):
+    """
+    Derive a node's visualization ID and display name in one pass
+    
+    Args:
+        props: Node properties (dict or neo4j Node)
+        eid: Neo4j internal node ID (fallback identifier)
+        n_type: Primary label
+        
+    Returns:
+        Tuple of (node_id, name)
+    """
+    if n_type == 'Community':
+        # Community nodes are identified by their id property
+        community_id = props.get('id') or eid
+        return str(community_id), f"Community {community_id}"
+    key = props.get('name') or props.get('title') or props.get('keyword')
+    if key:
+        return key, key
+    return str(eid), f'{n_type} {eid}'
+
+
+def _node_index(seen_nodes: Dict[str, int], node_id: str) -> Tuple[int, bool]:
+    """Return (integer index, is_new) for a node ID, assigning the next index on first sight"""
+    idx = seen_nodes.get(node_id)
+    if idx is None:
+        idx = seen_nodes[node_id] = len(seen_nodes)
+        return idx, True
+    return idx, False
+
+
+def _graph_record_items(record, seen_nodes: Dict[str, int], seen_links: set):
+    """
+    Yield the new ('node', dict) / ('link', dict) items contributed by a record
+    
+    Args:
+        record: Neo4j record from _graph_records
+        seen_nodes: Node ID -> integer index for nodes emitted so far (updated in place)
+        seen_links: (source index, target index) pairs emitted so far (updated in place)
+    """
+    # Process source node with ALL properties from Neo4j
+    n_type = record['n_type'] or 'Unknown'
+    n_props = record['n_props']
+    n_id, n_name = _identify(n_props, record['n_eid'], n_type)
+    
+    n_idx, is_new = _node_index(seen_nodes, n_id)
+    if is_new:
+        # Create node with ALL properties from Neo4j
+        yield 'node', _build_node(n_id, n_name, n_type, props=n_props, labels=record.get('n_labels'))
+    
+    # Process target node and relationship (if relationship exists)
+    # Nodes without relationships come back with null target columns
+    m_props = record.get('m_props')
+    if m_props is None:
+        return
+    
+    m_type = record['m_type'] or 'Unknown'
+    m_id, m_name = _identify(m_props, record['m_eid'], m_type)
+    
+    m_idx, is_new = _node_index(seen_nodes, m_id)
+    if is_new:
+        yield 'node', _build_node(m_id, m_name, m_type, props=m_props, labels=record.get('m_labels'))
+    
+    # Add relationship with ALL properties from Neo4j
+    rel_type = record['rel_type'] or 'RELATED_TO'
+    
+    # Always add link if we have both source and target nodes (relationship exists)
+    if rel_type and n_id and m_id:
+        # Avoid duplicate links (in either direction) - keyed by integer indices
+        if (n_idx, m_idx) not in seen_links and (m_idx, n_idx) not in seen_links:
+            seen_links.add((n_idx, m_idx))
+            yield 'link', {
+                'source': n_id,
+                'target': m_id,
+                'value': 1,
+                'type': rel_type,
+                # Include all relationship properties from Neo4j
+                'properties': record['rel_props'] or {}
+            }
+
+
+def _graph_caps(limit: int) -> Dict[str, int]:
+    """Maximum nodes/links returned for a limit (allow more links than nodes)"""
+    return {'node': limit, 'link': limit * 2}
+
+
+def _build_graph_payload(records: List, limit: int) -> bytes:
+    """
+    Build and encode the /api/graph JSON payload (CPU-bound, runs in a thread)
+    
+    Items past the response caps are only counted, never kept.
+    
+    Args:
+        records: Records from _graph_records
+        limit: Maximum number of nodes
+        
+    Returns:
+        Encoded JSON body
+    """
+    items = {'node': [], 'link': []}
+    counts = {'node': 0, 'link': 0}
+    caps = _graph_caps(limit)
+    seen_nodes = {}  # Node ID -> integer index, to avoid duplicates
+    seen_links = set()  # (source, target) pairs already linked
+    
+    for record in records:
+        for kind, item in _graph_record_items(record, seen_nodes, seen_links):
+            counts[kind] += 1
+            if counts[kind] <= caps[kind]:
+                items[kind].append(item)
+    
+    return _dumps_graph({
+        "nodes": items['node'],
+        "links": items['link'],
+        "total_nodes": counts['node'],
+        "total_links": counts['link']
+    })
+
+
+def _build_around_payload(records: List, node_id: str) -> bytes:
+    """
+    Build and encode the /api/graph/around JSON payload (runs in a thread)
+    
+    Args:
+        records: Records of the around-node query
+        node_id: Requested center node
+        
+    Returns:
+        Encoded JSON body
+    """
+    nodes = []
+    links = []
+    seen_nodes = {}  # Node ID -> integer index
+    seen_links = set()
+    
+    for record in records:
+        # Center node
+        center = record['center']
+        center_type = record['center_type']
+        center_id, center_name = _identify(center, center.id, center_type)
+        
+        center_idx, is_new = _node_index(seen_nodes, center_id)
+        if is_new:
+            # Larger for center node
+            nodes.append(_build_node(center_id, center_name, center_type, value=2))
+        
+        # Neighbor node
+        neighbor = record['neighbor']
+        neighbor_type = record['neighbor_type']
+        neighbor_id, neighbor_name = _identify(neighbor, neighbor.id, neighbor_type)
+        
+        neighbor_idx, is_new = _node_index(seen_nodes, neighbor_id)
+        if is_new:
+            nodes.append(_build_node(neighbor_id, neighbor_name, neighbor_type))
+        
+        # Relationship
+        rel = record.get('rel')
+        rel_type = rel.type if rel else 'RELATED_TO'
+        
+        if (center_idx, neighbor_idx) not in seen_links:
+            seen_links.add((center_idx, neighbor_idx))
+            links.append({
+                'source': center_id,
+                'target': neighbor_id,
+                'value': 1,
+                'type': rel_type
+            })
+    
+    return _dumps_graph({
+        "nodes": nodes,
+        "links": links,
+        "center_node": node_id,
+        "total_nodes": len(nodes),
+        "total_links": len(links)
+    })
+
+
+async def _graph_ndjson(query: Optional[str], limit: int, depth: int):
+    """
+    Stream /api/graph as NDJSON: one {"node": ...} or {"link": ...} object
+    per line as records arrive, then a {"total_nodes", "total_links"} line
+    """
+    seen_nodes = {}
+    seen_links = set()
+    counts = {'node': 0, 'link': 0}
+    caps = _graph_caps(limit)
+    
+    try:
+        async with app.state.neo4j_async_driver.session(default_access_mode="READ") as session:
+            async for record in _graph_records(session, query, limit, depth):
+                for kind, item in _graph_record_items(record, seen_nodes, seen_links):
+                    counts[kind] += 1
+                    if counts[kind] <= caps[kind]:
+                        yield _dumps_graph({kind: item}) + b"\n"
+    except Exception as e:
+        yield orjson.dumps({'error': str(e)}) + b"\n"
+        return
+    
+    yield orjson.dumps({'total_nodes': counts['node'], 'total_links': counts['link']}) + b"\n"
+
+
 @app.get("/api/graph")
 async def get_graph_data(
     query: Optional[str] = None,
     limit: int = 100,
-    depth: int = 2
+    depth: int = 2,
+    format: str = "json",
+    rag_system=Depends(get_rag_system)
 ):
     """
     Get graph data from Neo4j for visualization
@@ -474,399 +1340,113 @@ async def get_graph_data(
     Args:
         query: Optional search term to filter nodes
         limit: Maximum number of nodes to return
-        depth: Maximum relationship depth to traverse
+        depth: Maximum relationship depth to traverse (1-3)
+        format: "json" (default) or "ndjson" to stream nodes/links line by line
         
     Returns:
         Graph data in format: {nodes: [], links: []}
     """
-    global rag_system
+    depth = _clamp_depth(depth)
+    if format == "ndjson":
+        return StreamingResponse(_graph_ndjson(query, limit, depth), media_type="application/x-ndjson")
     
-    if not rag_system:
-        raise HTTPException(status_code=503, detail="RAG system not initialized")
+    cache_key = ('graph', query, limit, depth)
+    cached = _graph_cache_get(cache_key)
+    if cached is not None:
+        return Response(cached, media_type="application/json")
     
     try:
-        from neo4j import GraphDatabase
-        from config import config
-        
-        driver = GraphDatabase.driver(
-            config.neo4j.uri,
-            auth=(config.neo4j.user, config.neo4j.password)
-        )
-        
-        nodes = []
-        links = []
-        node_map = {}  # Track nodes by ID to avoid duplicates
-        
-        with driver.session() as session:
-            if query:
-                # Search-based subgraph: find nodes matching query and their neighbors
-                cypher_query = f"""
-                MATCH (n)
-                WHERE toLower(COALESCE(n.name, '')) CONTAINS toLower($query)
-                   OR toLower(COALESCE(n.title, '')) CONTAINS toLower($query)
-                   OR toLower(COALESCE(n.keyword, '')) CONTAINS toLower($query)
-                WITH n
-                MATCH path = (n)-[*1..{depth}]-(connected)
-                RETURN DISTINCT
-                    n,
-                    labels(n)[0] as n_type,
-                    connected,
-                    labels(connected)[0] as connected_type,
-                    relationships(path)[0] as rel
-                LIMIT $limit
-                """
-                result = session.run(cypher_query, query=query, limit=limit)
-            else:
-                # General graph: get ALL relationships and nodes from Neo4j
-                # Exclude Tag nodes (tags are now properties on Talk nodes, not separate nodes)
-                # Extract complete graph structure with all properties
-                cypher_query = """
-                MATCH (n)-[r]->(m)
-                WHERE NOT 'Tag' IN labels(n) AND NOT 'Tag' IN labels(m)
-                RETURN 
-                    n, 
-                    labels(n) as n_labels,
-                    labels(n)[0] as n_type,
-                    properties(n) as n_props,
-                    r,
-                    type(r) as rel_type,
-                    properties(r) as rel_props,
-                    m,
-                    labels(m) as m_labels,
-                    labels(m)[0] as m_type,
-                    properties(m) as m_props
-                ORDER BY n_type, m_type
-                LIMIT $limit
-                """
-                result = session.run(cypher_query, limit=limit)
-                records = list(result)
-                
-                # If no relationships found, get nodes anyway (excluding Tag nodes)
-                if not records:
-                    cypher_query = """
-                    MATCH (n)
-                    WHERE NOT 'Tag' IN labels(n)
-                    RETURN 
-                        n,
-                        labels(n) as n_labels,
-                        labels(n)[0] as n_type,
-                        properties(n) as n_props
-                    LIMIT $limit
-                    """
-                    result = session.run(cypher_query, limit=limit)
-                    records = list(result)
-            
-            for record in records:
-                # Process source node with ALL properties from Neo4j
-                n = record['n']
-                n_type = record.get('n_type') or (record.get('n_labels')[0] if record.get('n_labels') else 'Unknown')
-                n_props = record.get('n_props', {})
-                
-                # Extract node ID from properties (name, title, keyword, or internal ID)
-                # For Community nodes, use id from properties
-                if n_type == 'Community':
-                    n_id = str(n_props.get('id') or n.get('id') or n.id)
-                    n_name = f"Community {n_props.get('id') or n.get('id') or n.id}"
-                else:
-                    n_id = (n_props.get('name') or n_props.get('title') or n_props.get('keyword') or 
-                           n.get('name') or n.get('title') or n.get('keyword') or str(n.id))
-                    n_name = (n_props.get('name') or n_props.get('title') or n_props.get('keyword') or
-                             n.get('name') or n.get('title') or n.get('keyword') or f'{n_type} {str(n.id)}')
-                
-                if n_id not in node_map:
-                    # Determine node group for coloring based on Neo4j label
-                    group = 1  # Default
-                    if n_type == 'Speaker':
-                        group = 2
-                    elif n_type == 'Talk':
-                        group = 3
-                    elif n_type == 'Event':
-                        group = 4
-                    elif n_type == 'Category':
-                        group = 5
-                    elif n_type == 'Organization':
-                        group = 6
-                    elif n_type == 'Product':
-                        group = 7
-                    elif n_type == 'Concept':
-                        group = 8
-                    elif n_type == 'Community':
-                        group = 9
-                    
-                    # Create node with ALL properties from Neo4j
-                    node_map[n_id] = {
-                        'id': n_id,
-                        'name': n_name,
-                        'type': n_type,
-                        'group': group,
-                        'value': 1,
-                        # Include all Neo4j properties
-                        'properties': {k: v for k, v in n_props.items() if v is not None},
-                        'labels': record.get('n_labels', [n_type]) if 'n_labels' in record else [n_type]
-                    }
-                    nodes.append(node_map[n_id])
-                
-                # Process target node and relationship (if relationship exists)
-                # Check if we have a target node (m) - this indicates a relationship exists
-                if record.get('m') is not None or record.get('m_type') is not None:
-                    m = record['m']
-                    m_type = record.get('m_type') or (record.get('m_labels')[0] if record.get('m_labels') else 'Unknown')
-                    m_props = record.get('m_props', {})
-                    
-                    # For Community nodes, use id from properties
-                    if m_type == 'Community':
-                        m_id = str(m_props.get('id') or m.get('id') or m.id)
-                        m_name = f"Community {m_props.get('id') or m.get('id') or m.id}"
-                    else:
-                        m_id = (m_props.get('name') or m_props.get('title') or m_props.get('keyword') or
-                               m.get('name') or m.get('title') or m.get('keyword') or str(m.id))
-                        m_name = (m_props.get('name') or m_props.get('title') or m_props.get('keyword') or
-                                 m.get('name') or m.get('title') or m.get('keyword') or f'{m_type} {str(m.id)}')
-                    
-                    if m_id not in node_map:
-                        group = 1
-                        if m_type == 'Speaker':
-                            group = 2
-                        elif m_type == 'Talk':
-                            group = 3
-                        elif m_type == 'Event':
-                            group = 4
-                        elif m_type == 'Category':
-                            group = 5
-                        elif m_type == 'Organization':
-                            group = 6
-                        elif m_type == 'Product':
-                            group = 7
-                        elif m_type == 'Concept':
-                            group = 8
-                        elif m_type == 'Community':
-                            group = 9
-                        
-                        node_map[m_id] = {
-                            'id': m_id,
-                            'name': m_name,
-                            'type': m_type,
-                            'group': group,
-                            'value': 1,
-                            # Include all Neo4j properties
-                            'properties': {k: v for k, v in m_props.items() if v is not None},
-                            'labels': record.get('m_labels', [m_type]) if 'm_labels' in record else [m_type]
-                        }
-                        nodes.append(node_map[m_id])
-                    
-                    # Add relationship with ALL properties from Neo4j
-                    rel = record.get('r')
-                    rel_type = record.get('rel_type') or (rel.type if rel and hasattr(rel, 'type') else 'RELATED_TO')
-                    rel_props = record.get('rel_props', {})
-                    
-                    # Always add link if we have both source and target nodes (relationship exists)
-                    if rel_type and n_id and m_id:
-                        # Avoid duplicate links
-                        link_key = f"{n_id}->{m_id}"
-                        reverse_key = f"{m_id}->{n_id}"
-                        if not any(l.get('key') == link_key or l.get('key') == reverse_key for l in links):
-                            links.append({
-                                'source': n_id,
-                                'target': m_id,
-                                'value': 1,
-                                'type': rel_type,
-                                'key': link_key,
-                                # Include all relationship properties from Neo4j
-                                'properties': {k: v for k, v in rel_props.items() if v is not None}
-                            })
-                elif 'n' in record and 'm' not in record:
-                    # Handle case where we only have nodes (no relationships)
-                    pass
-        
-        driver.close()
+        # Fetch on the event loop, then build and encode the payload in a
+        # worker thread so large graphs don't block other requests
+        async with app.state.neo4j_async_driver.session(default_access_mode="READ") as session:
+            records = [record async for record in _graph_records(session, query, limit, depth)]
         
-        return {
-            "nodes": nodes[:limit],
-            "links": links[:limit * 2],  # Allow more links than nodes
-            "total_nodes": len(nodes),
-            "total_links": len(links)
-        }
+        body = await asyncio.to_thread(_build_graph_payload, records, limit)
+        _graph_cache_put(cache_key, body)
+        return Response(body, media_type="application/json")
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/graph/cache-stats")
+async def get_graph_cache_stats():
+    """Get graph payload cache size and hit/miss counters"""
+    with graph_cache_lock:
+        return {
+            "entries": len(graph_cache),
+            "maxsize": graph_cache.maxsize,
+            "ttl": graph_cache.ttl,
+            **graph_cache_stats
+        }
+
+
 @app.get("/api/graph/around")
 async def get_graph_around_node(
     node_id: str,
     depth: int = 2,
-    limit: int = 50
+    limit: int = 50,
+    rag_system=Depends(get_rag_system)
 ):
     """
     Get graph data around a specific node
     
     Args:
         node_id: Name/title/keyword of the node
-        depth: Maximum relationship depth
+        depth: Maximum relationship depth (1-3)
         limit: Maximum nodes to return
         
     Returns:
         Graph data centered around the specified node
     """
-    global rag_system
-    
-    if not rag_system:
-        raise HTTPException(status_code=503, detail="RAG system not initialized")
+    depth = _clamp_depth(depth)
+    cache_key = ('around', node_id, depth, limit)
+    cached = _graph_cache_get(cache_key)
+    if cached is not None:
+        return Response(cached, media_type="application/json")
     
     try:
-        from neo4j import GraphDatabase
-        from config import config
-        
-        driver = GraphDatabase.driver(
-            config.neo4j.uri,
-            auth=(config.neo4j.user, config.neo4j.password)
-        )
+        async with app.state.neo4j_async_driver.session(default_access_mode="READ") as session:
+            result = await session.run(_GRAPH_AROUND_BY_DEPTH[depth], node_id=node_id, limit=limit)
+            records = [record async for record in result]
         
-        nodes = []
-        links = []
-        node_map = {}
-        
-        with driver.session() as session:
-            # Find the center node and its neighbors (excluding Tag nodes)
-            cypher_query = f"""
-            MATCH (center)
-            WHERE (toLower(COALESCE(center.name, '')) = toLower($node_id)
-               OR toLower(COALESCE(center.title, '')) = toLower($node_id)
-               OR toLower(COALESCE(center.keyword, '')) = toLower($node_id))
-               AND NOT 'Tag' IN labels(center)
-            WITH center
-            MATCH path = (center)-[*1..{depth}]-(neighbor)
-            WHERE NOT 'Tag' IN labels(neighbor)
-            RETURN DISTINCT
-                center,
-                labels(center)[0] as center_type,
-                neighbor,
-                labels(neighbor)[0] as neighbor_type,
-                relationships(path)[0] as rel
-            LIMIT $limit
-            """
-            result = session.run(cypher_query, node_id=node_id, limit=limit)
-            
-            for record in result:
-                # Center node
-                center = record['center']
-                center_type = record['center_type']
-                center_id = center.get('name') or center.get('title') or center.get('keyword') or str(center.id)
-                center_name = center.get('name') or center.get('title') or center.get('keyword') or 'Unknown'
-                
-                if center_id not in node_map:
-                    group = 2 if center_type == 'Speaker' else (3 if center_type == 'Talk' else 1)
-                    node_map[center_id] = {
-                        'id': center_id,
-                        'name': center_name,
-                        'type': center_type,
-                        'group': group,
-                        'value': 2  # Larger for center node
-                    }
-                    nodes.append(node_map[center_id])
-                
-                # Neighbor node
-                neighbor = record['neighbor']
-                neighbor_type = record['neighbor_type']
-                neighbor_id = neighbor.get('name') or neighbor.get('title') or neighbor.get('keyword') or str(neighbor.id)
-                neighbor_name = neighbor.get('name') or neighbor.get('title') or neighbor.get('keyword') or 'Unknown'
-                
-                if neighbor_id not in node_map:
-                    group = 2 if neighbor_type == 'Speaker' else (3 if neighbor_type == 'Talk' else 1)
-                    node_map[neighbor_id] = {
-                        'id': neighbor_id,
-                        'name': neighbor_name,
-                        'type': neighbor_type,
-                        'group': group,
-                        'value': 1
-                    }
-                    nodes.append(node_map[neighbor_id])
-                
-                # Relationship
-                rel = record.get('rel')
-                rel_type = rel.type if rel else 'RELATED_TO'
-                
-                link_key = f"{center_id}->{neighbor_id}"
-                if not any(l.get('key') == link_key for l in links):
-                    links.append({
-                        'source': center_id,
-                        'target': neighbor_id,
-                        'value': 1,
-                        'type': rel_type,
-                        'key': link_key
-                    })
-        
-        driver.close()
-        
-        return {
-            "nodes": nodes,
-            "links": links,
-            "center_node": node_id,
-            "total_nodes": len(nodes),
-            "total_links": len(links)
-        }
+        body = await asyncio.to_thread(_build_around_payload, records, node_id)
+        _graph_cache_put(cache_key, body)
+        return Response(body, media_type="application/json")
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+_STATS_CYPHER = """
+CALL {
+    MATCH (n)
+    WITH labels(n)[0] AS label, count(n) AS count
+    WHERE label IS NOT NULL
+    RETURN collect({label: label, count: count}) AS node_counts
+}
+CALL { MATCH ()-[r]->() RETURN count(r) AS rel_count }
+CALL { MATCH (t:Talk) WHERE t.transcript IS NOT NULL RETURN count(t) AS transcript_count }
+CALL { MATCH (t:Talk) WHERE t.youtube_id IS NOT NULL RETURN count(t) AS youtube_count }
+CALL { MATCH (c:Community) RETURN count(c) AS community_count }
+RETURN node_counts, rel_count, transcript_count, youtube_count, community_count
+"""
+
+
 @app.get("/api/stats")
 async def get_stats():
     """Get knowledge graph statistics"""
     try:
-        from neo4j import GraphDatabase
-        from config import config
-        
-        driver = GraphDatabase.driver(
-            config.neo4j.uri,
-            auth=(config.neo4j.user, config.neo4j.password)
-        )
-        
-        with driver.session() as session:
-            # Get node counts
-            result = session.run("""
-                MATCH (n)
-                RETURN labels(n)[0] as label, count(n) as count
-            """)
-            
-            node_counts = {}
-            for record in result:
-                label = record['label']
-                if label:
-                    node_counts[label] = record['count']
-            
-            # Get relationship count
-            result = session.run("MATCH ()-[r]->() RETURN count(r) as count")
-            rel_record = result.single()
-            rel_count = rel_record['count'] if rel_record else 0
-            
-            # Get talks with transcripts
-            result = session.run("""
-                MATCH (t:Talk)
-                WHERE t.transcript IS NOT NULL
-                RETURN count(t) as count
-            """)
-            transcript_record = result.single()
-            transcript_count = transcript_record['count'] if transcript_record else 0
-            
-            # Get YouTube videos
-            result = session.run("""
-                MATCH (t:Talk)
-                WHERE t.youtube_id IS NOT NULL
-                RETURN count(t) as count
-            """)
-            youtube_record = result.single()
-            youtube_count = youtube_record['count'] if youtube_record else 0
-            
-            # Get community count
-            result = session.run("""
-                MATCH (c:Community)
-                RETURN count(c) as count
-            """)
-            community_record = result.single()
-            community_count = community_record['count'] if community_record else 0
+        async with app.state.neo4j_async_driver.session(default_access_mode="READ") as session:
+            # All counts in a single round trip, without blocking the event loop
+            result = await session.run(_STATS_CYPHER)
+            record = await result.single()
         
-        driver.close()
+        node_counts = {row['label']: row['count'] for row in record['node_counts']} if record else {}
+        rel_count = record['rel_count'] if record else 0
+        transcript_count = record['transcript_count'] if record else 0
+        youtube_count = record['youtube_count'] if record else 0
+        community_count = record['community_count'] if record else 0
         
         return {
             "nodes": node_counts,
@@ -874,57 +1454,128 @@ async def get_stats():
             "talks_with_transcripts": transcript_count,
             "youtube_videos": youtube_count,
             "communities": community_count,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_iso()
         }
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Upper bound on randomized Leiden runs per detection request (each run is a
+# full Leiden pass, run in parallel on up to that many cores)
+MAX_DETECTION_STARTS = 16
+
+
+def _watch_detection_status(status_queue):
+    """Mark detection jobs running as worker processes pick them up"""
+    while True:
+        message = status_queue.get()
+        if message is None:
+            return
+        job_id, status = message
+        # A fast job may already have completed; never move it back
+        detection_jobs.update(job_id, {'status': status, 'started_at': _now_iso()}, if_status='queued')
+
+
+def _detection_done(job_id: str, resolution: float, future: Future):
+    """Record the outcome of a community detection run"""
+    try:
+        result = future.result()
+    except Exception as e:
+        detection_jobs.set(job_id, {
+            'status': 'failed',
+            'resolution': resolution,
+            'error': str(e),
+            'completed_at': _now_iso()
+        })
+        return
+    
+    # New community assignments invalidate cached answers, community reads
+    # and graph payloads (the run itself cleared only its own process' cache)
+    from community_detection import clear_community_cache
+    clear_community_cache()
+    answer_cache.clear()
+    if app.state.orchestrator:
+        app.state.orchestrator.retrieval_cache.clear()
+    clear_graph_cache()
+    detection_jobs.set(job_id, {
+        'status': 'completed',
+        'resolution': resolution,
+        'result': result,
+        'completed_at': _now_iso()
+    })
+
+
 @app.post("/api/communities/detect")
 async def detect_communities(
     limit: Optional[int] = None,
-    resolution: float = 1.0
+    resolution: float = 1.0,
+    n_starts: Annotated[int, Query(ge=1, le=MAX_DETECTION_STARTS)] = 1
 ):
     """
-    Run Leiden community detection on the knowledge graph
+    Start Leiden community detection on the knowledge graph
+    
+    Detection runs in a background process; poll
+    /api/communities/detect/{job_id} for the result.
     
     Args:
         limit: Optional limit on relationships to process (None = all)
         resolution: Resolution parameter (higher = more communities)
+        n_starts: Number of randomized Leiden runs to pick the best from (1-16)
         
     Returns:
-        Detection results
+        Job ID of the queued detection run
     """
+    import importlib.util
+    missing = [lib for lib in ('igraph', 'leidenalg') if importlib.util.find_spec(lib) is None]
+    if missing:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Community detection libraries not installed: {', '.join(missing)}. Run: pip install leidenalg python-igraph"
+        )
+    
     try:
-        from community_detection import CommunityDetector
-        
-        detector = CommunityDetector()
+        from community_detection import run_detection_job
         
-        # Run detection in background (this can take time)
-        communities = detector.run_detection(limit=limit, resolution=resolution, store=True)
-        
-        num_communities = len(set(communities.values()))
+        job_id = secrets.token_hex(6)
+        detection_jobs.set(job_id, {
+            'status': 'queued',
+            'resolution': resolution,
+            'queued_at': _now_iso()
+        })
         
-        detector.close()
+        future = app.state.community_executor.submit(run_detection_job, limit, resolution, n_starts, job_id)
+        future.add_done_callback(lambda f: _detection_done(job_id, resolution, f))
         
         return {
-            "status": "success",
-            "communities_detected": num_communities,
-            "nodes_assigned": len(communities),
+            "status": "queued",
+            "job_id": job_id,
             "resolution": resolution,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_iso()
         }
     
-    except ImportError as e:
-        raise HTTPException(
-            status_code=503,
-            detail=f"Community detection libraries not installed: {str(e)}. Run: pip install leidenalg python-igraph networkx"
-        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/communities/detect/{job_id}")
+async def get_detection_status(job_id: str):
+    """
+    Get status of a community detection run
+    
+    Args:
+        job_id: Job identifier returned from /api/communities/detect
+        
+    Returns:
+        Job status, and detection counts once completed
+    """
+    job = detection_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return {"job_id": job_id, **job}
+
+
 @app.get("/api/communities")
 async def get_communities(community_id: Optional[int] = None):
     """
@@ -939,19 +1590,15 @@ async def get_communities(community_id: Optional[int] = None):
     try:
         from community_detection import CommunityDetector
         
-        detector = CommunityDetector()
+        detector = CommunityDetector(neo4j_driver=app.state.neo4j_driver)
         
-        if community_id is not None:
-            comm_info = detector.get_community_info(community_id=community_id)
-        else:
-            comm_info = detector.get_community_info()
-        
-        detector.close()
+        # Cache misses block on the sync driver - keep them off the event loop
+        comm_info = await asyncio.to_thread(detector.get_community_info, community_id=community_id)
         
         return {
             "communities": comm_info,
             "count": len(comm_info),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_iso()
         }
     
     except Exception as e:
@@ -972,15 +1619,14 @@ async def get_node_community(node_id: str):
     try:
         from community_detection import CommunityDetector
         
-        detector = CommunityDetector()
-        comm_info = detector.get_node_community(node_id)
-        detector.close()
+        detector = CommunityDetector(neo4j_driver=app.state.neo4j_driver)
+        comm_info = await asyncio.to_thread(detector.get_node_community, node_id)
         
         if comm_info:
             return {
                 "node_id": node_id,
                 "community": comm_info,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso()
             }
         else:
             raise HTTPException(status_code=404, detail=f"Node '{node_id}' not found or not assigned to a community")
@@ -1032,26 +1678,45 @@ async def start_monitoring(
             'failed_count': 0
         })
         
-        # Start background monitoring (non-blocking)
+        # Start background monitoring as a task on this event loop; blocking
+        # YouTube calls and video processing run on the ingest pool
         from youtube_monitor import YouTubeChannelMonitor
-        import threading
         
-        def run_monitor():
+        def record_results(results: Dict[str, bool]):
+            successful = sum(results.values())
+            if successful:
+                # New content invalidates cached answers and retrieval results
+                answer_cache.clear()
+                if app.state.orchestrator:
+                    app.state.orchestrator.retrieval_cache.clear()
+                clear_graph_cache()
+            monitoring_status['processed_count'] += successful
+            monitoring_status['failed_count'] += len(results) - successful
+            monitoring_status['last_check'] = _now_iso()
+        
+        async def run_monitor():
             try:
-                monitor = YouTubeChannelMonitor(
+                monitor = await asyncio.to_thread(
+                    YouTubeChannelMonitor,
                     channel_id=channel_id,
                     channel_username=channel_username
                 )
-                monitor.run_continuous(
+                await monitor.run_continuous_async(
                     check_interval_minutes=check_interval_minutes,
-                    lookback_hours=24
+                    lookback_hours=24,
+                    executor=app.state.ingest_executor,
+                    on_results=record_results
                 )
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 print(f"❌ Monitoring error: {e}")
-                monitoring_status['enabled'] = False
+            finally:
+                # A restart may already have replaced this task
+                if app.state.monitor_task in (None, asyncio.current_task()):
+                    monitoring_status['enabled'] = False
         
-        monitor_thread = threading.Thread(target=run_monitor, daemon=True)
-        monitor_thread.start()
+        app.state.monitor_task = asyncio.create_task(run_monitor())
         
         return {
             "status": "started",
@@ -1068,6 +1733,10 @@ async def stop_monitoring():
     """Stop automatic YouTube channel monitoring"""
     global monitoring_status
     
+    task = app.state.monitor_task
+    if task is not None and not task.done():
+        task.cancel()
+    app.state.monitor_task = None
     monitoring_status['enabled'] = False
     
     return {
@@ -1082,7 +1751,7 @@ async def get_monitoring_status():
     """Get current monitoring status"""
     return {
         "monitoring_status": monitoring_status,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": _now_iso()
     }
 
 
@@ -1115,7 +1784,7 @@ async def check_now():
             
             monitoring_status['processed_count'] += successful
             monitoring_status['failed_count'] += failed
-            monitoring_status['last_check'] = datetime.now().isoformat()
+            monitoring_status['last_check'] = _now_iso()
             
             return {
                 "status": "completed",
@@ -1131,15 +1800,15 @@ async def check_now():
                     }
                     for v in new_videos
                 ],
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso()
             }
         else:
-            monitoring_status['last_check'] = datetime.now().isoformat()
+            monitoring_status['last_check'] = _now_iso()
             return {
                 "status": "completed",
                 "new_videos_found": 0,
                 "message": "No new videos found",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso()
             }
     
     except Exception as e:
@@ -1147,9 +1816,14 @@ async def check_now():
 
 
 if __name__ == "__main__":
+    # Local development runner - production uses gunicorn_conf.py (multi-worker)
+    # uvloop + httptools (from uvicorn[standard]) cut per-request dispatch overhead;
+    # auto-reload spawns a file watcher, so it is opt-in for local development only
     uvicorn.run(
         "backend_api_youtube:app",
         host="0.0.0.0",
         port=8000,
-        reload=True
+        loop="uvloop",
+        http="httptools",
+        reload=os.getenv("UVICORN_RELOAD", "false").lower() == "true"
     )
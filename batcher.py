@@ -0,0 +1,103 @@
+"""
+Dynamic Batcher - Group concurrent requests into one blocking batch call
+
+Used by the API for query embeddings (RAGSystem.embed_queries), so concurrent
+chat requests share one encode() call. A lone request is dispatched
+immediately; only when requests are already waiting does the batcher linger
+up to max_delay to fill a batch.
+"""
+
+import asyncio
+from typing import Any, Callable, List, Optional, Set, Tuple
+
+
+class DynamicBatcher:
+    """Collects queued items into batches and runs them in a worker thread"""
+
+    def __init__(self, get_batch_fn: Callable[[], Callable[[List[Any]], List[Any]]],
+                 max_batch_size: int = 8, max_delay: float = 0.05):
+        """
+        Initialize dynamic batcher
+
+        Args:
+            get_batch_fn: Returns the blocking batch function (resolved per batch,
+                since the systems are initialized after the batcher starts). It takes
+                a list of items and returns one result per item; a result that is
+                an Exception is raised to that item's caller
+            max_batch_size: Maximum items per batch
+            max_delay: Seconds to wait for more items once a batch has started filling
+        """
+        self.get_batch_fn = get_batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_delay = max_delay
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._batches: Set[asyncio.Task] = set()  # keep in-flight batch tasks referenced
+
+    def start(self):
+        """Start the batching loop on the running event loop"""
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the batching loop"""
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, item: Any) -> Any:
+        """
+        Queue an item and wait for its result
+
+        Args:
+            item: Item passed to the batch function
+
+        Returns:
+            The item's result (re-raises the item's exception)
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[Any, asyncio.Future]]:
+        """Wait for one item, then gather whatever else arrives within max_delay"""
+        batch = [await self._queue.get()]
+        if self._queue.empty():
+            return batch
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_delay
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            task = asyncio.create_task(self._dispatch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _dispatch(self, batch: List[Tuple[Any, asyncio.Future]]):
+        try:
+            results = await asyncio.to_thread(self.get_batch_fn(), [item for item, _ in batch])
+        except Exception as e:
+            results = [e] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():  # client went away
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -8,12 +8,177 @@ This module:
 4. Provides query interface for community information
 """
 
-import networkx as nx
-from typing import Dict, List, Optional
+import os
+import random
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import numpy as np
+from cachetools import TTLCache
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
 from neo4j import GraphDatabase
+from neo4j.exceptions import ClientError
 from config import config
 from tqdm import tqdm
 
+if TYPE_CHECKING:
+    import igraph as ig  # imported lazily at runtime (optional dependency)
+
+
+# Rows per UNWIND write transaction
+WRITE_BATCH_SIZE = 5000
+
+# Extracted igraph, reused by extract_graph while the graph is unchanged
+GRAPH_CACHE_PATH = config.paths.data_dir / "community_graph.pkl.gz"
+
+
+# Identifying property of each entity label. Node rows are bucketed by the
+# label seen during extraction, so writes can use label-scoped index seeks
+LABEL_ID_PROPS = {
+    'Speaker': 'name',
+    'Talk': 'title',
+    'Tag': 'keyword',
+    'Event': 'name',
+    'Category': 'name',
+    'Organization': 'name',
+    'Product': 'name',
+    'Concept': 'name'
+}
+
+# Label-scoped lookup of a $node_id of unknown label as a UNION of index seeks
+_MATCH_NODE_ID = "\n    UNION\n".join(
+    f"    MATCH (n:{label} {{{prop}: $node_id}}) RETURN n"
+    for label, prop in LABEL_ID_PROPS.items()
+)
+
+
+# Community reads (get_community_info / get_node_community) only change when
+# detection runs, so they are served from a short-lived per-process cache
+_community_cache = TTLCache(maxsize=1024, ttl=300)
+_community_cache_lock = threading.Lock()
+_MISSING = object()
+
+
+def _cached_community(key, fetch):
+    """Return the cached value for key, calling fetch() on a miss"""
+    with _community_cache_lock:
+        value = _community_cache.get(key, _MISSING)
+    if value is _MISSING:
+        value = fetch()
+        with _community_cache_lock:
+            _community_cache[key] = value
+    return value
+
+
+# Queue detection worker processes report job status on (set per worker
+# process by init_detection_worker)
+_status_queue = None
+
+
+def init_detection_worker(status_queue):
+    """Process pool initializer: keep the queue run_detection_job reports status on"""
+    global _status_queue
+    _status_queue = status_queue
+
+
+def clear_community_cache():
+    """Drop cached community reads (after communities are re-stored)"""
+    with _community_cache_lock:
+        _community_cache.clear()
+
+def _batches(rows: Iterable[Dict], size: int = WRITE_BATCH_SIZE) -> Iterator[List[Dict]]:
+    """Split rows into lists of at most size items"""
+    it = iter(rows)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _run_rows(tx, query: str, rows: List[Dict]):
+    """Transaction function: run an UNWIND $rows query"""
+    tx.run(query, rows=rows).consume()
+
+
+
+def _reset_communities(tx, ids: List[int], sizes: List[int], topics: List[List[str]]):
+    """Transaction function: drop old community data and create Community nodes"""
+    # First, remove old community property
+    tx.run("""
+        MATCH (n)
+        WHERE n.community_id IS NOT NULL
+        REMOVE n.community_id
+    """).consume()
+    
+    # Remove old Community nodes
+    tx.run("MATCH (c:Community) DETACH DELETE c").consume()
+    
+    # Columnar parameters: plain int lists encode far smaller than per-row maps
+    tx.run("""
+        UNWIND range(0, size($ids) - 1) AS i
+        MERGE (c:Community {id: $ids[i]})
+        SET c.size = $sizes[i],
+            c.topics = $topics[i]
+    """, ids=ids, sizes=sizes, topics=topics).consume()
+
+
+def _leiden_membership(G, resolution: float, seed: Optional[int] = None) -> List[int]:
+    """Run Leiden (CPM objective) on a weighted igraph and return the membership"""
+    if seed is not None:
+        # igraph draws from Python's random module by default
+        random.seed(seed)
+    
+    # igraph's native Leiden runs entirely in the C core. CPM is used
+    # since it supports a resolution parameter (ModularityVertexPartition
+    # doesn't support resolution_parameter in older leidenalg versions)
+    try:
+        partition = G.community_leiden(
+            objective_function="CPM",
+            weights="weight",
+            resolution=resolution,
+            n_iterations=2
+        )
+    except (AttributeError, TypeError):
+        # Older python-igraph without community_leiden(resolution=...)
+        try:
+            import leidenalg
+        except ImportError:
+            print("⚠️  leidenalg or igraph not installed. Installing...")
+            print("   Run: pip install leidenalg python-igraph")
+            raise ImportError("leidenalg and python-igraph required for community detection")
+        
+        partition = leidenalg.find_partition(
+            G,
+            leidenalg.CPMVertexPartition,
+            weights="weight",
+            resolution_parameter=resolution,
+            seed=seed
+        )
+    
+    return partition.membership
+
+
+def _leiden_start(n: int, edges: List[Tuple[int, int]], weights: List[int],
+                  resolution: float, seed: int) -> List[int]:
+    """Process-pool entry point: rebuild the graph and run one seeded Leiden start"""
+    import igraph as ig
+    G = ig.Graph(n=n, edges=edges, directed=False)
+    G.es['weight'] = weights
+    return _leiden_membership(G, resolution, seed=seed)
+
+# Server-side batching of a per-row write statement (`row` is bound per item)
+_APOC_ITERATE = """
+CALL apoc.periodic.iterate(
+    'UNWIND $rows AS row RETURN row',
+    $action,
+    {batchSize: $batch_size, parallel: false, params: {rows: $rows}}
+)
+YIELD failedOperations, errorMessages
+RETURN failedOperations, errorMessages
+"""
+
 
 class CommunityDetector:
     """Detect communities in Neo4j graph using Leiden algorithm"""
@@ -23,8 +188,12 @@ class CommunityDetector:
         Initialize community detector
         
         Args:
-            neo4j_driver: Optional Neo4j driver (creates new if None)
+            neo4j_driver: Optional shared Neo4j driver (creates new if None)
         """
+        # A shared driver belongs to the caller and is not closed here
+        self._owns_driver = neo4j_driver is None
+        # Cleared the first time apoc.periodic.iterate is unavailable
+        self._apoc_available = True
         if neo4j_driver:
             self.driver = neo4j_driver
         else:
@@ -33,186 +202,288 @@ class CommunityDetector:
                 auth=(config.neo4j.user, config.neo4j.password)
             )
     
-    def extract_graph(self, limit: Optional[int] = None) -> nx.Graph:
+    def ensure_indexes(self):
+        """Create the property indexes community writes and lookups seek on"""
+        indexes = [
+            f"CREATE INDEX {label.lower()}_{prop}_idx IF NOT EXISTS FOR (n:{label}) ON (n.{prop})"
+            for label, prop in LABEL_ID_PROPS.items()
+        ]
+        indexes.append("CREATE INDEX community_id_idx IF NOT EXISTS FOR (c:Community) ON (c.id)")
+        
+        with self.driver.session() as session:
+            for query in indexes:
+                try:
+                    session.run(query).consume()
+                except Exception:
+                    pass  # Already covered by a uniqueness constraint's index
+    
+    def graph_fingerprint(self, limit: Optional[int] = None) -> List:
         """
-        Extract graph from Neo4j into NetworkX format
+        Get a cheap stamp of the graph's current version
+        
+        Node/relationship counts and highest internal ids change whenever
+        content is ingested or deleted, without reading the whole graph.
+        Community nodes and BELONGS_TO relationships are excluded, so storing
+        a detection run does not invalidate the stamp.
         
         Args:
-            limit: Optional limit on number of relationships to extract
+            limit: Relationship limit of the extraction the stamp is for
             
         Returns:
-            NetworkX graph
+            List of [nodes, max node id, relationships, max relationship id, limit]
         """
-        print("📊 Extracting graph from Neo4j...")
-        G = nx.Graph()
-        
-        with self.driver.session() as session:
-            # Get all relationships
-            if limit:
-                query = """
-                MATCH (n)-[r]->(m)
-                RETURN n, labels(n)[0] as n_type, r, m, labels(m)[0] as m_type
-                LIMIT $limit
-                """
-                result = session.run(query, limit=limit)
-            else:
-                query = """
-                MATCH (n)-[r]->(m)
-                RETURN n, labels(n)[0] as n_type, r, m, labels(m)[0] as m_type
-                """
-                result = session.run(query)
-            
-            nodes_added = set()
-            
-            for record in tqdm(result, desc="Building graph"):
-                # Source node
-                n = record['n']
-                n_type = record['n_type']
-                n_id = n.get('name') or n.get('title') or n.get('keyword') or str(n.id)
-                n_name = n.get('name') or n.get('title') or n.get('keyword') or 'Unknown'
-                
-                if n_id not in nodes_added:
-                    G.add_node(n_id, 
-                              name=n_name,
-                              type=n_type,
-                              neo4j_id=n.id)
-                    nodes_added.add(n_id)
-                
-                # Target node
-                m = record['m']
-                m_type = record.get('m_type', 'Unknown')
-                m_id = m.get('name') or m.get('title') or m.get('keyword') or str(m.id)
-                m_name = m.get('name') or m.get('title') or m.get('keyword') or 'Unknown'
-                
-                if m_id not in nodes_added:
-                    G.add_node(m_id,
-                              name=m_name,
-                              type=m_type,
-                              neo4j_id=m.id)
-                    nodes_added.add(m_id)
-                
-                # Edge
-                rel = record['r']
-                rel_type = rel.type if rel else 'RELATED_TO'
-                
-                if not G.has_edge(n_id, m_id):
-                    G.add_edge(n_id, m_id, type=rel_type)
-        
-        print(f"   ✅ Extracted graph: {G.number_of_nodes()} nodes, {G.number_of_edges()} edges")
-        return G
+        with self.driver.session(default_access_mode="READ") as session:
+            record = session.run("""
+                CALL {
+                    MATCH (n) WHERE NOT n:Community
+                    RETURN count(n) AS nodes, max(id(n)) AS max_node
+                }
+                CALL {
+                    MATCH (a)-[r]->(b)
+                    WHERE type(r) <> 'BELONGS_TO' AND NOT a:Community AND NOT b:Community
+                    RETURN count(r) AS rels, max(id(r)) AS max_rel
+                }
+                RETURN nodes, max_node, rels, max_rel
+            """).single()
+        return [record['nodes'], record['max_node'], record['rels'], record['max_rel'], limit]
     
-    def detect_communities(self, G: nx.Graph, resolution: float = 1.0) -> Dict[str, int]:
+    def extract_graph(self, limit: Optional[int] = None, use_cache: bool = True) -> "ig.Graph":
         """
-        Detect communities using Leiden algorithm
+        Extract graph from Neo4j directly into an igraph Graph
+        
+        The graph is saved to GRAPH_CACHE_PATH and reused while the graph
+        fingerprint is unchanged (e.g. across resolution sweeps).
         
         Args:
-            G: NetworkX graph
-            resolution: Resolution parameter (higher = more communities)
+            limit: Optional limit on number of relationships to extract
+            use_cache: Whether to load/save the on-disk graph cache
             
         Returns:
-            Dictionary mapping node_id -> community_id
+            Undirected igraph Graph with 'name' (node id) and 'type' vertex
+            attributes and a 'weight' (relationship count) edge attribute
         """
         try:
-            import leidenalg
             import igraph as ig
         except ImportError:
-            print("⚠️  leidenalg or igraph not installed. Installing...")
+            print("⚠️  python-igraph not installed")
             print("   Run: pip install leidenalg python-igraph")
             raise ImportError("leidenalg and python-igraph required for community detection")
         
-        print(f"🔍 Detecting communities with Leiden algorithm (resolution={resolution})...")
+        fingerprint = None
+        if use_cache:
+            fingerprint = self.graph_fingerprint(limit)
+            if GRAPH_CACHE_PATH.exists():
+                try:
+                    G = ig.Graph.Read_Picklez(str(GRAPH_CACHE_PATH))
+                    if G['fingerprint'] == fingerprint:
+                        print(f"📊 Loaded unchanged graph from cache: {G.vcount()} nodes, {G.ecount()} edges")
+                        return G
+                except Exception as e:
+                    print(f"⚠️  Could not load cached graph: {e}")
         
-        # Convert NetworkX to igraph
-        # Create mapping from NetworkX node IDs to igraph indices
-        node_list = list(G.nodes())
-        node_to_idx = {node: idx for idx, node in enumerate(node_list)}
+        print("📊 Extracting graph from Neo4j...")
         
-        # Create igraph graph
-        edges = [(node_to_idx[u], node_to_idx[v]) for u, v in G.edges()]
-        g_ig = ig.Graph(edges, directed=False)
+        # Intern node ids to contiguous vertex indices
+        id2idx: Dict[str, int] = {}
+        names: List[str] = []
+        types: List[str] = []
+        weights: Dict[Tuple[int, int], int] = {}
         
-        # Add node attributes
-        for attr in ['name', 'type']:
-            if attr in G.nodes[node_list[0]]:
-                g_ig.vs[attr] = [G.nodes[node][attr] for node in node_list]
+        def intern(node_id: str, node_type: str) -> int:
+            idx = id2idx.get(node_id)
+            if idx is None:
+                idx = id2idx[node_id] = len(names)
+                names.append(node_id)
+                types.append(node_type)
+            return idx
         
-        # Run Leiden algorithm
-        # Use CPMVertexPartition which supports resolution_parameter
-        # (ModularityVertexPartition doesn't support resolution_parameter in this version)
-        partition = leidenalg.find_partition(
-            g_ig,
-            leidenalg.CPMVertexPartition,
-            resolution_parameter=resolution
-        )
+        # Project only the identifying scalars and collapse parallel
+        # relationships server-side into one weighted row per node pair.
+        # The aggregated rows are streamed by the driver, not paged: SKIP
+        # pages would redo the whole aggregation for every page. Communities
+        # from earlier runs are left out so they don't bias the new partition
+        query = f"""
+        MATCH (n)-[r]->(m)
+        WHERE type(r) <> 'BELONGS_TO' AND NOT n:Community AND NOT m:Community
+        {"WITH n, r, m LIMIT $limit" if limit else ""}
+        RETURN coalesce(n.name, n.title, n.keyword, toString(id(n))) AS n_id,
+               labels(n)[0] AS n_type,
+               coalesce(m.name, m.title, m.keyword, toString(id(m))) AS m_id,
+               labels(m)[0] AS m_type,
+               count(r) AS weight
+        """
+        
+        with self.driver.session(default_access_mode="READ") as session:
+            result = session.run(query, limit=limit)
+            # Refresh the bar at most once a second / per 10k rows, not per row
+            rows = tqdm(result, desc="Building graph", unit=" pairs", mininterval=1.0, miniters=10000)
+            for n_id, n_type, m_id, m_type, weight in rows:
+                a = intern(n_id, n_type)
+                b = intern(m_id, m_type or 'Unknown')
+                # Undirected: relationships in both directions add to one edge
+                key = (a, b) if a <= b else (b, a)
+                weights[key] = weights.get(key, 0) + weight
+        
+        G = ig.Graph(n=len(names), edges=list(weights), directed=False)
+        G.vs['name'] = names
+        G.vs['type'] = types
+        G.es['weight'] = list(weights.values())
+        
+        print(f"   ✅ Extracted graph: {G.vcount()} nodes, {G.ecount()} edges")
+        
+        if use_cache:
+            G['fingerprint'] = fingerprint
+            try:
+                GRAPH_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = GRAPH_CACHE_PATH.with_name(GRAPH_CACHE_PATH.name + '.tmp')
+                G.write_picklez(str(tmp_path))
+                os.replace(tmp_path, GRAPH_CACHE_PATH)
+            except Exception as e:
+                print(f"⚠️  Could not cache graph: {e}")
+        
+        return G
+    
+    def detect_communities(self, G: "ig.Graph", resolution: float = 1.0, n_starts: int = 1) -> Dict[str, int]:
+        """
+        Detect communities using Leiden algorithm
+        
+        Args:
+            G: igraph Graph from extract_graph
+            resolution: Resolution parameter (higher = more communities)
+            n_starts: Number of randomized runs; the highest-modularity
+                partition is kept
+            
+        Returns:
+            Dictionary mapping node_id -> community_id
+        """
+        print(f"🔍 Detecting communities with Leiden algorithm (resolution={resolution})...")
+        
+        if n_starts <= 1:
+            membership = _leiden_membership(G, resolution)
+        else:
+            # Leiden is randomized: run independent starts in worker processes
+            # (only the edge list is shipped) and keep the best partition
+            n = G.vcount()
+            edges = G.get_edgelist()
+            weights = G.es['weight']
+            workers = min(n_starts, os.cpu_count() or 1)
+            print(f"   Running {n_starts} starts on {workers} processes...")
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                memberships = list(pool.map(
+                    _leiden_start,
+                    [n] * n_starts, [edges] * n_starts, [weights] * n_starts,
+                    [resolution] * n_starts, range(n_starts)
+                ))
+            scores = [G.modularity(m, weights='weight') for m in memberships]
+            best = max(range(n_starts), key=scores.__getitem__)
+            membership = memberships[best]
+            print(f"   Best start: seed {best} (modularity {scores[best]:.4f})")
         
         # Map back to node IDs
-        communities = {}
-        for idx, community_id in enumerate(partition.membership):
-            node_id = node_list[idx]
-            communities[node_id] = community_id
+        communities = dict(zip(G.vs['name'], membership))
         
         num_communities = len(set(communities.values()))
         print(f"   ✅ Detected {num_communities} communities")
         
         return communities
     
-    def store_communities(self, communities: Dict[str, int], community_metadata: Optional[Dict[int, Dict]] = None):
+    def store_communities(self, communities: Dict[str, int], community_metadata: Optional[Dict[int, Dict]] = None,
+                          node_types: Optional[Dict[str, str]] = None):
         """
         Store community assignments back in Neo4j
         
         Args:
             communities: Dictionary mapping node_id -> community_id
-            community_metadata: Optional metadata for each community (size, topics, etc.)
+            community_metadata: Optional metadata for every community: 'size'
+                (required) and 'topics'; sizes are counted from communities if omitted
+            node_types: Optional node_id -> label from extraction; labelled nodes
+                are matched with index seeks instead of an all-nodes scan
         """
         print("💾 Storing community assignments in Neo4j...")
+        self.ensure_indexes()
+        node_types = node_types or {}
+        
+        # Community nodes with metadata (created before assignments link to them),
+        # as parallel columns of Python ints (never numpy scalars) for bolt
+        # Sizes come from the metadata when given (run_detection's bincount);
+        # only callers without metadata pay for counting the assignments here
+        if not community_metadata:
+            community_metadata = {
+                comm_id: {'size': size}
+                for comm_id, size in Counter(communities.values()).items()
+            }
+        comm_ids, comm_sizes, comm_topics = [], [], []
+        for comm_id, metadata in community_metadata.items():
+            comm_ids.append(int(comm_id))
+            comm_sizes.append(int(metadata['size']))
+            comm_topics.append(list(metadata.get('topics', [])))
         
         with self.driver.session() as session:
-            # First, remove old community property
-            session.run("""
-                MATCH (n)
-                WHERE n.community_id IS NOT NULL
-                REMOVE n.community_id
-            """)
-            
-            # Store new community assignments
-            for node_id, community_id in tqdm(communities.items(), desc="Storing communities"):
-                # Try to find node by name, title, or keyword
-                session.run("""
-                    MATCH (n)
-                    WHERE (n.name = $node_id OR n.title = $node_id OR n.keyword = $node_id)
-                    SET n.community_id = $community_id
-                """, node_id=node_id, community_id=community_id)
+            # Reset old communities and create the new Community nodes in one
+            # explicit transaction - a single commit instead of one per statement
+            session.execute_write(_reset_communities, comm_ids, comm_sizes, comm_topics)
             
-            # Create Community nodes and relationships
-            # First, remove old Community nodes
-            session.run("MATCH (c:Community) DETACH DELETE c")
+            # Store new community assignments and BELONGS_TO relationships,
+            # with one statement per label so each row is a single index seek
+            # on that label's id property. Anything else (e.g. unlabelled or
+            # unnamed nodes) falls back to a property scan
+            buckets: Dict[Optional[str], List[Dict]] = {}
+            for node_id, community_id in communities.items():
+                node_type = node_types.get(node_id)
+                if node_type not in LABEL_ID_PROPS:
+                    node_type = None
+                buckets.setdefault(node_type, []).append({'node_id': node_id, 'community_id': community_id})
             
-            # Get unique communities
-            unique_communities = set(communities.values())
-            
-            # Create Community nodes with metadata
-            for comm_id in unique_communities:
-                metadata = community_metadata.get(comm_id, {}) if community_metadata else {}
-                size = metadata.get('size', sum(1 for v in communities.values() if v == comm_id))
-                topics = metadata.get('topics', [])
-                
-                session.run("""
-                    MERGE (c:Community {id: $comm_id})
-                    SET c.size = $size,
-                        c.topics = $topics
-                """, comm_id=comm_id, size=size, topics=topics)
+            assign = """
+                SET n.community_id = row.community_id
+                WITH n, row
+                MATCH (c:Community {id: row.community_id})
+                MERGE (n)-[:BELONGS_TO]->(c)
+            """
             
-            # Create BELONGS_TO relationships
-            for node_id, community_id in tqdm(communities.items(), desc="Creating relationships"):
-                session.run("""
-                    MATCH (n)
-                    WHERE (n.name = $node_id OR n.title = $node_id OR n.keyword = $node_id)
-                    MATCH (c:Community {id: $community_id})
-                    MERGE (n)-[:BELONGS_TO]->(c)
-                """, node_id=node_id, community_id=community_id)
+            with tqdm(total=len(communities), desc="Storing communities") as progress:
+                for node_type, rows in buckets.items():
+                    if node_type:
+                        match = f"MATCH (n:{node_type} {{{LABEL_ID_PROPS[node_type]}: row.node_id}})"
+                    else:
+                        match = "MATCH (n) WHERE (n.name = row.node_id OR n.title = row.node_id OR n.keyword = row.node_id)"
+                    self._write_rows(session, match + assign, rows, progress)
         
+        clear_community_cache()
         print("   ✅ Community assignments stored")
     
+    def _write_rows(self, session, action: str, rows: List[Dict], progress: tqdm):
+        """
+        Apply a per-row write statement to all rows
+        
+        Uses apoc.periodic.iterate so Neo4j batches the transactions
+        server-side from a single call; falls back to one UNWIND transaction
+        per client-side batch when APOC is not installed.
+        
+        Args:
+            session: Neo4j session
+            action: Cypher statement operating on a bound `row`
+            rows: Row dictionaries
+            progress: Progress bar advanced by the rows written
+        """
+        if self._apoc_available:
+            try:
+                record = session.run(_APOC_ITERATE, action=action, rows=rows,
+                                     batch_size=WRITE_BATCH_SIZE).single()
+            except ClientError as e:
+                print(f"⚠️  apoc.periodic.iterate unavailable, writing with UNWIND batches: {e.message}")
+                self._apoc_available = False
+            else:
+                if record['failedOperations']:
+                    raise RuntimeError(f"Community write failed: {record['errorMessages']}")
+                progress.update(len(rows))
+                return
+        
+        query = "UNWIND $rows AS row\n" + action
+        for batch in _batches(rows):
+            session.execute_write(_run_rows, query, batch)
+            progress.update(len(batch))
+    
     def get_community_info(self, community_id: Optional[int] = None) -> List[Dict]:
         """
         Get information about communities
@@ -223,6 +494,10 @@ class CommunityDetector:
         Returns:
             List of community information dictionaries
         """
+        return _cached_community(('info', community_id), lambda: self._fetch_community_info(community_id))
+    
+    def _fetch_community_info(self, community_id: Optional[int] = None) -> List[Dict]:
+        """Query community information from Neo4j"""
         with self.driver.session() as session:
             if community_id is not None:
                 query = """
@@ -285,10 +560,16 @@ class CommunityDetector:
         Returns:
             Community information or None
         """
+        return _cached_community(('node', node_id), lambda: self._fetch_node_community(node_id))
+    
+    def _fetch_node_community(self, node_id: str) -> Optional[Dict]:
+        """Query a node's community from Neo4j"""
         with self.driver.session() as session:
-            query = """
+            query = f"""
+            CALL {{
+{_MATCH_NODE_ID}
+            }}
             MATCH (n)-[:BELONGS_TO]->(c:Community)
-            WHERE (n.name = $node_id OR n.title = $node_id OR n.keyword = $node_id)
             OPTIONAL MATCH (other)-[:BELONGS_TO]->(c)
             WITH c, collect(DISTINCT other) as members
             RETURN c.id as id,
@@ -317,7 +598,8 @@ class CommunityDetector:
                 }
             return None
     
-    def run_detection(self, limit: Optional[int] = None, resolution: float = 1.0, store: bool = True):
+    def run_detection(self, limit: Optional[int] = None, resolution: float = 1.0, store: bool = True,
+                      n_starts: int = 1):
         """
         Run complete community detection pipeline
         
@@ -325,6 +607,7 @@ class CommunityDetector:
             limit: Optional limit on relationships to extract
             resolution: Resolution parameter for Leiden algorithm
             store: Whether to store results in Neo4j
+            n_starts: Number of randomized Leiden runs to pick the best from
             
         Returns:
             Dictionary mapping node_id -> community_id
@@ -333,28 +616,60 @@ class CommunityDetector:
         G = self.extract_graph(limit=limit)
         
         # Detect communities
-        communities = self.detect_communities(G, resolution=resolution)
-        
-        # Calculate community metadata
-        community_metadata = {}
-        for comm_id in set(communities.values()):
-            comm_nodes = [node_id for node_id, cid in communities.items() if cid == comm_id]
-            community_metadata[comm_id] = {
-                'size': len(comm_nodes)
-            }
+        communities = self.detect_communities(G, resolution=resolution, n_starts=n_starts)
+        
+        # Calculate community metadata. Leiden community ids are contiguous
+        # from 0, so sizes are a single bincount over the membership array
+        membership = np.fromiter(communities.values(), dtype=np.int32, count=len(communities))
+        sizes = np.bincount(membership)
+        community_metadata = {
+            comm_id: {'size': int(size)}
+            for comm_id, size in enumerate(sizes.tolist()) if size
+        }
         
         # Store in Neo4j
         if store:
-            self.store_communities(communities, community_metadata)
+            self.store_communities(communities, community_metadata, node_types=dict(zip(G.vs['name'], G.vs['type'])))
         
         return communities
     
     def close(self):
-        """Close Neo4j driver"""
-        if self.driver:
+        """Close Neo4j driver if this detector created it"""
+        if self.driver and self._owns_driver:
             self.driver.close()
 
 
+def run_detection_job(limit: Optional[int] = None, resolution: float = 1.0, n_starts: int = 1,
+                      job_id: Optional[str] = None) -> Dict[str, int]:
+    """
+    Run and store community detection with a private driver
+    
+    Module-level so it can be submitted to a process pool.
+    
+    Args:
+        limit: Optional limit on relationships to extract
+        resolution: Resolution parameter for Leiden algorithm
+        n_starts: Number of randomized Leiden runs to pick the best from
+        job_id: Job to report as running on the worker's status queue
+        
+    Returns:
+        Summary with communities_detected and nodes_assigned counts
+    """
+    if _status_queue is not None and job_id is not None:
+        _status_queue.put((job_id, 'running'))
+    
+    detector = CommunityDetector()
+    try:
+        communities = detector.run_detection(limit=limit, resolution=resolution, store=True, n_starts=n_starts)
+    finally:
+        detector.close()
+    
+    return {
+        'communities_detected': len(set(communities.values())),
+        'nodes_assigned': len(communities)
+    }
+
+
 def main():
     """Run community detection"""
     detector = CommunityDetector()
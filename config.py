@@ -16,6 +16,10 @@ class Neo4jConfig(BaseModel):
     uri: str = Field(default_factory=lambda: os.getenv("NEO4J_URI", "bolt://localhost:7687"))
     user: str = Field(default_factory=lambda: os.getenv("NEO4J_USER", "neo4j"))
     password: str = Field(default_factory=lambda: os.getenv("NEO4J_PASSWORD", ""))
+    max_connection_pool_size: int = Field(
+        default_factory=lambda: int(os.getenv("NEO4J_MAX_POOL_SIZE", "50"))
+    )
+    connection_acquisition_timeout: float = 30.0  # Seconds to wait for a pooled connection
     
     def validate(self) -> bool:
         """Check if configuration is valid"""
@@ -35,6 +39,22 @@ class EmbeddingConfig(BaseModel):
     device: str = "cpu"  # Can be changed to "cuda" if GPU available
     batch_size: int = 32
     max_length: int = 512
+    # On-disk embedding dtype: "fp32", "fp16" (half size) or "int8" (quarter
+    # size, per-dimension scale saved alongside)
+    storage_dtype: str = Field(
+        default_factory=lambda: os.getenv("EMBEDDING_STORAGE_DTYPE", "fp32")
+    )
+    # Inference backend for batch embedding on CPU: "torch", or "onnx" for an
+    # int8 dynamically quantized ONNX Runtime model (sentence-transformers[onnx])
+    backend: str = Field(
+        default_factory=lambda: os.getenv("EMBEDDING_BACKEND", "torch")
+    )
+    # Evaluator-side similarity model: a static model2vec model (far faster
+    # on CPU) unless EVALUATOR_FAST_EMBEDDINGS=false for a high-fidelity run
+    evaluator_fast: bool = Field(
+        default_factory=lambda: os.getenv("EVALUATOR_FAST_EMBEDDINGS", "true").lower() == "true"
+    )
+    evaluator_model: str = "minishlab/potion-base-8M"
 
 
 class LLMConfig(BaseModel):
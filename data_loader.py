@@ -8,26 +8,172 @@ This module handles:
 - Batch processing for performance
 """
 
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Tuple
 import pandas as pd
 from neo4j import GraphDatabase
+from neo4j.exceptions import ClientError
 from tqdm import tqdm
 
 from config import config
 
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+except ImportError:  # pandas' single-threaded reader is used instead
+    pa = None
+    pacsv = None
+
+
+# Rows parsed per CSV chunk; bounds memory to one chunk instead of the file
+CSV_CHUNK_SIZE = 50_000
+
+# Bytes parsed per record batch by the multithreaded pyarrow reader
+ARROW_BLOCK_SIZE = 8 << 20
+
+# Rows per UNWIND statement - one round trip per ~10k rows, not per 100
+WRITE_BATCH_SIZE = 10_000
+
+# Concurrent write sessions per relationship type
+RELATIONSHIP_WORKERS = 4
+
+# Rows per server-side transaction when apoc.periodic.iterate is available
+APOC_BATCH_SIZE = 1000
+
+# Node labels reported by get_statistics
+STAT_LABELS = ["Speaker", "Talk", "Tag", "Event", "Category"]
+
+_STATS_CYPHER = "\n".join(
+    [f"CALL {{ MATCH (n:{label}) RETURN count(n) AS {label} }}" for label in STAT_LABELS]
+    + ["CALL { MATCH ()-[r]->() RETURN count(r) AS Relationships }",
+       "RETURN " + ", ".join(STAT_LABELS + ["Relationships"])]
+)
+
+
+# Lowercased placeholder strings treated as missing values
+_NULL_STRINGS = frozenset(("", "none", "null", "nan"))
+
 
 def safe_str(value: Any) -> str:
     """Safely convert value to string, handling None/null/nan"""
     if value is None:
         return ""
-    s = str(value).strip()
-    if s.lower() in ["none", "null", "nan", ""]:
+    s = (value if type(value) is str else str(value)).strip()
+    # Placeholders are at most 4 chars, so longer strings skip the lower() copy
+    if len(s) <= 4 and s.lower() in _NULL_STRINGS:
         return ""
     return s
 
 
+def clean_col(df: pd.DataFrame, col: str) -> pd.Series:
+    """Vectorized safe_str over a CSV column ("" for missing columns)"""
+    if col not in df:
+        return pd.Series("", index=df.index, dtype="string")
+    s = df[col]
+    if not isinstance(s.dtype, pd.StringDtype):
+        s = s.astype("string")
+    s = s.fillna("").str.strip()
+    return s.mask(s.str.lower().isin(_NULL_STRINGS), "")
+
+
+def iter_clean_chunks(csv_path: Path, cols: Dict[str, str], chunksize: int = CSV_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Stream a CSV in chunks of cleaned string columns
+    
+    Only the referenced columns are parsed; columns missing from the file
+    come back as empty strings. With pyarrow installed the file is parsed
+    by its multithreaded reader into Arrow-backed string columns, in
+    batches of ARROW_BLOCK_SIZE bytes instead of chunksize rows.
+    
+    Args:
+        csv_path: CSV file path
+        cols: Output column name -> CSV column name
+        chunksize: Rows per chunk (pandas reader only)
+        
+    Yields:
+        DataFrames with one cleaned column per key of cols
+    """
+    wanted = set(cols.values())
+    if pacsv is not None:
+        chunks = _iter_arrow_chunks(csv_path, sorted(wanted))
+    else:
+        chunks = pd.read_csv(csv_path, chunksize=chunksize, usecols=lambda c: c in wanted, dtype="string")
+    for chunk in chunks:
+        yield pd.DataFrame({key: clean_col(chunk, col) for key, col in cols.items()})
+
+
+def _iter_arrow_chunks(csv_path: Path, columns: List[str]) -> Iterator[pd.DataFrame]:
+    """Stream CSV record batches via pyarrow as DataFrames of Arrow strings"""
+    reader = pacsv.open_csv(
+        csv_path,
+        read_options=pacsv.ReadOptions(use_threads=True, block_size=ARROW_BLOCK_SIZE),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=columns,
+            include_missing_columns=True,
+            column_types={col: pa.string() for col in columns},
+            strings_can_be_null=True  # same NA markers as pandas
+        )
+    )
+    string_dtype = pd.StringDtype("pyarrow")
+    for batch in reader:
+        yield batch.to_pandas(types_mapper={pa.string(): string_dtype}.get)
+
+
+# Output columns, end node (label, id property) and extra SET clause per
+# relationship CSV. Rows are resolved to element ids before writing, so the
+# per-row statement is two id seeks instead of two index lookups
+RELATIONSHIP_SPECS = {
+    "GIVES_TALK": {
+        "cols": {"from": "a.name", "to": "b.title", "date": "r.date"},
+        "from": ("Speaker", "name"),
+        "to": ("Talk", "title"),
+        "set": "SET rel.date = r.date"
+    },
+    "IS_PART_OF": {
+        "cols": {"from": "a.title", "to": "b.name"},
+        "from": ("Talk", "title"),
+        "to": ("Event", "name"),
+        "set": ""
+    },
+    "IS_CATEGORIZED_AS": {
+        "cols": {"from": "a.title", "to": "b.name"},
+        "from": ("Talk", "title"),
+        "to": ("Category", "name"),
+        "set": ""
+    },
+    "IS_DESCRIBED_BY": {
+        "cols": {"from": "a.title", "to": "b.keyword"},
+        "from": ("Talk", "title"),
+        "to": ("Tag", "keyword"),
+        "set": ""
+    },
+}
+
+
+# Server-side batching of a per-row relationship statement. Batches run
+# sequentially: relationship rows share end nodes (a Talk appears in every
+# relationship type, a Tag in many IS_DESCRIBED_BY rows), and parallel
+# batches would deadlock on their locks. Failed batches still retry
+_APOC_ITERATE = """
+CALL apoc.periodic.iterate(
+    'UNWIND $batch AS r RETURN r',
+    $action,
+    {batchSize: $apoc_batch_size, parallel: false, retries: 3, params: {batch: $batch}}
+)
+YIELD failedOperations, errorMessages
+RETURN failedOperations, errorMessages
+"""
+
+
+def _write_batches(tx, query: str, rows: List[Any], batch_size: int):
+    """Transaction function: run an UNWIND $batch query over rows (dicts or plain values)"""
+    for i in range(0, len(rows), batch_size):
+        tx.run(query, batch=rows[i:i+batch_size]).consume()
+
+
 class DataLoader:
     """Loads data from CSV files into Neo4j"""
     
@@ -36,6 +182,10 @@ class DataLoader:
         self.config = config.neo4j
         self.cdl_db_path = config.paths.cdl_db_path
         self.driver = None
+        self.apoc_available = False
+        # (label, property) -> {value: elementId}, filled on first use
+        self._id_maps: Dict[Tuple[str, str], Dict[str, str]] = {}
+        self._id_maps_lock = threading.Lock()
         
     def connect(self):
         """Connect to Neo4j Desktop"""
@@ -44,9 +194,12 @@ class DataLoader:
         print(f"   User: {self.config.user}")
         
         try:
+            # Pooled connections for the concurrent relationship loaders
             self.driver = GraphDatabase.driver(
                 self.config.uri,
-                auth=(self.config.user, self.config.password)
+                auth=(self.config.user, self.config.password),
+                max_connection_pool_size=self.config.max_connection_pool_size,
+                connection_acquisition_timeout=self.config.connection_acquisition_timeout
             )
             self.driver.verify_connectivity()
             
@@ -55,6 +208,7 @@ class DataLoader:
                 result = session.run("RETURN 1 as test")
                 if result.single()['test'] == 1:
                     print("   ✅ Connected successfully!\n")
+                    self.apoc_available = self._has_apoc()
                     return True
             
             return False
@@ -68,6 +222,19 @@ class DataLoader:
             print("   4. Check connection details in Neo4j Desktop")
             raise
     
+    def _has_apoc(self) -> bool:
+        """Check whether apoc.periodic.iterate is installed"""
+        try:
+            with self.driver.session() as session:
+                record = session.run("""
+                    SHOW PROCEDURES YIELD name
+                    WHERE name = 'apoc.periodic.iterate'
+                    RETURN count(*) > 0 AS available
+                """).single()
+                return bool(record['available'])
+        except Exception:
+            return False
+    
     def close(self):
         """Close Neo4j connection"""
         if self.driver:
@@ -83,6 +250,10 @@ class DataLoader:
             "CREATE CONSTRAINT event_name IF NOT EXISTS FOR (e:Event) REQUIRE e.name IS UNIQUE",
             "CREATE CONSTRAINT category_name IF NOT EXISTS FOR (c:Category) REQUIRE c.name IS UNIQUE",
             "CREATE CONSTRAINT tag_keyword IF NOT EXISTS FOR (tag:Tag) REQUIRE tag.keyword IS UNIQUE",
+            # Case-insensitive entity search for the API's /api/graph?query=...
+            "CREATE FULLTEXT INDEX entity_search IF NOT EXISTS "
+            "FOR (n:Speaker|Talk|Event|Category|Organization|Product|Concept) "
+            "ON EACH [n.name, n.title, n.keyword]",
         ]
         
         with self.driver.session() as session:
@@ -94,7 +265,79 @@ class DataLoader:
         
         print("   ✅ Constraints ready\n")
     
-    def load_speakers(self, batch_size: int = 100) -> int:
+    def _load_batches(self, session, query: str, rows: List[Any], batch_size: int, progress: tqdm) -> int:
+        """Run an UNWIND $batch query over rows in one transaction; returns rows written"""
+        if rows:
+            session.execute_write(_write_batches, query, rows, batch_size)
+            progress.update(len(rows))
+        return len(rows)
+    
+    def _label_empty(self, label: str) -> bool:
+        """Check whether no nodes with the label exist yet"""
+        with self.driver.session() as session:
+            return session.run(f"MATCH (n:{label}) RETURN count(n) = 0 AS empty").single()['empty']
+    
+    def _load_unique(self, csv_path: Path, label: str, col: str, query: str, create_query: str,
+                     batch_size: int, desc: str) -> int:
+        """
+        Stream one CSV column and write each distinct non-empty value once
+        
+        Values are sent as a plain list of strings ($batch), not one dict
+        per row. They are already deduplicated here, so when the label is empty
+        (a cold load) create_query skips MERGE's per-row index probe; the
+        uniqueness constraint still guards against duplicates.
+        """
+        self._clear_node_ids()
+        if self._label_empty(label):
+            print(f"   No existing {label} nodes - using CREATE fast path")
+            query = create_query
+        
+        seen = set()
+        total = 0
+        
+        with self.driver.session() as session, tqdm(desc=desc, unit=" rows") as progress:
+            for chunk in iter_clean_chunks(csv_path, {"value": col}):
+                values = chunk["value"]
+                values = pd.unique(values[values != ""])  # first-seen order, no sort
+                new_values = [value for value in values if value not in seen]
+                seen.update(new_values)
+                total += self._load_batches(session, query, new_values, batch_size, progress)
+        
+        return total
+    
+    def _load_records(self, csv_path: Path, label: str, cols: Dict[str, str], key: str, query: str,
+                      create_query: str, batch_size: int, desc: str) -> int:
+        """
+        Stream CSV rows with a non-empty key column and write them as nodes
+        
+        On a cold load (empty label) rows whose key has not been written yet
+        use create_query; repeated keys (last row wins, like MERGE + SET) go
+        through the MERGE query.
+        """
+        self._clear_node_ids()
+        fast = self._label_empty(label)
+        if fast:
+            print(f"   No existing {label} nodes - using CREATE fast path")
+        
+        seen = set()
+        total = 0
+        
+        with self.driver.session() as session, tqdm(desc=desc, unit=" rows") as progress:
+            for chunk in iter_clean_chunks(csv_path, cols):
+                rows = chunk[chunk[key] != ""]
+                if not fast:
+                    total += self._load_batches(session, query, rows.to_dict("records"), batch_size, progress)
+                    continue
+                
+                rows = rows.drop_duplicates(key, keep="last")
+                is_new = ~rows[key].isin(seen)
+                seen.update(rows[key])
+                total += self._load_batches(session, create_query, rows[is_new].to_dict("records"), batch_size, progress)
+                total += self._load_batches(session, query, rows[~is_new].to_dict("records"), batch_size, progress)
+        
+        return total
+    
+    def load_speakers(self, batch_size: int = WRITE_BATCH_SIZE) -> int:
         """Load speakers from CSV"""
         csv_path = self.cdl_db_path / "Speaker.csv"
         if not csv_path.exists():
@@ -103,31 +346,15 @@ class DataLoader:
         
         print(f"📊 Loading Speakers...")
         
-        df = pd.read_csv(csv_path)
-        
-        # Extract unique speakers
-        speakers_set = set()
-        for _, row in df.iterrows():
-            name = safe_str(row.get("a.name"))
-            if name:
-                speakers_set.add(name)
-        
-        speakers = [{"name": name} for name in sorted(speakers_set)]
-        
-        # Batch load
-        query = "UNWIND $batch AS s MERGE (:Speaker {name: s.name})"
-        total = 0
-        
-        with self.driver.session() as session:
-            for i in tqdm(range(0, len(speakers), batch_size), desc="   Speakers"):
-                batch = speakers[i:i+batch_size]
-                session.run(query, batch=batch).consume()
-                total += len(batch)
+        query = "UNWIND $batch AS name MERGE (:Speaker {name: name})"
+        create_query = "UNWIND $batch AS name CREATE (:Speaker {name: name})"
+        total = self._load_unique(csv_path, "Speaker", "a.name", query, create_query,
+                                  batch_size, "   Speakers")
         
         print(f"   ✅ Loaded {total} speakers\n")
         return total
     
-    def load_talks(self, batch_size: int = 100) -> int:
+    def load_talks(self, batch_size: int = WRITE_BATCH_SIZE) -> int:
         """Load talks from CSV"""
         csv_path = self.cdl_db_path / "Talk.csv"
         if not csv_path.exists():
@@ -136,20 +363,13 @@ class DataLoader:
         
         print(f"📊 Loading Talks...")
         
-        df = pd.read_csv(csv_path)
-        
-        # Extract talks
-        talks = []
-        for _, row in df.iterrows():
-            title = safe_str(row.get("a.title"))
-            if title:
-                talks.append({
-                    "title": title,
-                    "category": safe_str(row.get("a.category")),
-                    "url": safe_str(row.get("a.url")),
-                    "description": safe_str(row.get("a.description")),
-                    "type": safe_str(row.get("a.type"))
-                })
+        cols = {
+            "title": "a.title",
+            "category": "a.category",
+            "url": "a.url",
+            "description": "a.description",
+            "type": "a.type"
+        }
         
         # Batch load
         query = """
@@ -160,18 +380,14 @@ class DataLoader:
             talk.description = t.description,
             talk.type = t.type
         """
-        total = 0
-        
-        with self.driver.session() as session:
-            for i in tqdm(range(0, len(talks), batch_size), desc="   Talks"):
-                batch = talks[i:i+batch_size]
-                session.run(query, batch=batch).consume()
-                total += len(batch)
+        create_query = "UNWIND $batch AS t CREATE (talk:Talk) SET talk = t"
+        total = self._load_records(csv_path, "Talk", cols, "title", query, create_query,
+                                   batch_size, "   Talks")
         
         print(f"   ✅ Loaded {total} talks\n")
         return total
     
-    def load_tags(self, batch_size: int = 200) -> int:
+    def load_tags(self, batch_size: int = WRITE_BATCH_SIZE) -> int:
         """Load tags from CSV"""
         csv_path = self.cdl_db_path / "Tag.csv"
         if not csv_path.exists():
@@ -180,31 +396,15 @@ class DataLoader:
         
         print(f"📊 Loading Tags...")
         
-        df = pd.read_csv(csv_path)
-        
-        # Extract unique tags
-        tags_set = set()
-        for _, row in df.iterrows():
-            keyword = safe_str(row.get("a.keyword"))
-            if keyword:
-                tags_set.add(keyword)
-        
-        tags = [{"keyword": kw} for kw in sorted(tags_set)]
-        
-        # Batch load
-        query = "UNWIND $batch AS t MERGE (:Tag {keyword: t.keyword})"
-        total = 0
-        
-        with self.driver.session() as session:
-            for i in tqdm(range(0, len(tags), batch_size), desc="   Tags"):
-                batch = tags[i:i+batch_size]
-                session.run(query, batch=batch).consume()
-                total += len(batch)
+        query = "UNWIND $batch AS keyword MERGE (:Tag {keyword: keyword})"
+        create_query = "UNWIND $batch AS keyword CREATE (:Tag {keyword: keyword})"
+        total = self._load_unique(csv_path, "Tag", "a.keyword", query, create_query,
+                                  batch_size, "   Tags")
         
         print(f"   ✅ Loaded {total} tags\n")
         return total
     
-    def load_events(self) -> int:
+    def load_events(self, batch_size: int = WRITE_BATCH_SIZE) -> int:
         """Load events from CSV"""
         csv_path = self.cdl_db_path / "Event.csv"
         if not csv_path.exists():
@@ -213,30 +413,19 @@ class DataLoader:
         
         print(f"📊 Loading Events...")
         
-        df = pd.read_csv(csv_path)
-        
-        events = []
-        for _, row in df.iterrows():
-            name = safe_str(row.get("a.name"))
-            if name:
-                events.append({
-                    "name": name,
-                    "description": safe_str(row.get("a.description"))
-                })
-        
         query = """
         UNWIND $batch AS e
         MERGE (event:Event {name: e.name})
         SET event.description = e.description
         """
+        create_query = "UNWIND $batch AS e CREATE (event:Event) SET event = e"
+        total = self._load_records(csv_path, "Event", {"name": "a.name", "description": "a.description"}, "name",
+                                   query, create_query, batch_size, "   Events")
         
-        with self.driver.session() as session:
-            session.run(query, batch=events).consume()
-        
-        print(f"   ✅ Loaded {len(events)} events\n")
-        return len(events)
+        print(f"   ✅ Loaded {total} events\n")
+        return total
     
-    def load_categories(self) -> int:
+    def load_categories(self, batch_size: int = WRITE_BATCH_SIZE) -> int:
         """Load categories from CSV"""
         csv_path = self.cdl_db_path / "Category.csv"
         if not csv_path.exists():
@@ -245,125 +434,121 @@ class DataLoader:
         
         print(f"📊 Loading Categories...")
         
-        df = pd.read_csv(csv_path)
-        
-        cats_set = set()
-        for _, row in df.iterrows():
-            name = safe_str(row.get("a.name"))
-            if name:
-                cats_set.add(name)
+        query = "UNWIND $batch AS name MERGE (:Category {name: name})"
+        create_query = "UNWIND $batch AS name CREATE (:Category {name: name})"
+        total = self._load_unique(csv_path, "Category", "a.name", query, create_query,
+                                  batch_size, "   Categories")
         
-        categories = [{"name": name} for name in sorted(cats_set)]
+        print(f"   ✅ Loaded {total} categories\n")
+        return total
+    
+    def _node_ids(self, label: str, prop: str) -> Dict[str, str]:
+        """Get (and cache) the value -> elementId map of a label's id property"""
+        key = (label, prop)
+        with self._id_maps_lock:
+            if key not in self._id_maps:
+                with self.driver.session() as session:
+                    result = session.run(
+                        f"MATCH (n:{label}) WHERE n.{prop} IS NOT NULL RETURN n.{prop} AS k, elementId(n) AS id"
+                    )
+                    self._id_maps[key] = {record['k']: record['id'] for record in result}
+            return self._id_maps[key]
+    
+    def _clear_node_ids(self):
+        """Drop cached id maps (nodes are being written)"""
+        with self._id_maps_lock:
+            self._id_maps.clear()
+    
+    def _write_rows(self, action: str, rows: List[Dict], batch_size: int) -> int:
+        """
+        Apply a per-row statement to rows on a session of its own
         
-        query = "UNWIND $batch AS c MERGE (:Category {name: c.name})"
+        Safe to call from worker threads. Uses apoc.periodic.iterate
+        (one transaction per APOC_BATCH_SIZE rows) when APOC is installed,
+        otherwise UNWIND batches in one transaction.
         
+        Args:
+            action: Cypher statement operating on a bound `r`
+            rows: Row dictionaries
+            batch_size: Rows per UNWIND statement (fallback path)
+            
+        Returns:
+            Number of rows written
+        """
         with self.driver.session() as session:
-            session.run(query, batch=categories).consume()
-        
-        print(f"   ✅ Loaded {len(categories)} categories\n")
-        return len(categories)
+            if self.apoc_available:
+                record = session.run(_APOC_ITERATE, action=action, batch=rows,
+                                     apoc_batch_size=APOC_BATCH_SIZE).single()
+                if record['failedOperations']:
+                    raise RuntimeError(f"Relationship load failed: {record['errorMessages']}")
+            else:
+                session.execute_write(_write_batches, "UNWIND $batch AS r\n" + action, rows, batch_size)
+        return len(rows)
     
-    def load_relationships(self, rel_type: str, csv_file: str, batch_size: int = 200) -> int:
-        """Load relationships generically"""
+    def load_relationships(self, rel_type: str, csv_file: str, batch_size: int = WRITE_BATCH_SIZE,
+                           workers: int = RELATIONSHIP_WORKERS) -> int:
+        """Load relationships generically, writing batches on concurrent sessions"""
         csv_path = self.cdl_db_path / csv_file
         if not csv_path.exists():
             print(f"   ⚠️  {csv_file} not found")
             return 0
         
-        print(f"🔗 Loading {rel_type}...")
-        
-        df = pd.read_csv(csv_path)
-        relationships = []
-        
-        # Extract based on relationship type
-        if rel_type == "GIVES_TALK":
-            for _, row in df.iterrows():
-                speaker = safe_str(row.get("a.name"))
-                talk = safe_str(row.get("b.title"))
-                date = safe_str(row.get("r.date"))
-                if speaker and talk:
-                    relationships.append({"from": speaker, "to": talk, "date": date})
-            
-            query = """
-            UNWIND $batch AS r
-            MATCH (s:Speaker {name: r.from})
-            MATCH (t:Talk {title: r.to})
-            MERGE (s)-[rel:GIVES_TALK]->(t)
-            SET rel.date = r.date
-            """
-        
-        elif rel_type == "IS_PART_OF":
-            for _, row in df.iterrows():
-                talk = safe_str(row.get("a.title"))
-                event = safe_str(row.get("b.name"))
-                if talk and event:
-                    relationships.append({"from": talk, "to": event})
-            
-            query = """
-            UNWIND $batch AS r
-            MATCH (t:Talk {title: r.from})
-            MATCH (e:Event {name: r.to})
-            MERGE (t)-[:IS_PART_OF]->(e)
-            """
-        
-        elif rel_type == "IS_CATEGORIZED_AS":
-            for _, row in df.iterrows():
-                talk = safe_str(row.get("a.title"))
-                category = safe_str(row.get("b.name"))
-                if talk and category:
-                    relationships.append({"from": talk, "to": category})
-            
-            query = """
-            UNWIND $batch AS r
-            MATCH (t:Talk {title: r.from})
-            MATCH (c:Category {name: r.to})
-            MERGE (t)-[:IS_CATEGORIZED_AS]->(c)
-            """
-        
-        elif rel_type == "IS_DESCRIBED_BY":
-            for _, row in df.iterrows():
-                talk = safe_str(row.get("a.title"))
-                tag = safe_str(row.get("b.keyword"))
-                if talk and tag:
-                    relationships.append({"from": talk, "to": tag})
-            
-            query = """
-            UNWIND $batch AS r
-            MATCH (t:Talk {title: r.from})
-            MATCH (tag:Tag {keyword: r.to})
-            MERGE (t)-[:IS_DESCRIBED_BY]->(tag)
-            """
-        
-        else:
+        if rel_type not in RELATIONSHIP_SPECS:
             print(f"   ⚠️  Unknown relationship type: {rel_type}")
             return 0
         
-        # Batch load
-        total = 0
-        with self.driver.session() as session:
-            for i in tqdm(range(0, len(relationships), batch_size), desc=f"   {rel_type}"):
-                batch = relationships[i:i+batch_size]
-                session.run(query, batch=batch).consume()
-                total += len(batch)
+        print(f"🔗 Loading {rel_type}...")
+        
+        spec = RELATIONSHIP_SPECS[rel_type]
+        from_ids = self._node_ids(*spec["from"])
+        to_ids = self._node_ids(*spec["to"])
+        action = f"""
+        MATCH (a) WHERE elementId(a) = r.from
+        MATCH (b) WHERE elementId(b) = r.to
+        MERGE (a)-[rel:{rel_type}]->(b)
+        {spec["set"]}
+        """
         
-        print(f"   ✅ Loaded {total} relationships\n")
+        # Batch load: the batches of each CSV chunk run in parallel. Batches
+        # sharing an end node can conflict on its lock; both write paths
+        # retry the transient deadlock errors
+        total = 0
+        with ThreadPoolExecutor(max_workers=workers) as pool, \
+                tqdm(desc=f"   {rel_type}", unit=" rows") as progress:
+            for chunk in iter_clean_chunks(csv_path, spec["cols"]):
+                # Rows whose end nodes don't exist are dropped (as MATCH would)
+                chunk["from"] = chunk["from"].map(from_ids)
+                chunk["to"] = chunk["to"].map(to_ids)
+                mask = chunk["from"].notna() & chunk["to"].notna()
+                relationships = chunk[mask].to_dict("records")
+                batches = [relationships[i:i+batch_size] for i in range(0, len(relationships), batch_size)]
+                for written in pool.map(lambda batch: self._write_rows(action, batch, batch_size), batches):
+                    total += written
+                    progress.update(written)
+        
+        print(f"   ✅ Loaded {total} {rel_type} relationships\n")
         return total
     
     def get_statistics(self) -> Dict[str, int]:
         """Get database statistics"""
-        stats = {}
-        
-        with self.driver.session() as session:
-            # Node counts
-            for label in ["Speaker", "Talk", "Tag", "Event", "Category"]:
-                result = session.run(f"MATCH (n:{label}) RETURN count(n) as count")
-                stats[label] = result.single()['count']
+        with self.driver.session(default_access_mode="READ") as session:
+            if self.apoc_available:
+                # Store counters, one O(1) call instead of a count per label
+                try:
+                    record = session.run(
+                        "CALL apoc.meta.stats() YIELD labels, relTypesCount "
+                        "RETURN labels, relTypesCount"
+                    ).single()
+                    stats = {label: record['labels'].get(label, 0) for label in STAT_LABELS}
+                    stats['Relationships'] = sum(record['relTypesCount'].values())
+                    return stats
+                except ClientError:
+                    pass
             
-            # Relationship count
-            result = session.run("MATCH ()-[r]->() RETURN count(r) as count")
-            stats['Relationships'] = result.single()['count']
+            # All counts (served from the count store) in a single round trip
+            record = session.run(_STATS_CYPHER).single()
         
-        return stats
+        return record.data()
     
     def print_statistics(self):
         """Print database statistics"""
@@ -416,10 +601,20 @@ class DataLoader:
         print("STEP 2: Loading Relationships")
         print("=" * 70 + "\n")
         
-        self.load_relationships("GIVES_TALK", "GIVES_TALK_Speaker_Talk.csv")
-        self.load_relationships("IS_PART_OF", "IS_PART_OF_Talk_Event.csv")
-        self.load_relationships("IS_CATEGORIZED_AS", "IS_CATEGORIZED_AS_Talk_Category.csv")
-        self.load_relationships("IS_DESCRIBED_BY", "IS_DESCRIBED_BY_Talk_Tag.csv")
+        # Relationship types are independent - load them concurrently
+        relationship_files = [
+            ("GIVES_TALK", "GIVES_TALK_Speaker_Talk.csv"),
+            ("IS_PART_OF", "IS_PART_OF_Talk_Event.csv"),
+            ("IS_CATEGORIZED_AS", "IS_CATEGORIZED_AS_Talk_Category.csv"),
+            ("IS_DESCRIBED_BY", "IS_DESCRIBED_BY_Talk_Tag.csv"),
+        ]
+        with ThreadPoolExecutor(max_workers=len(relationship_files)) as pool:
+            futures = [
+                pool.submit(self.load_relationships, rel_type, csv_file)
+                for rel_type, csv_file in relationship_files
+            ]
+            for future in futures:
+                future.result()
         
         # Print statistics
         self.print_statistics()
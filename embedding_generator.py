@@ -7,15 +7,35 @@ This module handles:
 - Storing embeddings and metadata
 """
 
-import json
+import hashlib
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
+import orjson
+import torch
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 from neo4j import GraphDatabase
 from sentence_transformers import SentenceTransformer
 from tqdm import tqdm
 
 from config import config
+from vector_store import (
+    commit_embedding_matrix, create_embedding_matrix, load_embedding_matrix,
+    save_embedding_matrix, write_index_mapping
+)
+
+
+# Encode batch size when running on CUDA
+GPU_BATCH_SIZE = 256
+
+# Records pulled per Bolt round-trip during extraction
+EXTRACT_FETCH_SIZE = 10_000
+
+
+def text_hash(text: str) -> str:
+    """Content hash of an embedding input text (cache key)"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
 
 
 class EmbeddingGenerator:
@@ -44,234 +64,341 @@ class EmbeddingGenerator:
     def load_embedding_model(self):
         """Load sentence transformer model"""
         print(f"🤖 Loading embedding model: {self.config.embedding.model_name}")
-        self.model = SentenceTransformer(
-            self.config.embedding.model_name,
-            device=self.config.embedding.device
-        )
+        
+        # Offline batch job: use a GPU whenever one is present
+        device = self.config.embedding.device
+        if device == "cpu" and torch.cuda.is_available():
+            device = "cuda"
+        
+        if device == "cpu" and self.config.embedding.backend == "onnx":
+            self.model = self._load_onnx_model()
+        else:
+            self.model = SentenceTransformer(
+                self.config.embedding.model_name,
+                device=device
+            )
+        self.model.max_seq_length = min(self.model.max_seq_length, self.config.embedding.max_length)
+        
+        if self.model.device.type == "cuda":
+            # fp16 halves memory traffic; normalized embeddings lose ~nothing
+            self.model.half()
+            print(f"   Using {torch.cuda.get_device_name(self.model.device)} (fp16)")
         print(f"   ✅ Model loaded (dim: {self.model.get_sentence_embedding_dimension()})\n")
     
-    def extract_speakers(self) -> Tuple[List[Dict], List[str]]:
+    def _load_onnx_model(self) -> SentenceTransformer:
+        """
+        Load an int8 dynamically quantized ONNX Runtime copy of the model
+        
+        The quantized export (VNNI int8 dot products on recent Xeons) is
+        created on first use and reused from the embeddings directory.
+        Falls back to the regular PyTorch model if the ONNX extras are missing.
+        """
+        model_name = self.config.embedding.model_name
+        export_dir = self.embeddings_dir / "onnx" / model_name.replace("/", "__")
+        quantized_file = "onnx/model_qint8_avx512_vnni.onnx"
+        
+        # sentence-transformers raises a plain Exception (not ImportError)
+        # when the ONNX extras are absent, so check for them up front
+        missing = [pkg for pkg in ("optimum", "onnxruntime") if importlib.util.find_spec(pkg) is None]
+        if missing:
+            print(f"   ⚠️  ONNX backend unavailable ({', '.join(missing)} not installed), using PyTorch")
+            return SentenceTransformer(model_name, device="cpu")
+        
+        try:
+            from sentence_transformers import export_dynamic_quantized_onnx_model
+            
+            if not (export_dir / quantized_file).exists():
+                print("   Exporting quantized ONNX model (one-time)...")
+                model = SentenceTransformer(model_name, device="cpu", backend="onnx")
+                model.save(str(export_dir))
+                export_dynamic_quantized_onnx_model(model, "avx512_vnni", str(export_dir))
+            
+            model = SentenceTransformer(
+                str(export_dir),
+                device="cpu",
+                backend="onnx",
+                model_kwargs={"file_name": quantized_file}
+            )
+            print("   Using ONNX Runtime (int8)")
+            return model
+        except Exception as e:
+            # Older sentence-transformers (no backend=) or a failed export
+            print(f"   ⚠️  ONNX backend unavailable ({e}), using PyTorch")
+            return SentenceTransformer(model_name, device="cpu")
+    
+    def extract_speakers(self, session) -> Tuple[List[Dict], List[str]]:
         """Extract speakers and create text representations"""
         print("📊 Extracting Speakers...")
         
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (s:Speaker)
-                OPTIONAL MATCH (s)-[:GIVES_TALK]->(t:Talk)
-                RETURN s.name as name, 
-                       collect(DISTINCT t.title) as talks,
-                       count(t) as talk_count
-                ORDER BY s.name
-            """)
+        result = session.run("""
+            MATCH (s:Speaker)
+            OPTIONAL MATCH (s)-[:GIVES_TALK]->(t:Talk)
+            RETURN s.name as name, 
+                   collect(DISTINCT t.title) as talks,
+                   count(t) as talk_count
+            ORDER BY s.name
+        """)
+        
+        speakers = []
+        texts = []
+        
+        for record in result:
+            name = record['name']
+            talks = record['talks'][:5]  # Top 5 talks
             
-            speakers = []
-            texts = []
+            # Create rich text representation
+            text = f"Speaker: {name}"
+            if talks:
+                text += f". Talks: {', '.join(talks)}"
             
-            for record in result:
-                name = record['name']
-                talks = record['talks'][:5]  # Top 5 talks
-                
-                # Create rich text representation
-                text = f"Speaker: {name}"
-                if talks:
-                    text += f". Talks: {', '.join(talks)}"
-                
-                speakers.append({
-                    'name': name,
-                    'talks': talks,
-                    'talk_count': record['talk_count']
-                })
-                texts.append(text)
+            speakers.append({
+                'name': name,
+                'talks': talks,
+                'talk_count': record['talk_count']
+            })
+            texts.append(text)
         
         print(f"   ✅ Extracted {len(speakers)} speakers\n")
         return speakers, texts
     
-    def extract_talks(self) -> Tuple[List[Dict], List[str]]:
+    def extract_talks(self, session) -> Tuple[List[Dict], List[str]]:
         """Extract talks and create text representations"""
         print("📊 Extracting Talks...")
         
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (t:Talk)
-                OPTIONAL MATCH (s:Speaker)-[:GIVES_TALK]->(t)
-                OPTIONAL MATCH (t)-[:IS_DESCRIBED_BY]->(tag:Tag)
-                RETURN t.title as title,
-                       t.description as description,
-                       t.category as category,
-                       COALESCE(t.transcript, '') as transcript,
-                       s.name as speaker,
-                       collect(DISTINCT tag.keyword)[0..10] as tags
-                ORDER BY t.title
-            """)
-            
-            talks = []
-            texts = []
-            
-            for record in result:
-                title = record['title']
-                desc = record['description'] or ""
-                category = record['category'] or ""
-                transcript = record['transcript'] or ""
-                speaker = record['speaker'] or ""
-                tags = record['tags']
-                
-                # Create rich text representation
-                text = f"Talk: {title}"
-                if speaker:
-                    text += f" by {speaker}"
-                if category:
-                    text += f". Category: {category}"
-                if desc:
-                    # Truncate description to 500 chars
-                    text += f". {desc[:500]}"
-                if tags:
-                    text += f". Tags: {', '.join(tags)}"
-                
-                # Include transcript content (first 4000 chars for better semantic search)
-                # Full transcript is still searchable via Neo4j transcript_search
-                if transcript:
-                    # Use more transcript content for better semantic matching
-                    transcript_snippet = transcript[:4000] + ("..." if len(transcript) > 4000 else "")
-                    text += f". Transcript: {transcript_snippet}"
-                
-                talks.append({
-                    'title': title,
-                    'description': desc,
-                    'category': category,
-                    'transcript': transcript,
-                    'transcript_length': len(transcript),
-                    'speaker': speaker,
-                    'tags': tags
-                })
-                texts.append(text)
+        # The text representation is built in Cypher and the rows are fetched
+        # as one DataFrame instead of being assembled record by record.
+        # The description is truncated to 500 chars; up to 4000 chars of
+        # transcript are included for better semantic search (the full
+        # transcript is still searchable via Neo4j transcript_search)
+        df = session.run("""
+            MATCH (t:Talk)
+            OPTIONAL MATCH (s:Speaker)-[:GIVES_TALK]->(t)
+            OPTIONAL MATCH (t)-[:IS_DESCRIBED_BY]->(tag:Tag)
+            WITH t, s.name as speaker, collect(DISTINCT tag.keyword)[0..10] as tags
+            WITH t, tags,
+                 COALESCE(speaker, '') as speaker,
+                 COALESCE(t.description, '') as description,
+                 COALESCE(t.category, '') as category,
+                 COALESCE(t.transcript, '') as transcript
+            RETURN t.title as title,
+                   description,
+                   category,
+                   transcript,
+                   size(transcript) as transcript_length,
+                   speaker,
+                   tags,
+                   'Talk: ' + t.title
+                   + CASE WHEN speaker <> '' THEN ' by ' + speaker ELSE '' END
+                   + CASE WHEN category <> '' THEN '. Category: ' + category ELSE '' END
+                   + CASE WHEN description <> '' THEN '. ' + substring(description, 0, 500) ELSE '' END
+                   + CASE WHEN size(tags) > 0
+                          THEN '. Tags: ' + reduce(joined = head(tags), tag IN tail(tags) | joined + ', ' + tag)
+                          ELSE '' END
+                   + CASE WHEN transcript <> ''
+                          THEN '. Transcript: ' + substring(transcript, 0, 4000)
+                               + CASE WHEN size(transcript) > 4000 THEN '...' ELSE '' END
+                          ELSE '' END as text
+            ORDER BY title
+        """).to_df()
+        
+        if df.empty:
+            talks, texts = [], []
+        else:
+            texts = df['text'].tolist()
+            talks = df.drop(columns=['text']).to_dict('records')
             
             # Count talks with transcripts
-            talks_with_transcripts = sum(1 for t in talks if t.get('transcript'))
+            talks_with_transcripts = int((df['transcript_length'] > 0).sum())
             if talks_with_transcripts > 0:
                 print(f"   📝 {talks_with_transcripts} talks have transcript content included in embeddings")
         
         print(f"   ✅ Extracted {len(talks)} talks\n")
         return talks, texts
     
-    def extract_tags(self) -> Tuple[List[Dict], List[str]]:
+    def extract_tags(self, session) -> Tuple[List[Dict], List[str]]:
         """Extract tags and create text representations"""
         print("📊 Extracting Tags...")
         
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (tag:Tag)
-                OPTIONAL MATCH (t:Talk)-[:IS_DESCRIBED_BY]->(tag)
-                RETURN tag.keyword as keyword,
-                       count(t) as usage_count
-                ORDER BY tag.keyword
-            """)
+        result = session.run("""
+            MATCH (tag:Tag)
+            OPTIONAL MATCH (t:Talk)-[:IS_DESCRIBED_BY]->(tag)
+            RETURN tag.keyword as keyword,
+                   count(t) as usage_count
+            ORDER BY tag.keyword
+        """)
+        
+        tags = []
+        texts = []
+        
+        for record in result:
+            keyword = record['keyword']
             
-            tags = []
-            texts = []
+            # Create text representation
+            text = f"Tag: {keyword}"
             
-            for record in result:
-                keyword = record['keyword']
-                
-                # Create text representation
-                text = f"Tag: {keyword}"
-                
-                tags.append({
-                    'keyword': keyword,
-                    'usage_count': record['usage_count']
-                })
-                texts.append(text)
+            tags.append({
+                'keyword': keyword,
+                'usage_count': record['usage_count']
+            })
+            texts.append(text)
         
         print(f"   ✅ Extracted {len(tags)} tags\n")
         return tags, texts
     
-    def extract_events(self) -> Tuple[List[Dict], List[str]]:
+    def extract_events(self, session) -> Tuple[List[Dict], List[str]]:
         """Extract events and create text representations"""
         print("📊 Extracting Events...")
         
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (e:Event)
-                OPTIONAL MATCH (t:Talk)-[:IS_PART_OF]->(e)
-                RETURN e.name as name,
-                       e.description as description,
-                       count(t) as talk_count
-                ORDER BY e.name
-            """)
+        result = session.run("""
+            MATCH (e:Event)
+            OPTIONAL MATCH (t:Talk)-[:IS_PART_OF]->(e)
+            RETURN e.name as name,
+                   e.description as description,
+                   count(t) as talk_count
+            ORDER BY e.name
+        """)
+        
+        events = []
+        texts = []
+        
+        for record in result:
+            name = record['name']
+            desc = record['description'] or ""
             
-            events = []
-            texts = []
+            # Create text representation
+            text = f"Event: {name}"
+            if desc:
+                text += f". {desc[:500]}"
             
-            for record in result:
-                name = record['name']
-                desc = record['description'] or ""
-                
-                # Create text representation
-                text = f"Event: {name}"
-                if desc:
-                    text += f". {desc[:500]}"
-                
-                events.append({
-                    'name': name,
-                    'description': desc,
-                    'talk_count': record['talk_count']
-                })
-                texts.append(text)
+            events.append({
+                'name': name,
+                'description': desc,
+                'talk_count': record['talk_count']
+            })
+            texts.append(text)
         
         print(f"   ✅ Extracted {len(events)} events\n")
         return events, texts
     
-    def extract_categories(self) -> Tuple[List[Dict], List[str]]:
+    def extract_categories(self, session) -> Tuple[List[Dict], List[str]]:
         """Extract categories and create text representations"""
         print("📊 Extracting Categories...")
         
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (c:Category)
-                OPTIONAL MATCH (t:Talk)-[:IS_CATEGORIZED_AS]->(c)
-                RETURN c.name as name,
-                       count(t) as talk_count
-                ORDER BY c.name
-            """)
+        result = session.run("""
+            MATCH (c:Category)
+            OPTIONAL MATCH (t:Talk)-[:IS_CATEGORIZED_AS]->(c)
+            RETURN c.name as name,
+                   count(t) as talk_count
+            ORDER BY c.name
+        """)
+        
+        categories = []
+        texts = []
+        
+        for record in result:
+            name = record['name']
             
-            categories = []
-            texts = []
+            # Create text representation
+            text = f"Category: {name}"
             
-            for record in result:
-                name = record['name']
-                
-                # Create text representation
-                text = f"Category: {name}"
-                
-                categories.append({
-                    'name': name,
-                    'talk_count': record['talk_count']
-                })
-                texts.append(text)
+            categories.append({
+                'name': name,
+                'talk_count': record['talk_count']
+            })
+            texts.append(text)
         
         print(f"   ✅ Extracted {len(categories)} categories\n")
         return categories, texts
     
     def generate_embeddings(self, texts: List[str]) -> np.ndarray:
-        """Generate embeddings for texts"""
-        embeddings = self.model.encode(
-            texts,
-            batch_size=self.config.embedding.batch_size,
-            show_progress_bar=True,
-            convert_to_numpy=True,
-            normalize_embeddings=True  # L2 normalization for cosine similarity
-        )
+        """Generate embeddings for texts (float32, L2-normalized)"""
+        # Encode each distinct text once and scatter back, unless there is
+        # too little duplication to be worth it
+        index: Dict[str, int] = {}
+        inverse = [index.setdefault(text, len(index)) for text in texts]
+        if len(index) < 0.9 * len(texts):
+            print(f"   {len(texts) - len(index)} duplicate texts reuse their embeddings")
+            return self._encode(list(index))[inverse]
+        return self._encode(texts)
+    
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Run the model over texts
+        
+        Like SentenceTransformer.encode, texts are sorted by length to
+        minimize padding, but the next batch is tokenized on a background
+        thread while the model runs on the current one.
+        """
+        # A GPU takes much larger batches than the CPU default
+        on_gpu = self.model.device.type == "cuda"
+        batch_size = GPU_BATCH_SIZE if on_gpu else self.config.embedding.batch_size
+        
+        order = np.argsort([-len(text) for text in texts], kind="stable")
+        sorted_texts = [texts[i] for i in order]
+        embeddings = np.empty((len(texts), self.model.get_sentence_embedding_dimension()), dtype=np.float32)
+        if not texts:
+            return embeddings
+        
+        with ThreadPoolExecutor(max_workers=1) as tokenizer_pool, torch.inference_mode():
+            pending = tokenizer_pool.submit(self.model.tokenize, sorted_texts[:batch_size])
+            for start in tqdm(range(0, len(texts), batch_size), desc="Batches"):
+                features = pending.result()
+                end = start + batch_size
+                if end < len(texts):
+                    pending = tokenizer_pool.submit(self.model.tokenize, sorted_texts[end:end + batch_size])
+                
+                features = {name: value.to(self.model.device) for name, value in features.items()}
+                batch = self.model(features)['sentence_embedding']
+                # L2 normalization for cosine similarity
+                batch = torch.nn.functional.normalize(batch, p=2, dim=1)
+                embeddings[order[start:end]] = batch.float().cpu().numpy()
+        
         return embeddings
     
+    def load_embedding_cache(self) -> Tuple[Dict[str, int], Optional[np.ndarray]]:
+        """
+        Load the content-hash cache of the previous run
+        
+        Returns:
+            (text hash -> row in all_embeddings.npy, embedding matrix); empty
+            if there is no cache or it was built with a different model
+        """
+        cache_path = self.embeddings_dir / "embedding_cache.json"
+        emb_path = self.embeddings_dir / "all_embeddings.npy"
+        if not (cache_path.exists() and emb_path.exists()):
+            return {}, None
+        
+        with open(cache_path, 'rb') as f:
+            cache = orjson.loads(f.read())
+        if cache.get('model') != self.config.embedding.model_name:
+            print("   Embedding model changed, re-encoding everything")
+            return {}, None
+        
+        embeddings = load_embedding_matrix(emb_path, mmap=True)
+        if len(embeddings) != cache.get('rows'):
+            return {}, None
+        return cache['hashes'], embeddings
+    
+    def save_embedding_cache(self, hashes: List[str]):
+        """Save the text hash -> row mapping for all_embeddings.npy"""
+        cache = {
+            'model': self.config.embedding.model_name,
+            'rows': len(hashes),
+            'hashes': {h: i for i, h in enumerate(hashes)}
+        }
+        with open(self.embeddings_dir / "embedding_cache.json", 'wb') as f:
+            f.write(orjson.dumps(cache))
+    
     def save_embeddings(self, node_type: str, metadata: List[Dict], embeddings: np.ndarray):
         """Save embeddings and metadata to disk"""
         # Save embeddings
         emb_path = self.embeddings_dir / f"{node_type.lower()}_embeddings.npy"
-        np.save(emb_path, embeddings)
+        save_embedding_matrix(emb_path, embeddings, self.config.embedding.storage_dtype)
         
         # Save metadata
         meta_path = self.embeddings_dir / f"{node_type.lower()}_metadata.json"
-        with open(meta_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        with open(meta_path, 'wb') as f:
+            f.write(orjson.dumps(metadata, option=orjson.OPT_SERIALIZE_NUMPY))
         
         print(f"   💾 Saved {len(embeddings)} embeddings to {emb_path.name}")
     
@@ -290,62 +417,100 @@ class EmbeddingGenerator:
         print("Extracting and Embedding Nodes")
         print("=" * 70 + "\n")
         
-        all_embeddings = []
+        # First pass: extract every node type, so the combined matrix can be
+        # created once and filled in place (no row list + vstack copy).
+        # All extractions share one read session with a large fetch size to
+        # cut Bolt round-trips on big result sets
+        extracted = []
+        with self.driver.session(default_access_mode="READ", fetch_size=EXTRACT_FETCH_SIZE) as session:
+            for node_type, extract_func in [
+                ('Speaker', self.extract_speakers),
+                ('Talk', self.extract_talks),
+                ('Tag', self.extract_tags),
+                ('Event', self.extract_events),
+                ('Category', self.extract_categories)
+            ]:
+                # Extract
+                metadata, texts = extract_func(session)
+                
+                if not texts:
+                    print(f"   ⚠️  No {node_type} nodes found, skipping...\n")
+                    continue
+                
+                extracted.append((node_type, metadata, texts))
+        
+        # Each block is written straight into the memory-mapped combined file
+        offsets = np.cumsum([0] + [len(texts) for _, _, texts in extracted])
+        combined_path = self.embeddings_dir / "all_embeddings.npy"
+        all_embeddings = create_embedding_matrix(
+            combined_path, int(offsets[-1]), self.model.get_sentence_embedding_dimension()
+        )
         index_mapping = []
+        all_hashes = []
+        
+        # Texts whose content hash was embedded by the previous run are
+        # copied from its matrix; only new or changed texts are encoded
+        cached_rows, cached_embeddings = self.load_embedding_cache()
         
-        for node_type, extract_func in [
-            ('Speaker', self.extract_speakers),
-            ('Talk', self.extract_talks),
-            ('Tag', self.extract_tags),
-            ('Event', self.extract_events),
-            ('Category', self.extract_categories)
-        ]:
-            # Extract
-            metadata, texts = extract_func()
+        # Second pass: embed each node type into its block
+        for i, (node_type, metadata, texts) in enumerate(extracted):
+            start_idx = int(offsets[i])
+            embeddings = all_embeddings[start_idx:int(offsets[i + 1])]
+            hashes = [text_hash(text) for text in texts]
+            all_hashes.extend(hashes)
             
-            if not texts:
-                print(f"   ⚠️  No {node_type} nodes found, skipping...\n")
-                continue
+            hits, rows, misses = [], [], []
+            for j, h in enumerate(hashes):
+                row = cached_rows.get(h)
+                if row is None:
+                    misses.append(j)
+                else:
+                    hits.append(j)
+                    rows.append(row)
+            if hits:
+                embeddings[hits] = cached_embeddings[rows]
             
             # Generate embeddings
-            print(f"🧠 Generating {node_type} embeddings...")
-            embeddings = self.generate_embeddings(texts)
+            print(f"🧠 Generating {node_type} embeddings ({len(hits)} cached)...")
+            if misses:
+                embeddings[misses] = self.generate_embeddings([texts[j] for j in misses])
             
             # Save
             self.save_embeddings(node_type, metadata, embeddings)
             
             # Track for combined index
-            start_idx = len(all_embeddings)
-            all_embeddings.extend(embeddings)
-            
-            for i, meta in enumerate(metadata):
+            for j, meta in enumerate(metadata):
                 index_mapping.append({
-                    'index': start_idx + i,
+                    'index': start_idx + j,
                     'node_type': node_type,
                     'metadata': meta
                 })
             
             print()
         
+        # Unmap the previous matrix and the new one (and its per-type views)
+        # before the files are replaced - Windows can't move mapped files
+        total = len(all_embeddings)
+        if isinstance(all_embeddings, np.memmap):
+            all_embeddings.flush()
+        cached_embeddings = None
+        all_embeddings = embeddings = None
+        
         # Save combined embeddings
-        if all_embeddings:
-            all_embeddings_array = np.vstack(all_embeddings)
-            
-            combined_path = self.embeddings_dir / "all_embeddings.npy"
-            np.save(combined_path, all_embeddings_array)
-            print(f"💾 Saved {len(all_embeddings_array)} combined embeddings\n")
+        if total:
+            commit_embedding_matrix(combined_path, self.config.embedding.storage_dtype)
+            self.save_embedding_cache(all_hashes)
+            print(f"💾 Saved {total} combined embeddings\n")
             
             # Save index mapping
-            mapping_path = self.embeddings_dir / "index_mapping.json"
-            with open(mapping_path, 'w') as f:
-                json.dump(index_mapping, f, indent=2)
+            write_index_mapping(self.embeddings_dir / "index_mapping.json", index_mapping)
             print(f"💾 Saved index mapping\n")
         
         # Print summary
         print("=" * 70)
         print("📈 Embedding Generation Summary:")
         print("=" * 70)
-        print(f"   Total embeddings: {len(all_embeddings)}")
+        print(f"   Total embeddings: {total}")
         print(f"   Embedding dimension: {self.model.get_sentence_embedding_dimension()}")
         print(f"   Saved to: {self.embeddings_dir}")
         print("=" * 70 + "\n")
@@ -12,12 +12,16 @@ Uses QA/CDKGQA.csv as ground truth.
 """
 
 import csv
+import functools
+import hashlib
 import numpy as np
+import orjson
 from typing import List, Dict, Tuple
 from pathlib import Path
 from sentence_transformers import SentenceTransformer
 from collections import Counter
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 # Optional imports for advanced metrics
 try:
@@ -27,43 +31,118 @@ except ImportError:
     ROUGE_AVAILABLE = False
     print("⚠️  rouge-score not installed. Install with: pip install rouge-score")
 
+try:
+    import sacrebleu
+    SACREBLEU_AVAILABLE = True
+except ImportError:
+    SACREBLEU_AVAILABLE = False
+
 try:
     from nltk.translate.bleu_score import sentence_bleu, SmoothingFunction
-    from nltk.tokenize import word_tokenize
-    import nltk
-    try:
-        nltk.data.find('tokenizers/punkt')
-    except LookupError:
-        nltk.download('punkt', quiet=True)
-    BLEU_AVAILABLE = True
+    NLTK_AVAILABLE = True
+except ImportError:
+    NLTK_AVAILABLE = False
+
+# BLEU prefers sacrebleu (C-accelerated, corpus score), else nltk
+BLEU_AVAILABLE = SACREBLEU_AVAILABLE or NLTK_AVAILABLE
+if not BLEU_AVAILABLE:
+    print("⚠️  sacrebleu/nltk not installed. Install with: pip install sacrebleu")
+
+try:
+    from model2vec import StaticModel
+    MODEL2VEC_AVAILABLE = True
+except ImportError:
+    MODEL2VEC_AVAILABLE = False
+
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
 except ImportError:
-    BLEU_AVAILABLE = False
-    print("⚠️  nltk not installed. Install with: pip install nltk")
+    DISKCACHE_AVAILABLE = False
+    print("⚠️  diskcache not installed, embeddings won't persist across runs. Install with: pip install diskcache")
 
 from rag_system import RAGSystem
 from config import config
 
 
+# BLEU tokenizer: words and individual punctuation marks
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_text(text: str) -> Tuple[str, frozenset]:
+    """Lowercased stripped text and its whitespace token set, computed once per string"""
+    lowered = text.lower()
+    return lowered.strip(), frozenset(lowered.split())
+
+
+# Texts per encode() call; large batches let sentence-transformers length-sort
+ENCODE_BATCH_SIZE = 1024
+
+# Concurrent RAG queries during evaluation
+QUERY_WORKERS = 8
+
+# Cosine similarity above which a question reuses an earlier question's RAG result
+SEMANTIC_CACHE_THRESHOLD = 0.87
+
+
 class RAGEvaluator:
     """Evaluates RAG system performance"""
     
-    def __init__(self):
-        """Initialize evaluator"""
+    def __init__(self, fast_embeddings: bool = None):
+        """
+        Initialize evaluator
+        
+        Args:
+            fast_embeddings: Score similarity with a static model2vec model
+                instead of the transformer (default: config.embedding.evaluator_fast)
+        """
         print("🚀 Initializing RAG Evaluator...")
         
         # Initialize RAG system
         self.rag = RAGSystem()
         
         # Initialize embedding model for semantic similarity
-        print("   Loading embedding model for semantic similarity...")
-        self.embedding_model = SentenceTransformer(
-            config.embedding.model_name,
-            device=config.embedding.device
-        )
+        if fast_embeddings is None:
+            fast_embeddings = config.embedding.evaluator_fast
+        self._static_model = fast_embeddings and MODEL2VEC_AVAILABLE
+        if fast_embeddings and not MODEL2VEC_AVAILABLE:
+            print("   ⚠️  model2vec not installed, using the transformer. Install with: pip install model2vec")
+        
+        if self._static_model:
+            model_name = config.embedding.evaluator_model
+            print(f"   Loading static embedding model {model_name} for semantic similarity...")
+            self.embedding_model = StaticModel.from_pretrained(model_name)
+        else:
+            model_name = config.embedding.model_name
+            print("   Loading embedding model for semantic similarity...")
+            self.embedding_model = SentenceTransformer(
+                model_name,
+                device=config.embedding.device
+            )
+        # Normalized embedding per text, so each text is encoded once
+        self._emb_cache: Dict[str, np.ndarray] = {}
+        
+        # Persistent embeddings keyed by model + text hash, so later runs skip
+        # encoding texts they have already seen
+        self._disk = None
+        if DISKCACHE_AVAILABLE:
+            self._disk = diskcache.Cache(str(config.paths.data_dir / "eval_embedding_cache"))
+        self._emb_key_prefix = hashlib.sha256(model_name.encode()).hexdigest()[:8]
+        # NDCG position discounts 1/log2(i + 2)
+        self._ndcg_discounts = 1.0 / np.log2(np.arange(2, 1024))
         
         # Initialize ROUGE scorer if available
         if ROUGE_AVAILABLE:
             self.rouge_scorer = rouge_scorer.RougeScorer(['rouge1', 'rouge2', 'rougeL'], use_stemmer=True)
+            # Porter stemming is pure and the same words recur across answers,
+            # so memoize stem() (the stemmer lives on the tokenizer in newer
+            # rouge-score releases, on the scorer in older ones)
+            owner = getattr(self.rouge_scorer, '_tokenizer', self.rouge_scorer)
+            stemmer = getattr(owner, '_stemmer', None)
+            if stemmer is not None:
+                stemmer.stem = functools.lru_cache(maxsize=65536)(stemmer.stem)
+        if NLTK_AVAILABLE:
+            self._bleu_smooth = SmoothingFunction().method1
         
         print("   ✅ Evaluator ready!\n")
     
@@ -107,14 +186,22 @@ class RAGEvaluator:
         if k == 0:
             return 0.0
         
+        scores = np.asarray(relevance_scores, dtype=np.float64)
+        
         # Sort scores in descending order for ideal DCG
-        ideal_scores = sorted(relevance_scores, reverse=True)[:k]
+        ideal_scores = -np.sort(-scores)[:k]
+        scores = scores[:k]
+        
+        discounts = self._ndcg_discounts
+        if len(discounts) < len(scores):
+            discounts = 1.0 / np.log2(np.arange(2, len(scores) + 2))
+        discounts = discounts[:len(scores)]
         
         # Calculate DCG for actual ranking
-        dcg = sum(score / np.log2(i + 2) for i, score in enumerate(relevance_scores[:k]))
+        dcg = float(scores @ discounts)
         
         # Calculate ideal DCG
-        idcg = sum(score / np.log2(i + 2) for i, score in enumerate(ideal_scores))
+        idcg = float(ideal_scores @ discounts)
         
         # NDCG = DCG / IDCG
         if idcg == 0:
@@ -122,15 +209,61 @@ class RAGEvaluator:
         
         return dcg / idcg
     
+    def _encode(self, texts):
+        """Encode a text (or list of texts) into L2-normalized float32 embeddings"""
+        if self._static_model:
+            embs = self.embedding_model.encode(texts, batch_size=ENCODE_BATCH_SIZE)
+            norms = np.linalg.norm(embs, axis=-1, keepdims=True)
+            return (embs / np.maximum(norms, 1e-12)).astype(np.float32)
+        return self.embedding_model.encode(
+            texts, batch_size=ENCODE_BATCH_SIZE, convert_to_numpy=True,
+            normalize_embeddings=True, show_progress_bar=False
+        )
+    
+    def _disk_key(self, text: str) -> str:
+        return self._emb_key_prefix + "|" + hashlib.sha1(text.encode("utf-8")).hexdigest()
+    
+    def _cached_embedding(self, text: str):
+        """Get a text's embedding from the memory or disk cache, or None"""
+        emb = self._emb_cache.get(text)
+        if emb is None and self._disk is not None:
+            raw = self._disk.get(self._disk_key(text))
+            if raw is not None:
+                # Stored as raw float32 bytes, no pickling
+                emb = np.frombuffer(raw, dtype=np.float32)
+                self._emb_cache[text] = emb
+        return emb
+    
+    def _store_embedding(self, text: str, emb: np.ndarray):
+        self._emb_cache[text] = emb
+        if self._disk is not None:
+            self._disk.set(self._disk_key(text), emb.astype(np.float32).tobytes())
+    
+    def _embed(self, text: str) -> np.ndarray:
+        """Get the normalized embedding of a text, encoding it on first use"""
+        emb = self._cached_embedding(text)
+        if emb is None:
+            emb = self._encode(text)
+            self._store_embedding(text, emb)
+        return emb
+    
+    def warm_embeddings(self, texts: List[str]):
+        """Batch-encode texts that are not cached yet"""
+        missing = [
+            t for t in dict.fromkeys(texts)
+            if t and self._cached_embedding(t) is None
+        ]
+        if missing:
+            embs = self._encode(missing)
+            for text, emb in zip(missing, embs):
+                self._store_embedding(text, emb)
+    
     def calculate_semantic_similarity(self, text1: str, text2: str) -> float:
         """Calculate cosine similarity between embeddings"""
         if not text1 or not text2:
             return 0.0
         
-        emb1 = self.embedding_model.encode(text1, convert_to_numpy=True, normalize_embeddings=True)
-        emb2 = self.embedding_model.encode(text2, convert_to_numpy=True, normalize_embeddings=True)
-        
-        similarity = np.dot(emb1, emb2)
+        similarity = np.dot(self._embed(text1), self._embed(text2))
         return float(similarity)
     
     def calculate_rouge_scores(self, generated: str, reference: str) -> Dict[str, float]:
@@ -151,19 +284,21 @@ class RAGEvaluator:
             return 0.0
         
         try:
-            ref_tokens = word_tokenize(reference.lower())
-            gen_tokens = word_tokenize(generated.lower())
+            if SACREBLEU_AVAILABLE:
+                return sacrebleu.sentence_bleu(generated, [reference], lowercase=True).score / 100
             
-            smoothing = SmoothingFunction().method1
-            score = sentence_bleu([ref_tokens], gen_tokens, smoothing_function=smoothing)
+            ref_tokens = _TOKEN_RE.findall(reference.lower())
+            gen_tokens = _TOKEN_RE.findall(generated.lower())
+            
+            score = sentence_bleu([ref_tokens], gen_tokens, smoothing_function=self._bleu_smooth)
             return float(score)
         except:
             return 0.0
     
     def calculate_f1_score(self, generated: str, reference: str) -> float:
         """Calculate F1 score based on token overlap"""
-        gen_tokens = set(generated.lower().split())
-        ref_tokens = set(reference.lower().split())
+        gen_tokens = _normalize_text(generated)[1]
+        ref_tokens = _normalize_text(reference)[1]
         
         if not gen_tokens or not ref_tokens:
             return 0.0
@@ -184,7 +319,7 @@ class RAGEvaluator:
     
     def calculate_exact_match(self, generated: str, reference: str) -> float:
         """Calculate exact match (1.0 if identical, 0.0 otherwise)"""
-        return 1.0 if generated.strip().lower() == reference.strip().lower() else 0.0
+        return 1.0 if _normalize_text(generated)[0] == _normalize_text(reference)[0] else 0.0
     
     def evaluate_retrieval_ndcg(self, query: str, retrieval_results: Dict, baseline_answer: str) -> float:
         """
@@ -208,12 +343,18 @@ class RAGEvaluator:
             relevance_scores.append(score)
         
         # Score transcript results (check if they contain relevant content)
-        for result in retrieval_results.get('transcript_results', []):
-            snippet = result.get('transcript_snippet', '')
-            if snippet:
-                # Calculate semantic similarity to baseline answer
-                similarity = self.calculate_semantic_similarity(snippet, baseline_answer)
-                relevance_scores.append(similarity)
+        snippets = [
+            result['transcript_snippet']
+            for result in retrieval_results.get('transcript_results', [])
+            if result.get('transcript_snippet')
+        ]
+        if snippets and baseline_answer:
+            # Semantic similarity of every snippet to the baseline answer,
+            # encoded in one batch and scored with a single matvec
+            snippet_embs = self._encode(snippets)
+            relevance_scores.extend((snippet_embs @ self._embed(baseline_answer)).tolist())
+        elif snippets:
+            relevance_scores.extend([0.0] * len(snippets))
         
         # Calculate NDCG@10
         if not relevance_scores:
@@ -248,13 +389,21 @@ class RAGEvaluator:
         
         return metrics
     
-    def evaluate(self, qa_pairs: List[Dict], verbose: bool = True) -> Dict:
+    def evaluate(self, qa_pairs: List[Dict], verbose: bool = True, semantic_cache: bool = True,
+                 max_workers: int = QUERY_WORKERS) -> Dict:
         """
         Evaluate RAG system on QA dataset
         
+        RAG queries run concurrently on a thread pool (they are dominated by
+        LLM and database latency); metrics are computed in question order on
+        the calling thread.
+        
         Args:
             qa_pairs: List of question-answer pairs
             verbose: Print progress
+            semantic_cache: Reuse the RAG result of an earlier near-duplicate
+                question instead of querying again
+            max_workers: Concurrent RAG queries
             
         Returns:
             Evaluation results dictionary
@@ -264,19 +413,48 @@ class RAGEvaluator:
         print("=" * 70)
         print()
         
-        all_metrics = {
-            'semantic_similarity': [],
-            'rouge1': [],
-            'rouge2': [],
-            'rougeL': [],
-            'bleu': [],
-            'f1': [],
-            'exact_match': [],
-            'ndcg': [],
-            'confidence': []
-        }
+        metric_keys = [
+            'semantic_similarity', 'rouge1', 'rouge2', 'rougeL', 'bleu',
+            'f1', 'exact_match', 'ndcg', 'confidence'
+        ]
+        # One row per question; NaN marks a missing metric (or a failed question)
+        metric_values = np.full((len(qa_pairs), len(metric_keys)), np.nan)
         
         results = []
+        # Answer/reference pairs for corpus-level BLEU
+        hypotheses: List[str] = []
+        references: List[str] = []
+        
+        # Every baseline answer is compared at least twice; encode them all
+        # (and the questions, for the semantic cache) up front in one batch
+        texts = [qa['baseline_answer'] for qa in qa_pairs]
+        if semantic_cache:
+            texts += [qa['question'] for qa in qa_pairs]
+        self.warm_embeddings(texts)
+        
+        # Decide up front which question answers each one: itself, or an
+        # earlier near-duplicate whose RAG result it reuses
+        sources: List[Tuple[int, float]] = []
+        queried: List[int] = []
+        queried_embs: List[np.ndarray] = []
+        for idx, qa in enumerate(qa_pairs):
+            if semantic_cache:
+                question_emb = self._embed(qa['question'])
+                if queried_embs:
+                    sims = np.stack(queried_embs) @ question_emb
+                    best = int(sims.argmax())
+                    if sims[best] >= SEMANTIC_CACHE_THRESHOLD:
+                        sources.append((queried[best], float(sims[best])))
+                        continue
+                queried_embs.append(question_emb)
+            queried.append(idx)
+            sources.append((idx, 1.0))
+        
+        executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+        futures = {
+            idx: executor.submit(self.rag.query, qa_pairs[idx]['question'], top_k=5, verbose=False)
+            for idx in queried
+        }
         
         for i, qa in enumerate(qa_pairs, 1):
             question = qa['question']
@@ -286,8 +464,18 @@ class RAGEvaluator:
                 print(f"\n[{i}/{len(qa_pairs)}] Question: {question[:60]}...")
             
             try:
-                # Get RAG answer
-                result = self.rag.query(question, top_k=5, verbose=False)
+                # Get RAG answer, or reuse a near-duplicate question's
+                source, similarity = sources[i - 1]
+                future = futures[source]
+                if source == i - 1:
+                    result = future.result()
+                elif future.exception() is not None:
+                    # Don't reuse a failed query
+                    result = self.rag.query(question, top_k=5, verbose=False)
+                else:
+                    result = future.result()
+                    if verbose:
+                        print(f"   ♻️  Reusing result of a similar question ({similarity:.3f})")
                 generated_answer = result.get('answer', '')
                 retrieval_results = result.get('retrieval_results', {})
                 confidence = result.get('confidence')
@@ -305,10 +493,10 @@ class RAGEvaluator:
                     'confidence': confidence
                 }
                 
-                # Add to totals (filter out None values)
-                for key in all_metrics:
-                    if key in metrics and metrics[key] is not None:
-                        all_metrics[key].append(metrics[key])
+                # Add to totals (None stays NaN)
+                for j, key in enumerate(metric_keys):
+                    if metrics.get(key) is not None:
+                        metric_values[i - 1, j] = metrics[key]
                 
                 results.append({
                     'question': question,
@@ -316,6 +504,8 @@ class RAGEvaluator:
                     'generated_answer': generated_answer,
                     'metrics': metrics
                 })
+                hypotheses.append(generated_answer)
+                references.append(baseline_answer)
                 
                 if verbose:
                     print(f"   ✅ Semantic Similarity: {metrics['semantic_similarity']:.3f}")
@@ -333,17 +523,27 @@ class RAGEvaluator:
                     'metrics': {}
                 })
         
-        # Calculate averages (only for non-empty lists)
+        executor.shutdown()
+        
+        # Calculate column statistics (only for metrics with any values)
         summary = {}
-        for key, values in all_metrics.items():
-            if values and len(values) > 0:
-                # Filter out None values
-                valid_values = [v for v in values if v is not None]
-                if valid_values:
-                    summary[f'{key}_mean'] = np.mean(valid_values)
-                    summary[f'{key}_std'] = np.std(valid_values)
-                    summary[f'{key}_min'] = np.min(valid_values)
-                    summary[f'{key}_max'] = np.max(valid_values)
+        present = ~np.isnan(metric_values).all(axis=0)
+        if present.any():
+            values = metric_values[:, present]
+            keys = [key for key, has_values in zip(metric_keys, present) if has_values]
+            stats = {
+                'mean': np.nanmean(values, axis=0),
+                'std': np.nanstd(values, axis=0),
+                'min': np.nanmin(values, axis=0),
+                'max': np.nanmax(values, axis=0)
+            }
+            for j, key in enumerate(keys):
+                for stat, column_stats in stats.items():
+                    summary[f'{key}_{stat}'] = column_stats[j]
+        
+        # Corpus BLEU pools n-gram counts over all answers in one call
+        if SACREBLEU_AVAILABLE and hypotheses:
+            summary['bleu_corpus'] = sacrebleu.corpus_bleu(hypotheses, [references], lowercase=True).score / 100
         
         return {
             'summary': summary,
@@ -390,6 +590,8 @@ class RAGEvaluator:
             print(f"   F1 Score:      {summary['f1_mean']:.3f} ± {summary['f1_std']:.3f}")
             if 'bleu_mean' in summary:
                 print(f"   BLEU Score:    {summary['bleu_mean']:.3f} ± {summary['bleu_std']:.3f}")
+            if 'bleu_corpus' in summary:
+                print(f"   Corpus BLEU:   {summary['bleu_corpus']:.3f}")
             if 'exact_match_mean' in summary:
                 print(f"   Exact Match:   {summary['exact_match_mean']:.3f}")
         
@@ -418,27 +620,42 @@ class RAGEvaluator:
         """Close connections"""
         if self.rag:
             self.rag.close()
+        if self._disk is not None:
+            self._disk.close()
 
 
 def main():
     """Run evaluation"""
-    evaluator = RAGEvaluator()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Evaluate the RAG system against QA/CDKGQA.csv')
+    parser.add_argument('--no-semantic-cache', action='store_true',
+                        help='Query the RAG system for every question, even near-duplicates')
+    parser.add_argument('--high-fidelity', action='store_true',
+                        help='Score semantic similarity with the transformer model instead of model2vec')
+    parser.add_argument('--max-workers', type=int, default=QUERY_WORKERS,
+                        help=f'Concurrent RAG queries (default: {QUERY_WORKERS})')
+    args = parser.parse_args()
+    
+    evaluator = RAGEvaluator(fast_embeddings=False if args.high_fidelity else None)
     
     try:
         # Load QA dataset
         qa_pairs = evaluator.load_qa_dataset()
         
         # Run evaluation
-        results = evaluator.evaluate(qa_pairs, verbose=True)
+        results = evaluator.evaluate(qa_pairs, verbose=True, semantic_cache=not args.no_semantic_cache,
+                                     max_workers=args.max_workers)
         
         # Print report
         evaluator.print_report(results)
         
-        # Save results to file
-        import json
+        # Save results to file (orjson serializes the numpy metric values natively)
         output_file = Path("evaluation_results.json")
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        output_file.write_bytes(orjson.dumps(
+            results,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        ))
         print(f"\n💾 Results saved to: {output_file}")
         
     except Exception as e:
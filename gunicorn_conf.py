@@ -0,0 +1,45 @@
+"""
+Gunicorn configuration for the CDKG backend API
+
+Runs the FastAPI app in UvicornWorker processes. One worker by default, since
+job, monitor and cache state live in process memory (see `workers` below).
+
+Usage:
+    gunicorn -c gunicorn_conf.py backend_api_youtube:app
+"""
+
+import os
+
+# Bind to the platform-provided port (Railway/Heroku set $PORT)
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+# Default to a single worker. The app keeps its state per process (ingestion
+# and community detection jobs, monitor status and task, answer caches and
+# the in-memory FAISS index), so with several workers job-status polls that
+# land on another worker 404, /monitor/start can start one monitor per worker
+# and vectors added by one worker are never seen by the others. Every worker
+# also loads its own torch model and FAISS index. Only raise WEB_CONCURRENCY
+# for read-only query serving, with that state moved to shared storage.
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Heartbeat files on tmpfs avoid worker stalls on slow container disks
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# RAGSystem holds a Neo4j driver, torch state and a FAISS index, none of which
+# are fork-safe, so the app is NOT preloaded: each worker runs the FastAPI
+# startup event after fork and initializes its own systems
+preload_app = False
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info")
+
+
+def post_fork(server, worker):
+    """Log worker start; systems are initialized by the app's startup event"""
+    server.log.info(f"🚀 Worker {worker.pid} forked, initializing RAG systems in-process")
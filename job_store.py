@@ -0,0 +1,82 @@
+"""
+Job Store - Thread-safe, bounded registry of background job states
+
+Jobs are written from worker threads and read from async request handlers;
+the oldest jobs are evicted once max_jobs is exceeded.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class JobStore:
+    """Insertion-ordered job registry guarded by a lock"""
+
+    def __init__(self, max_jobs: int = 1000):
+        """
+        Initialize job store
+
+        Args:
+            max_jobs: Maximum number of jobs kept before the oldest are evicted
+        """
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def set(self, job_id: str, job: Dict[str, Any]):
+        """Store (or replace) a job's state"""
+        with self._lock:
+            self._jobs[job_id] = job
+            self._jobs.move_to_end(job_id)
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+
+    def update(self, job_id: str, fields: Dict[str, Any], if_status: Optional[str] = None) -> bool:
+        """
+        Merge fields into a job's state
+
+        Args:
+            job_id: Job identifier
+            fields: Fields to set
+            if_status: Only update if the job's current status is this one
+
+        Returns:
+            True if the job was updated
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or (if_status is not None and job.get('status') != if_status):
+                return False
+            self._jobs[job_id] = {**job, **fields}
+            return True
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a copy of a job's state, or None if unknown"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def pop(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Remove and return a job's state"""
+        with self._lock:
+            return self._jobs.pop(job_id, None)
+
+    def items(self, limit: Optional[int] = None) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Get (job_id, state) pairs, oldest first
+
+        Args:
+            limit: Only return the most recent `limit` jobs
+        """
+        with self._lock:
+            items = [(job_id, dict(job)) for job_id, job in self._jobs.items()]
+        return items[-limit:] if limit else items
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._jobs)
+
+    def __contains__(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._jobs
@@ -9,17 +9,25 @@ This module provides intelligent query routing and orchestration using:
 - Graph traversal for relationship discovery
 """
 
-from typing import TypedDict, Annotated, List, Dict, Any, Optional
+from typing import TypedDict, Annotated, List, Dict, Any, Iterator, Optional
 from langchain_core.tools import tool
 from langchain_anthropic import ChatAnthropic
 from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import ToolNode
 import operator
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from rag_system import RAGSystem
+from semantic_cache import SemanticCache
 from config import config
 
 
+# Retrieval lists reused from the retrieval cache
+RETRIEVAL_KEYS = ('semantic_results', 'graph_results', 'transcript_results', 'multi_hop_paths')
+
+
 # Define the state structure
 class GraphState(TypedDict):
     """State for the LangGraph workflow"""
@@ -47,6 +55,14 @@ class LangGraphOrchestrator:
             rag_system: Initialized RAG system instance
         """
         self.rag = rag_system
+        
+        # Independent retrieval calls (transcript search, path finding) run here
+        # concurrently with the semantic -> graph chain; each opens its own session
+        self._executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("RETRIEVAL_THREADS", "8")),
+            thread_name_prefix="retrieval"
+        )
+        
         # Use Claude 3 Sonnet (stable version)
         self.llm = ChatAnthropic(
             model="claude-3-sonnet-20240229",
@@ -61,6 +77,15 @@ class LangGraphOrchestrator:
         # Build graph
         self.graph = self._build_graph()
         self.app = self.graph.compile()
+        
+        # Retrieval-only graph for streaming answers token by token
+        self.retrieval_app = self._build_graph(include_answer=False).compile()
+        
+        # Retrieval results of recent standalone queries, reused for near-duplicates
+        self.retrieval_cache = SemanticCache(
+            threshold=float(os.getenv("RETRIEVAL_CACHE_THRESHOLD", "0.95")),
+            max_entries=int(os.getenv("RETRIEVAL_CACHE_SIZE", "2048"))
+        )
     
     def _create_tools(self) -> List:
         """Create LangChain tools for RAG operations"""
@@ -303,8 +328,73 @@ class LangGraphOrchestrator:
         else:
             return 'hybrid_search'
     
-    def _build_graph(self) -> StateGraph:
-        """Build the LangGraph workflow"""
+    def _calculate_confidence(self, retrieval_results: Dict) -> float:
+        """
+        Calculate confidence score based on retrieval quality
+        
+        Returns:
+            Confidence score between 0.0 and 1.0
+        """
+        confidence = 0.0
+        
+        # Semantic results contribute to confidence
+        semantic_results = retrieval_results.get('semantic_results', [])
+        if semantic_results:
+            # Average similarity score (normalized to 0-1)
+            avg_similarity = sum(r.get('similarity_score', 0) for r in semantic_results) / len(semantic_results)
+            confidence += avg_similarity * 0.3  # 30% weight
+        
+        # Transcript results indicate direct content match
+        transcript_results = retrieval_results.get('transcript_results', [])
+        if transcript_results:
+            # Having transcript results is a strong signal
+            confidence += 0.4  # 40% weight
+            # Bonus if multiple transcript results
+            if len(transcript_results) > 1:
+                confidence += 0.1
+        
+        # Graph connections show relationship understanding
+        graph_results = retrieval_results.get('graph_connections', [])
+        if graph_results:
+            confidence += 0.2  # 20% weight
+        
+        # Multi-hop paths indicate complex reasoning capability
+        multi_hop = retrieval_results.get('multi_hop_paths', [])
+        if multi_hop:
+            confidence += 0.1  # 10% weight
+        
+        # Cap at 1.0
+        return min(confidence, 1.0)
+    
+    def _prepare_answer_inputs(self, state: GraphState) -> Dict[str, Any]:
+        """
+        Score retrieval quality and format the LLM context for a retrieved state
+        
+        Returns:
+            Dictionary with 'confidence' and 'context'
+        """
+        # Format context (include all expected keys)
+        retrieval_results = {
+            'semantic_results': state.get('semantic_results', []),
+            'keyword_results': [],  # Not used in orchestrator, but required by format_context
+            'graph_connections': state.get('graph_results', []),
+            'transcript_results': state.get('transcript_results', []),
+            'multi_hop_paths': state.get('multi_hop_paths', [])
+        }
+        
+        return {
+            'confidence': self._calculate_confidence(retrieval_results),
+            'context': self.rag.format_context(retrieval_results)
+        }
+    
+    def _build_graph(self, include_answer: bool = True) -> StateGraph:
+        """
+        Build the LangGraph workflow
+        
+        Args:
+            include_answer: Whether to end with answer generation (False builds
+                a retrieval-only graph used for streaming)
+        """
         
         def semantic_search_node(state: GraphState) -> GraphState:
             """Perform semantic search"""
@@ -377,6 +467,9 @@ class LangGraphOrchestrator:
                 if expanded_keywords:
                     expanded_query = f"{expanded_query} {' '.join(expanded_keywords[:3])}"
             
+            # Transcript search doesn't depend on the entities - start it right away
+            transcript_future = self._executor.submit(self.rag.transcript_search, expanded_query, 15)
+            
             # First do semantic search to find entities (use expanded query)
             semantic_results = self.rag.semantic_search(expanded_query, k=5)
             state['semantic_results'] = semantic_results
@@ -408,12 +501,14 @@ class LangGraphOrchestrator:
             
             # Try to find paths between entities
             if len(unique_entities) >= 2:
-                paths = self._find_multi_hop_path(unique_entities[0], unique_entities[1], max_hops=state.get('max_hops', 3))
-                state['multi_hop_paths'] = paths
+                paths_future = self._executor.submit(
+                    self._find_multi_hop_path, unique_entities[0], unique_entities[1], state.get('max_hops', 3)
+                )
                 
-                # Also do graph traversal from all entities
+                # Also do graph traversal from all entities (overlaps the path search)
                 graph_results = self.rag.graph_traversal(unique_entities[:3], max_depth=state.get('max_hops', 2))
                 state['graph_results'] = graph_results
+                state['multi_hop_paths'] = paths_future.result()
             elif len(unique_entities) == 1:
                 # Single entity - do graph traversal
                 graph_results = self.rag.graph_traversal(unique_entities, max_depth=state.get('max_hops', 2))
@@ -424,8 +519,7 @@ class LangGraphOrchestrator:
                 state['graph_results'] = []
             
             # Add transcript search for multi-hop reasoning (get relevant transcript content)
-            transcript = self.rag.transcript_search(expanded_query, limit=15)  # Increased from 8 to 15
-            state['transcript_results'] = transcript
+            state['transcript_results'] = transcript_future.result()
             
             return state
         
@@ -514,6 +608,10 @@ class LangGraphOrchestrator:
                         expanded_query = f"{expanded_query} {' '.join(unique_keywords[:5])}"  # Up to 5 keywords
                         print(f"📝 Expanded follow-up query: {expanded_query}")
             
+            # Transcript search only needs the expanded query - run it concurrently
+            # with the semantic -> graph chain below
+            transcript_future = self._executor.submit(self.rag.transcript_search, expanded_query, 15)
+            
             # 1. Semantic search (use expanded query)
             semantic = self.rag.semantic_search(expanded_query, k=5)
             state['semantic_results'] = semantic
@@ -553,28 +651,14 @@ class LangGraphOrchestrator:
                 state['graph_results'] = []
             
             # 4. Transcript search (use expanded query and get more results for better coverage)
-            transcript = self.rag.transcript_search(expanded_query, limit=15)  # Increased from 10 to 15
-            state['transcript_results'] = transcript
+            state['transcript_results'] = transcript_future.result()
             
             return state
         
         def generate_answer_node(state: GraphState) -> GraphState:
             """Generate final answer using all retrieved context with confidence scoring"""
-            # Format context (include all expected keys)
-            retrieval_results = {
-                'semantic_results': state.get('semantic_results', []),
-                'keyword_results': [],  # Not used in orchestrator, but required by format_context
-                'graph_connections': state.get('graph_results', []),
-                'transcript_results': state.get('transcript_results', []),
-                'multi_hop_paths': state.get('multi_hop_paths', [])
-            }
-            
-            # Calculate confidence score based on retrieval quality
-            confidence = self._calculate_confidence(retrieval_results)
-            state['confidence'] = confidence
-            
-            context = self.rag.format_context(retrieval_results)
-            state['context'] = context
+            state.update(self._prepare_answer_inputs(state))
+            context = state['context']
             
             # Get conversation history from state
             history = state.get('conversation_history', [])
@@ -585,44 +669,6 @@ class LangGraphOrchestrator:
             
             return state
         
-        def _calculate_confidence(self, retrieval_results: Dict) -> float:
-            """
-            Calculate confidence score based on retrieval quality
-            
-            Returns:
-                Confidence score between 0.0 and 1.0
-            """
-            confidence = 0.0
-            
-            # Semantic results contribute to confidence
-            semantic_results = retrieval_results.get('semantic_results', [])
-            if semantic_results:
-                # Average similarity score (normalized to 0-1)
-                avg_similarity = sum(r.get('similarity_score', 0) for r in semantic_results) / len(semantic_results)
-                confidence += avg_similarity * 0.3  # 30% weight
-            
-            # Transcript results indicate direct content match
-            transcript_results = retrieval_results.get('transcript_results', [])
-            if transcript_results:
-                # Having transcript results is a strong signal
-                confidence += 0.4  # 40% weight
-                # Bonus if multiple transcript results
-                if len(transcript_results) > 1:
-                    confidence += 0.1
-            
-            # Graph connections show relationship understanding
-            graph_results = retrieval_results.get('graph_connections', [])
-            if graph_results:
-                confidence += 0.2  # 20% weight
-            
-            # Multi-hop paths indicate complex reasoning capability
-            multi_hop = retrieval_results.get('multi_hop_paths', [])
-            if multi_hop:
-                confidence += 0.1  # 10% weight
-            
-            # Cap at 1.0
-            return min(confidence, 1.0)
-        
         # Build graph
         workflow = StateGraph(GraphState)
         
@@ -632,7 +678,8 @@ class LangGraphOrchestrator:
         workflow.add_node("graph_search", graph_search_node)
         workflow.add_node("multi_hop_reasoning", multi_hop_node)
         workflow.add_node("hybrid_search", hybrid_search_node)
-        workflow.add_node("generate_answer", generate_answer_node)
+        if include_answer:
+            workflow.add_node("generate_answer", generate_answer_node)
         
         # Set entry point
         workflow.set_entry_point("route_query")
@@ -649,17 +696,72 @@ class LangGraphOrchestrator:
             }
         )
         
-        # All paths lead to answer generation
-        workflow.add_edge("semantic_search", "generate_answer")
-        workflow.add_edge("graph_search", "generate_answer")
-        workflow.add_edge("multi_hop_reasoning", "generate_answer")
-        workflow.add_edge("hybrid_search", "generate_answer")
+        # All paths lead to answer generation (or straight to the end for retrieval-only)
+        next_node = "generate_answer" if include_answer else END
+        workflow.add_edge("semantic_search", next_node)
+        workflow.add_edge("graph_search", next_node)
+        workflow.add_edge("multi_hop_reasoning", next_node)
+        workflow.add_edge("hybrid_search", next_node)
         
         # End
-        workflow.add_edge("generate_answer", END)
+        if include_answer:
+            workflow.add_edge("generate_answer", END)
         
         return workflow
     
+    def _initial_state(self, query: str, max_hops: int, conversation_history: Optional[List[Dict]]) -> GraphState:
+        """Build the initial workflow state for a query"""
+        return {
+            'query': query,
+            'query_type': None,
+            'semantic_results': [],
+            'graph_results': [],
+            'transcript_results': [],
+            'multi_hop_paths': [],
+            'context': '',
+            'answer': None,
+            'iteration': 0,
+            'max_hops': max_hops,
+            'conversation_history': conversation_history or []
+        }
+    
+    def _lookup_retrieval(self, query: str, max_hops: int, conversation_history: Optional[List[Dict]]):
+        """
+        Look up cached retrieval results for a standalone query
+        
+        Follow-up queries are expanded with conversation history, so they are
+        never served from (or stored in) the retrieval cache.
+        
+        Returns:
+            Tuple of (cached retrieval dict or None, query embedding to store
+            results under, or None if nothing should be stored)
+        """
+        if conversation_history:
+            return None, None
+        
+        cached = self.retrieval_cache.get_exact(query, max_hops)
+        if cached is not None:
+            return cached, None
+        
+        embedding = self.rag.embed_query(query)
+        return self.retrieval_cache.get_similar(embedding, max_hops), embedding
+    
+    def _store_retrieval(self, query: str, max_hops: int, embedding, state: Dict, cost: float):
+        """Cache the retrieval results of a finished query"""
+        if embedding is None:
+            return
+        
+        retrieval = {key: state.get(key) or [] for key in RETRIEVAL_KEYS}
+        retrieval['query_type'] = state.get('query_type')
+        self.retrieval_cache.put(
+            query,
+            embedding,
+            retrieval,
+            namespace=max_hops,
+            cost=cost,
+            size=sum(len(retrieval[key]) for key in RETRIEVAL_KEYS)
+        )
+    
     def query(self, query: str, max_hops: int = 2, use_tools: bool = False, conversation_history: Optional[List[Dict]] = None) -> Dict[str, Any]:
         """
         Process query using LangGraph orchestration
@@ -691,21 +793,20 @@ class LangGraphOrchestrator:
             }
         else:
             # Use state graph
-            initial_state = {
-                'query': query,
-                'query_type': None,
-                'semantic_results': [],
-                'graph_results': [],
-                'transcript_results': [],
-                'multi_hop_paths': [],
-                'context': '',
-                'answer': None,
-                'iteration': 0,
-                'max_hops': max_hops,
-                'conversation_history': conversation_history or []
-            }
-            
-            result = self.app.invoke(initial_state)
+            initial_state = self._initial_state(query, max_hops, conversation_history)
+            cached, embedding = self._lookup_retrieval(query, max_hops, conversation_history)
+            
+            if cached is not None:
+                # Near-duplicate query: skip vector search / graph traversal
+                result = {**initial_state, **cached}
+                result.update(self._prepare_answer_inputs(result))
+                result['answer'] = self.rag.generate_answer(
+                    query, result['context'], conversation_history=initial_state['conversation_history']
+                )
+            else:
+                started = time.perf_counter()
+                result = self.app.invoke(initial_state)
+                self._store_retrieval(query, max_hops, embedding, result, time.perf_counter() - started)
             
             return {
                 'query': query,
@@ -716,10 +817,59 @@ class LangGraphOrchestrator:
                 'semantic_results': result.get('semantic_results', []),
                 'graph_results': result.get('graph_results', []),
                 'transcript_results': result.get('transcript_results', []),
-                'multi_hop_paths': result.get('multi_hop_paths', [])
+                'multi_hop_paths': result.get('multi_hop_paths', []),
+                'retrieval_cache_hit': cached is not None
             }
     
+    def stream(self, query: str, max_hops: int = 2, conversation_history: Optional[List[Dict]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Process query and stream events as results become available
+        
+        Args:
+            query: User query
+            max_hops: Maximum hops for graph traversal
+            conversation_history: Previous conversation messages for context
+            
+        Yields:
+            Event dictionaries:
+            - {'type': 'sources', ...retrieval results, query_type, confidence}
+            - {'type': 'token', 'text': str} for each answer chunk
+            - {'type': 'done', 'answer': str}
+        """
+        history = conversation_history or []
+        initial_state = self._initial_state(query, max_hops, history)
+        cached, embedding = self._lookup_retrieval(query, max_hops, history)
+        
+        if cached is not None:
+            state = {**initial_state, **cached}
+        else:
+            started = time.perf_counter()
+            state = self.retrieval_app.invoke(initial_state)
+            self._store_retrieval(query, max_hops, embedding, state, time.perf_counter() - started)
+        
+        answer_inputs = self._prepare_answer_inputs(state)
+        
+        yield {
+            'type': 'sources',
+            'query': query,
+            'query_type': state.get('query_type'),
+            'confidence': answer_inputs['confidence'],
+            'semantic_results': state.get('semantic_results', []),
+            'graph_results': state.get('graph_results', []),
+            'transcript_results': state.get('transcript_results', []),
+            'multi_hop_paths': state.get('multi_hop_paths', []),
+            'retrieval_cache_hit': cached is not None
+        }
+        
+        chunks = []
+        for text in self.rag.generate_answer_stream(query, answer_inputs['context'], conversation_history=history):
+            chunks.append(text)
+            yield {'type': 'token', 'text': text}
+        
+        yield {'type': 'done', 'answer': ''.join(chunks)}
+    
     def close(self):
         """Close connections"""
+        self._executor.shutdown(wait=False)
         self.rag.close()
 
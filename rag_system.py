@@ -9,28 +9,47 @@ This module handles:
 """
 
 import json
+import os
+import threading
 import numpy as np
-from typing import List, Dict, Optional
+from collections import OrderedDict
+from typing import List, Dict, Iterator, Optional
 from sentence_transformers import SentenceTransformer
 from neo4j import GraphDatabase
 from anthropic import Anthropic
 
 from config import config
 from vector_store import VectorStore
+from text_utils import clean_text
 
 
 class RAGSystem:
     """Complete RAG system with hybrid retrieval"""
     
-    def __init__(self):
-        """Initialize RAG system"""
+    def __init__(self, neo4j_driver=None, llm_client: Optional[Anthropic] = None):
+        """
+        Initialize RAG system
+        
+        Args:
+            neo4j_driver: Optional shared Neo4j driver (creates a pooled one if None)
+            llm_client: Optional shared Anthropic client (creates one if None)
+        """
         self.config = config
         
         # Initialize components
         self.embedding_model = None
         self.vector_store = None
-        self.neo4j_driver = None
-        self.llm_client = None
+        self.neo4j_driver = neo4j_driver
+        self.llm_client = llm_client
+        
+        # Only close the driver on shutdown if this instance created it
+        self._owns_driver = neo4j_driver is None
+        
+        # Recent query embeddings - a query is embedded by the caches and again
+        # by semantic search, and batched requests are embedded up front
+        self._embedding_cache = OrderedDict()
+        self._embedding_cache_size = int(os.getenv("EMBED_CACHE_SIZE", "1024"))
+        self._embedding_lock = threading.Lock()
         
         self._initialize()
     
@@ -50,29 +69,72 @@ class RAGSystem:
         self.vector_store = VectorStore()
         self.vector_store.load_index()
         
-        # 3. Connect to Neo4j
+        # 3. Connect to Neo4j (connection-pooled driver, reused across queries)
         print("   Connecting to Neo4j...")
-        self.neo4j_driver = GraphDatabase.driver(
-            self.config.neo4j.uri,
-            auth=(self.config.neo4j.user, self.config.neo4j.password)
-        )
+        if self.neo4j_driver is None:
+            self.neo4j_driver = GraphDatabase.driver(
+                self.config.neo4j.uri,
+                auth=(self.config.neo4j.user, self.config.neo4j.password),
+                max_connection_pool_size=self.config.neo4j.max_connection_pool_size,
+                connection_acquisition_timeout=self.config.neo4j.connection_acquisition_timeout
+            )
         self.neo4j_driver.verify_connectivity()
         
         # 4. Initialize Anthropic client
         print("   Initializing LLM client...")
-        self.llm_client = Anthropic(api_key=self.config.llm.api_key)
+        if self.llm_client is None:
+            self.llm_client = Anthropic(api_key=self.config.llm.api_key)
         
         print("   ✅ RAG System ready!\n")
     
+    def _cache_embedding(self, query: str, embedding: np.ndarray):
+        with self._embedding_lock:
+            self._embedding_cache[query] = embedding
+            self._embedding_cache.move_to_end(query)
+            while len(self._embedding_cache) > self._embedding_cache_size:
+                self._embedding_cache.popitem(last=False)
+    
     def embed_query(self, query: str) -> np.ndarray:
-        """Generate embedding for query"""
+        """Generate embedding for query (cached for recent queries)"""
+        with self._embedding_lock:
+            embedding = self._embedding_cache.get(query)
+            if embedding is not None:
+                self._embedding_cache.move_to_end(query)
+                return embedding
+        
         embedding = self.embedding_model.encode(
             query,
             convert_to_numpy=True,
             normalize_embeddings=True
         )
+        self._cache_embedding(query, embedding)
         return embedding
     
+    def embed_queries(self, queries: List[str]) -> List[np.ndarray]:
+        """
+        Embed several queries in one model call (uncached ones only)
+        
+        Args:
+            queries: Query texts
+            
+        Returns:
+            List of normalized embeddings, aligned with queries
+        """
+        with self._embedding_lock:
+            missing = list(dict.fromkeys(q for q in queries if q not in self._embedding_cache))
+        
+        if missing:
+            embeddings = self.embedding_model.encode(
+                missing,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                batch_size=len(missing)
+            )
+            for query, embedding in zip(missing, embeddings):
+                self._cache_embedding(query, embedding)
+        
+        return [self.embed_query(q) for q in queries]
+    
     def semantic_search(self, query: str, k: int = 10) -> List[Dict]:
         """
         Perform semantic search using FAISS
@@ -706,10 +768,7 @@ class RAGSystem:
                 
                 if result['node_type'] == 'Talk':
                     # Clean up talk title
-                    title = meta.get('title', 'N/A')
-                    title = title.replace('(DataCatalog)_-[poweredBy]-_(KnowledgeGraph)', 'DataCatalog powered by Knowledge Graph')
-                    title = title.replace('_-[', ' ')
-                    title = title.replace(']-_', ' ')
+                    title = clean_text(meta.get('title', 'N/A'))
                     
                     context_parts.append(
                         f"{i}. Talk: {title}\n"
@@ -746,10 +805,7 @@ class RAGSystem:
             # Show more transcript results (up to 8) to get more complete context
             for i, result in enumerate(retrieval_results['transcript_results'][:8], 1):
                 # Clean up title
-                title = result.get('title', 'N/A')
-                title = title.replace('(DataCatalog)_-[poweredBy]-_(KnowledgeGraph)', 'DataCatalog powered by Knowledge Graph')
-                title = title.replace('_-[', ' ')
-                title = title.replace(']-_', ' ')
+                title = clean_text(result.get('title', 'N/A'))
                 
                 timestamp_info = ""
                 if result.get('timestamp'):
@@ -838,9 +894,9 @@ class RAGSystem:
         
         return "\n".join(context_parts)
     
-    def generate_answer(self, query: str, context: str, conversation_history: Optional[List[Dict]] = None) -> str:
+    def _build_answer_messages(self, query: str, context: str, conversation_history: Optional[List[Dict]] = None) -> List[Dict]:
         """
-        Generate answer using Claude with conversation memory
+        Build the Claude messages (history + answer prompt) for a query
         
         Args:
             query: User query
@@ -848,10 +904,8 @@ class RAGSystem:
             conversation_history: Previous conversation messages for context
             
         Returns:
-            Generated answer
+            List of message dictionaries
         """
-        print("🤖 Generating answer with Claude...")
-        
         # Build conversation history section
         history_section = ""
         if conversation_history and len(conversation_history) > 0:
@@ -944,6 +998,24 @@ Answer the question directly and concisely. If transcript excerpts are in the co
         # Add current query
         messages.append({"role": "user", "content": prompt})
         
+        return messages
+    
+    def generate_answer(self, query: str, context: str, conversation_history: Optional[List[Dict]] = None) -> str:
+        """
+        Generate answer using Claude with conversation memory
+        
+        Args:
+            query: User query
+            context: Retrieved context
+            conversation_history: Previous conversation messages for context
+            
+        Returns:
+            Generated answer
+        """
+        print("🤖 Generating answer with Claude...")
+        
+        messages = self._build_answer_messages(query, context, conversation_history)
+        
         response = self.llm_client.messages.create(
             model=self.config.llm.model,
             max_tokens=self.config.llm.max_tokens,
@@ -954,6 +1026,31 @@ Answer the question directly and concisely. If transcript excerpts are in the co
         answer = response.content[0].text
         return answer
     
+    def generate_answer_stream(self, query: str, context: str, conversation_history: Optional[List[Dict]] = None) -> Iterator[str]:
+        """
+        Stream answer text from Claude as it is generated
+        
+        Args:
+            query: User query
+            context: Retrieved context
+            conversation_history: Previous conversation messages for context
+            
+        Yields:
+            Answer text chunks
+        """
+        print("🤖 Streaming answer with Claude...")
+        
+        messages = self._build_answer_messages(query, context, conversation_history)
+        
+        with self.llm_client.messages.stream(
+            model=self.config.llm.model,
+            max_tokens=self.config.llm.max_tokens,
+            temperature=self.config.llm.temperature,
+            messages=messages
+        ) as stream:
+            for text in stream.text_stream:
+                yield text
+    
     def query(self, query: str, top_k: int = 5, verbose: bool = True) -> Dict[str, any]:
         """
         Complete RAG pipeline
@@ -998,7 +1095,7 @@ Answer the question directly and concisely. If transcript excerpts are in the co
     
     def close(self):
         """Close connections"""
-        if self.neo4j_driver:
+        if self.neo4j_driver and self._owns_driver:
             self.neo4j_driver.close()
 
 
@@ -0,0 +1,170 @@
+"""
+Semantic Cache - Reuse results for repeated or near-identical queries
+
+This module provides:
+- O(1) exact-match lookups on the normalized query text
+- Near-match lookups by cosine similarity of query embeddings (FAISS inner product)
+- GDSF (Greedy-Dual-Size-Frequency) eviction, so expensive, popular and small
+  entries survive longest
+"""
+
+import threading
+import numpy as np
+from typing import Any, Dict, Hashable, Optional, Tuple
+import faiss
+
+
+def normalize_query(text: str) -> str:
+    """Lowercase and collapse whitespace so trivially different queries share a key"""
+    return ' '.join(text.lower().split())
+
+
+class SemanticCache:
+    """Thread-safe cache keyed by query text and query embedding"""
+
+    def __init__(self, threshold: float = 0.97, max_entries: int = 512):
+        """
+        Initialize semantic cache
+
+        Args:
+            threshold: Minimum cosine similarity for a near-match hit
+            max_entries: Maximum number of cached entries before eviction
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._index: Optional[faiss.Index] = None
+        self._entries: Dict[int, Dict[str, Any]] = {}
+        self._exact: Dict[Tuple[Hashable, str], int] = {}
+        self._next_id = 0
+        self._inflation = 0.0  # GDSF clock (L)
+
+        self.hits = 0
+        self.misses = 0
+
+    def _priority(self, entry: Dict[str, Any]) -> float:
+        """GDSF priority: L + frequency * cost / size"""
+        return self._inflation + entry['frequency'] * entry['cost'] / entry['size']
+
+    def _touch(self, entry_id: int):
+        entry = self._entries[entry_id]
+        entry['frequency'] += 1
+        entry['priority'] = self._priority(entry)
+        self.hits += 1
+
+    def get_exact(self, text: str, namespace: Hashable = None) -> Optional[Any]:
+        """
+        Look up a cached value by normalized query text
+
+        Args:
+            text: Query text
+            namespace: Extra key (e.g. query options) that must match exactly
+
+        Returns:
+            Cached value or None
+        """
+        with self._lock:
+            entry_id = self._exact.get((namespace, normalize_query(text)))
+            if entry_id is None:
+                return None
+            self._touch(entry_id)
+            return self._entries[entry_id]['value']
+
+    def get_similar(self, embedding: np.ndarray, namespace: Hashable = None, k: int = 4) -> Optional[Any]:
+        """
+        Look up a cached value by embedding similarity
+
+        Args:
+            embedding: Normalized query embedding
+            namespace: Extra key that must match exactly
+            k: Number of nearest cached queries to inspect
+
+        Returns:
+            Cached value or None
+        """
+        with self._lock:
+            if self._index is None or self._index.ntotal == 0:
+                self.misses += 1
+                return None
+
+            query = np.asarray(embedding, dtype='float32').reshape(1, -1)
+            scores, ids = self._index.search(query, min(k, self._index.ntotal))
+
+            for score, entry_id in zip(scores[0], ids[0]):
+                if score < self.threshold:
+                    break
+                entry = self._entries.get(int(entry_id))
+                if entry is not None and entry['namespace'] == namespace:
+                    self._touch(int(entry_id))
+                    return entry['value']
+
+            self.misses += 1
+            return None
+
+    def put(self, text: str, embedding: np.ndarray, value: Any, namespace: Hashable = None,
+            cost: float = 1.0, size: int = 1):
+        """
+        Insert a value, evicting the lowest-priority entries if the cache is full
+
+        Args:
+            text: Query text
+            embedding: Normalized query embedding
+            value: Value to cache
+            namespace: Extra key that must match on lookup
+            cost: Cost of recomputing the value (e.g. pipeline seconds)
+            size: Relative size of the value (e.g. answer length)
+        """
+        vector = np.asarray(embedding, dtype='float32').reshape(1, -1)
+        key = (namespace, normalize_query(text))
+
+        with self._lock:
+            if key in self._exact:
+                self._remove(self._exact[key])
+
+            while len(self._entries) >= self.max_entries:
+                victim = min(self._entries, key=lambda i: self._entries[i]['priority'])
+                self._inflation = self._entries[victim]['priority']
+                self._remove(victim)
+
+            if self._index is None:
+                self._index = faiss.IndexIDMap2(faiss.IndexFlatIP(vector.shape[1]))
+
+            entry_id = self._next_id
+            self._next_id += 1
+            entry = {
+                'key': key,
+                'namespace': namespace,
+                'value': value,
+                'frequency': 1,
+                'cost': max(cost, 1e-6),
+                'size': max(size, 1)
+            }
+            entry['priority'] = self._priority(entry)
+
+            self._entries[entry_id] = entry
+            self._exact[key] = entry_id
+            self._index.add_with_ids(vector, np.array([entry_id], dtype='int64'))
+
+    def _remove(self, entry_id: int):
+        entry = self._entries.pop(entry_id)
+        self._exact.pop(entry['key'], None)
+        self._index.remove_ids(np.array([entry_id], dtype='int64'))
+
+    def clear(self):
+        """Drop all entries (e.g. after the knowledge graph changes)"""
+        with self._lock:
+            self._entries.clear()
+            self._exact.clear()
+            if self._index is not None:
+                self._index.reset()
+            self._inflation = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache size and hit/miss counters"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses
+            }
@@ -0,0 +1,19 @@
+"""
+Text Utilities - Cleanup shared by the API and the RAG context builder
+"""
+
+import re
+
+# Cleanup for CDKG-style identifiers leaking into titles and answers,
+# e.g. "(DataCatalog)_-[poweredBy]-_(KnowledgeGraph)" - one pass per string
+_CLEAN_RE = re.compile(r"\(DataCatalog\)_-\[poweredBy\]-_\(KnowledgeGraph\)|_-\[|\]-_")
+_CLEAN_MAP = {
+    "(DataCatalog)_-[poweredBy]-_(KnowledgeGraph)": "DataCatalog powered by Knowledge Graph",
+    "_-[": " ",
+    "]-_": " "
+}
+
+
+def clean_text(text: str) -> str:
+    """Replace CDKG relationship notation with readable text"""
+    return _CLEAN_RE.sub(lambda m: _CLEAN_MAP[m.group(0)], text)
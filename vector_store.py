@@ -9,7 +9,9 @@ This module handles:
 """
 
 import json
+import os
 import numpy as np
+import orjson
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 import faiss
@@ -17,6 +19,130 @@ import faiss
 from config import config
 
 
+def _scale_path(path: Path) -> Path:
+    return path.with_name(f"{path.stem}_scale.npy")
+
+
+def save_embedding_matrix(path: Path, embeddings: np.ndarray, dtype: str = "fp32"):
+    """
+    Save an embedding matrix in the given storage dtype
+    
+    Args:
+        path: .npy file path
+        embeddings: Float embedding matrix (rows are L2-normalized vectors)
+        dtype: "fp32", "fp16" or "int8" (per-column scale in <stem>_scale.npy)
+    """
+    scale_path = _scale_path(path)
+    
+    if dtype == "int8":
+        scale = np.abs(embeddings).max(axis=0) / 127.0 if len(embeddings) else np.ones(embeddings.shape[1])
+        scale[scale == 0] = 1.0
+        np.save(path, np.round(embeddings / scale).astype(np.int8), allow_pickle=False)
+        np.save(scale_path, scale.astype(np.float32), allow_pickle=False)
+        return
+    
+    if dtype == "fp16":
+        np.save(path, embeddings.astype(np.float16), allow_pickle=False)
+    elif dtype == "fp32":
+        np.save(path, embeddings.astype(np.float32, copy=False), allow_pickle=False)
+    else:
+        raise ValueError(f"Unknown embedding storage dtype: {dtype}")
+    
+    # Drop the scale left by an earlier int8 save
+    if scale_path.exists():
+        scale_path.unlink()
+
+
+def load_embedding_matrix(path: Path, mmap: bool = False) -> np.ndarray:
+    """
+    Load an embedding matrix saved by save_embedding_matrix as float32
+    
+    Args:
+        path: .npy file path
+        mmap: Memory-map the file; fp32 files are then used without a copy
+        
+    Returns:
+        float32 embedding matrix
+    """
+    data = np.load(path, mmap_mode='r' if mmap else None, allow_pickle=False)
+    if data.dtype == np.int8:
+        scale = np.load(_scale_path(path), allow_pickle=False)
+        return data.astype(np.float32) * scale
+    return data.astype(np.float32, copy=False)
+
+
+def _tmp_path(path: Path) -> Path:
+    return path.with_name(f"{path.stem}.tmp.npy")
+
+
+def create_embedding_matrix(path: Path, rows: int, dim: int) -> np.ndarray:
+    """
+    Create a float32 matrix to be filled in place and finished with
+    commit_embedding_matrix
+    
+    The matrix is memory-mapped from a temporary .npy file next to path, so
+    filling it does not keep a second in-memory copy around for the save.
+    
+    Args:
+        path: Final .npy file path
+        rows: Number of embeddings
+        dim: Embedding dimension
+        
+    Returns:
+        Writable float32 matrix (in memory if empty)
+    """
+    if rows == 0:
+        return np.empty((0, dim), dtype=np.float32)
+    return np.lib.format.open_memmap(_tmp_path(path), mode='w+', dtype=np.float32, shape=(rows, dim))
+
+
+def commit_embedding_matrix(path: Path, dtype: str = "fp32"):
+    """
+    Move a filled matrix from create_embedding_matrix to path in the given
+    storage dtype
+    
+    The caller must flush the matrix and drop every reference to it (and to
+    views of it) first: Windows cannot move or delete a file that is still
+    mapped. fp32 files are moved into place without a copy; other dtypes are
+    converted from a read-only mapping that is released before the temporary
+    file is removed.
+    
+    Args:
+        path: Final .npy file path (as passed to create_embedding_matrix)
+        dtype: "fp32", "fp16" or "int8"
+    """
+    tmp_path = _tmp_path(path)
+    if dtype == "fp32":
+        os.replace(tmp_path, path)
+        # Drop the scale left by an earlier int8 save
+        if _scale_path(path).exists():
+            _scale_path(path).unlink()
+        return
+    
+    embeddings = np.load(tmp_path, mmap_mode='r', allow_pickle=False)
+    save_embedding_matrix(path, embeddings, dtype)
+    # Unmap before unlinking
+    del embeddings
+    tmp_path.unlink()
+
+
+def write_index_mapping(path: Path, index_mapping: List[Dict]):
+    """Write the index mapping as NDJSON (one orjson-encoded entry per line)"""
+    with open(path, 'wb') as f:
+        for row in index_mapping:
+            f.write(orjson.dumps(row, option=orjson.OPT_SERIALIZE_NUMPY))
+            f.write(b"\n")
+
+
+def read_index_mapping(path: Path) -> List[Dict]:
+    """Read an index mapping written as NDJSON (or as a legacy JSON array)"""
+    with open(path, 'rb') as f:
+        first = f.read(1)
+        f.seek(0)
+        if first == b'[':
+            return orjson.loads(f.read())
+        return [orjson.loads(line) for line in f if line.strip()]
+
 class VectorStore:
     """FAISS-based vector store for semantic search"""
     
@@ -42,15 +168,13 @@ class VectorStore:
                 "Please run embedding_generator.py first."
             )
         
-        self.embeddings = np.load(emb_path).astype('float32')
+        self.embeddings = load_embedding_matrix(emb_path, mmap=True)
         self.dimension = self.embeddings.shape[1]
         
         print(f"   ✅ Loaded {len(self.embeddings)} embeddings (dim={self.dimension})")
         
         # Load index mapping
-        mapping_path = self.embeddings_dir / "index_mapping.json"
-        with open(mapping_path, 'r') as f:
-            self.index_mapping = json.load(f)
+        self.index_mapping = read_index_mapping(self.embeddings_dir / "index_mapping.json")
         
         print(f"   ✅ Loaded index mapping\n")
     
@@ -134,9 +258,7 @@ class VectorStore:
         
         # Load index mapping if not already loaded
         if self.index_mapping is None:
-            mapping_path = self.embeddings_dir / "index_mapping.json"
-            with open(mapping_path, 'r') as f:
-                self.index_mapping = json.load(f)
+            self.index_mapping = read_index_mapping(self.embeddings_dir / "index_mapping.json")
         
         print(f"   ✅ Loaded index with {self.index.ntotal} vectors\n")
     
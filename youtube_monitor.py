@@ -10,8 +10,10 @@ This module:
 import os
 import time
 import json
+import asyncio
+from concurrent.futures import Executor
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 from datetime import datetime, timedelta
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
@@ -339,6 +341,55 @@ class YouTubeChannelMonitor:
                 print(f"\n⏳ Waiting {check_interval_minutes} minutes before retry...")
                 time.sleep(check_interval_minutes * 60)
 
+    
+    async def run_continuous_async(
+        self,
+        check_interval_minutes: int = 60,
+        lookback_hours: int = 24,
+        executor: Optional[Executor] = None,
+        on_results: Optional[Callable[[Dict[str, bool]], None]] = None
+    ):
+        """
+        Run the monitoring loop as an asyncio task
+        
+        The blocking YouTube API calls and video processing run on `executor`
+        while the wait between checks is an asyncio.sleep, so the loop can be
+        stopped immediately with task.cancel().
+        
+        Args:
+            check_interval_minutes: Minutes between checks
+            lookback_hours: Hours to look back for new videos
+            executor: Executor for blocking work (loop default if None)
+            on_results: Called with the video_id -> success mapping after each check
+        """
+        loop = asyncio.get_running_loop()
+        print(f"🚀 Starting YouTube Channel Monitor (channel: {self.channel_id}, "
+              f"every {check_interval_minutes} minutes)")
+        
+        while True:
+            try:
+                new_videos = await loop.run_in_executor(executor, self.check_for_new_videos, lookback_hours)
+                
+                results = {}
+                if new_videos:
+                    print(f"\n📥 Found {len(new_videos)} new video(s) to process")
+                    results = await loop.run_in_executor(executor, self.process_new_videos, new_videos)
+                else:
+                    print("   ℹ️  No new videos found")
+                
+                if on_results:
+                    on_results(results)
+            
+            except asyncio.CancelledError:
+                print("\n🛑 Stopping monitor...")
+                raise
+            except Exception as e:
+                print(f"\n❌ Error in monitoring loop: {e}")
+                import traceback
+                traceback.print_exc()
+            
+            print(f"\n⏳ Waiting {check_interval_minutes} minutes until next check...")
+            await asyncio.sleep(check_interval_minutes * 60)
 
 def main():
     """Main entry point"""
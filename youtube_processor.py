@@ -497,15 +497,17 @@ class YouTubeVideoProcessor:
         # Load existing embeddings
         import numpy as np
         import faiss
+        from vector_store import (
+            load_embedding_matrix, save_embedding_matrix, read_index_mapping, write_index_mapping
+        )
         
         all_embeddings_file = embeddings_dir / "all_embeddings.npy"
         index_mapping_file = embeddings_dir / "index_mapping.json"
         faiss_index_file = embeddings_dir / "faiss_index.bin"
         
         # Load existing data
-        all_embeddings = np.load(all_embeddings_file)
-        with open(index_mapping_file, 'r') as f:
-            index_mapping = json.load(f)
+        all_embeddings = load_embedding_matrix(all_embeddings_file)
+        index_mapping = read_index_mapping(index_mapping_file)
         
         index = faiss.read_index(str(faiss_index_file))
         
@@ -533,10 +535,9 @@ class YouTubeVideoProcessor:
         all_embeddings = np.vstack([all_embeddings, new_embedding])
         
         # Save updated data
-        np.save(all_embeddings_file, all_embeddings)
+        save_embedding_matrix(all_embeddings_file, all_embeddings, config.embedding.storage_dtype)
         faiss.write_index(index, str(faiss_index_file))
-        with open(index_mapping_file, 'w') as f:
-            json.dump(index_mapping, f, indent=2)
+        write_index_mapping(index_mapping_file, index_mapping)
         
         print(f"   ✅ Embedding added to vector store")
         print(f"   ✅ Total embeddings: {len(index_mapping)}")